@@ -0,0 +1,77 @@
+from datetime import date
+
+import pandas as pd
+
+import db
+
+# Unpaid fees by days past their due date; the order is the charts' order
+AGING_BUCKETS = ["Not yet due", "0-30 days", "31-60 days", "Over 60 days"]
+
+# One pass over the fees due in a date range (only the FEE partitions of the
+# terms in the range are read): fees and amounts grouped by due month and
+# aging bucket, with window sums for each bucket across all months, each
+# month across all buckets and the amount collected up to each month. The
+# aging and monthly views below are both cut from this one result. Ages are
+# counted from a date parameter rather than CURDATE(), so cached results are
+# keyed on the day and never outlive it.
+_FEE_ANALYTICS_SELECT = """
+    SELECT month, bucket, fees, amount,
+           SUM(fees) OVER (PARTITION BY bucket) AS bucket_fees,
+           SUM(amount) OVER (PARTITION BY bucket) AS bucket_amount,
+           SUM(amount) OVER (PARTITION BY month) AS month_amount,
+           SUM(CASE WHEN bucket = 'Paid' THEN amount ELSE 0 END) OVER (ORDER BY month) AS collected_to_date
+    FROM (
+        SELECT DATE_SUB(f.due_date, INTERVAL DAYOFMONTH(f.due_date) - 1 DAY) AS month,
+               CASE WHEN f.status = 'Paid' THEN 'Paid'
+                    WHEN f.due_date >= %s THEN 'Not yet due'
+                    WHEN DATEDIFF(%s, f.due_date) <= 30 THEN '0-30 days'
+                    WHEN DATEDIFF(%s, f.due_date) <= 60 THEN '31-60 days'
+                    ELSE 'Over 60 days'
+               END AS bucket,
+               COUNT(*) AS fees,
+               SUM(f.amount) AS amount
+        {source}
+        GROUP BY month, bucket
+    ) fee_groups
+    ORDER BY month, bucket
+"""
+
+FEE_ANALYTICS_QUERY = _FEE_ANALYTICS_SELECT.format(source="""FROM FEE f
+        WHERE f.due_date BETWEEN %s AND %s""")
+
+# The same for one hostel, starting from its students like get_fee_details
+HOSTEL_FEE_ANALYTICS_QUERY = _FEE_ANALYTICS_SELECT.format(source="""FROM STUDENT s
+        JOIN FEE f ON f.student_id = s.student_id
+        WHERE s.hostel_id = %s AND f.due_date BETWEEN %s AND %s""")
+
+
+def fee_summary(due_from, due_to, hostel_id=None, today=None):
+    # Typed frame with one row per (month, bucket), see FEE_ANALYTICS_QUERY;
+    # fees are aged as of `today` (default: the current date)
+    today = (today or date.today()).isoformat()
+    if hostel_id is None:
+        return db.fetch_frame(FEE_ANALYTICS_QUERY, (today, today, today, due_from, due_to))
+    return db.fetch_frame(HOSTEL_FEE_ANALYTICS_QUERY, (today, today, today, hostel_id, due_from, due_to))
+
+
+def aging(summary):
+    # Unpaid fees and their amount in each aging bucket, empty buckets included
+    totals = summary.drop_duplicates("bucket").set_index("bucket")[["bucket_fees", "bucket_amount"]]
+    totals.index = totals.index.astype(str)
+    totals = totals.reindex(AGING_BUCKETS, fill_value=0)
+    return totals.rename(columns={"bucket_fees": "fees", "bucket_amount": "amount"}).rename_axis("bucket").reset_index()
+
+
+def monthly(summary):
+    # Amount collected and still unpaid for each due month
+    if summary.empty:
+        return pd.DataFrame(columns=["month", "collected", "pending", "collected_to_date", "collection %"])
+    paid = summary["bucket"].astype(str) == "Paid"
+    months = summary.groupby("month").agg(
+        month_amount=("month_amount", "first"),
+        collected_to_date=("collected_to_date", "first"),
+    )
+    months["collected"] = summary[paid].groupby("month")["amount"].sum().reindex(months.index, fill_value=0)
+    months["pending"] = months["month_amount"] - months["collected"]
+    months["collection %"] = (100 * months["collected"] / months["month_amount"].where(months["month_amount"] > 0)).round(1)
+    return months[["collected", "pending", "collected_to_date", "collection %"]].reset_index()
@@ -0,0 +1,87 @@
+import os
+import threading
+
+import mysql.connector
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Where the data lives: "mysql" for the MySQL/MariaDB server of commands.sql,
+# "sqlite" for an embedded database file (see sqlite_backend.py)
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql").lower()
+
+
+class MySQLBackend:
+    # Connections come from mysql.connector; everything else here is the SQL
+    # that differs between backends. The other modules only use these
+    # attributes and the connection/cursor API of mysql.connector.
+    name = "mysql"
+    supports_replicas = True
+
+    # Columns and indexes of every table in one round trip
+    CATALOG_QUERY = """
+        SELECT 'column' AS kind, TABLE_NAME AS table_name, COLUMN_NAME AS column_name,
+               DATA_TYPE AS detail, ORDINAL_POSITION AS position, NULL AS index_name, NULL AS non_unique
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+        UNION ALL
+        SELECT 'index', TABLE_NAME, COLUMN_NAME, INDEX_TYPE, SEQ_IN_INDEX, INDEX_NAME, NON_UNIQUE
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+        ORDER BY table_name, kind, index_name, position
+    """
+
+    # Any CREATE, DROP or ALTER TABLE changes the table count or a CREATE_TIME
+    VERSION_QUERY = """
+        SELECT COUNT(*) AS tables, MAX(CREATE_TIME) AS changed
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+    """
+
+    # The last object commands.sql creates; until it exists the database may
+    # be up but still running its init scripts
+    READY_ROUTINE = "get_fee_details"
+
+    def connect(self, config):
+        return mysql.connector.connect(**config)
+
+    def ready_query(self):
+        # (query, params) returning one row whose first column is 0 until
+        # the schema is loaded
+        return ("SELECT COUNT(*) FROM information_schema.ROUTINES "
+                "WHERE ROUTINE_SCHEMA = DATABASE() AND ROUTINE_NAME = %s", (self.READY_ROUTINE,))
+
+    def approximate_count_query(self, table):
+        # InnoDB's statistics estimate: no scan, but may be off by a few percent
+        return ("SELECT TABLE_ROWS AS count FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table,))
+
+    def fulltext_query(self, table, columns, words, scope="", scope_params=(), limit=None):
+        # Rows of `table` containing every word as a word prefix, best first,
+        # with their relevance as `score`. MATCH() must name exactly the
+        # columns of a FULLTEXT index.
+        terms = " ".join(f"+{w}*" for w in words)
+        match = f"MATCH({', '.join(columns)}) AGAINST (%s IN BOOLEAN MODE)"
+        return (f"SELECT *, {match} AS score FROM {table} WHERE {match}{scope} ORDER BY score DESC LIMIT %s",
+                [terms, terms] + list(scope_params) + [limit])
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    # The configured backend, shared by the whole process. sqlite_backend is
+    # only imported when it is used.
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if DB_BACKEND == "mysql":
+                    _backend = MySQLBackend()
+                elif DB_BACKEND == "sqlite":
+                    import sqlite_backend
+                    _backend = sqlite_backend.SQLiteBackend()
+                else:
+                    raise ValueError(f"Unknown DB_BACKEND: {DB_BACKEND} (expected mysql or sqlite)")
+    return _backend
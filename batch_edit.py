@@ -0,0 +1,113 @@
+import time
+
+import mysql.connector
+import pandas as pd
+
+import db
+import metrics
+from frames import native
+
+# Tables that can be edited in a grid: the key identifying a row and the
+# columns that may change. `bounds` limit numeric columns like the forms do.
+EDIT_SPECS = {
+    "STUDENT": {"key": "student_id", "columns": ["name", "course", "mess_plan", "laundry_plan"]},
+    "ROOM": {"key": "room_no", "columns": ["capacity", "type"], "bounds": {"capacity": (1, 4)}},
+    "FEE": {"key": "fee_id", "columns": ["status", "due_date"]},
+}
+
+
+def _same(a, b):
+    a, b = native(a), native(b)
+    if a is None or b is None:
+        return a is None and b is None
+    if hasattr(a, "year") and hasattr(b, "year"):
+        # DATE columns come back as date, grid edits as date or datetime
+        return pd.Timestamp(a) == pd.Timestamp(b)
+    return a == b
+
+
+def diff(table, original, edited):
+    # Returns (before, after): the editable columns of rows whose values
+    # differ between the two frames, indexed by key
+    spec = EDIT_SPECS[table]
+    columns = spec["columns"]
+    before = original.set_index(spec["key"])[columns]
+    after = edited.set_index(spec["key"])[columns].reindex(before.index)
+    changed = [
+        key for key in before.index
+        if not all(_same(before.at[key, c], after.at[key, c]) for c in columns)
+    ]
+    return before.loc[changed], after.loc[changed]
+
+
+def _conflicts(cursor, table, spec, before):
+    # Locks the rows about to be written and returns the keys of those that
+    # no longer hold the values the grid was loaded with (changed or deleted
+    # by someone else since)
+    keys = [native(k) for k in before.index]
+    columns = spec["columns"]
+    cursor.execute(
+        f"SELECT {spec['key']}, {', '.join(columns)} FROM {table} "
+        f"WHERE {spec['key']} IN ({', '.join(['%s'] * len(keys))}) FOR UPDATE",
+        keys,
+    )
+    current = {row[0]: row[1:] for row in cursor.fetchall()}
+    return [
+        key for key in keys
+        if key not in current or not all(_same(v, before.at[key, c]) for v, c in zip(current[key], columns))
+    ]
+
+
+def apply(table, original, edited):
+    # Writes the changed rows in one transaction with a single UPDATE, after
+    # checking that none of them changed since `original` was read. On a
+    # conflict nothing is written and the conflicting keys are returned.
+    spec = EDIT_SPECS[table]
+    columns = spec["columns"]
+    before, after = diff(table, original, edited)
+    if before.empty:
+        return {"updated": 0, "conflicts": []}
+
+    for column, (low, high) in spec.get("bounds", {}).items():
+        values = pd.to_numeric(after[column], errors="coerce")
+        if (values.isna() | (values < low) | (values > high)).any():
+            raise ValueError(f"{column} must be between {low} and {high}")
+
+    # One CASE per column picks each row's new value by key, so the whole
+    # save is one statement and one round trip on every backend
+    key_column = spec["key"]
+    keys = [native(key) for key in after.index]
+    arms = " ".join(["WHEN %s THEN %s"] * len(keys))
+    query = (f"UPDATE {table} SET {', '.join(f'{c} = CASE {key_column} {arms} END' for c in columns)} "
+             f"WHERE {key_column} IN ({', '.join(['%s'] * len(keys))})")
+    params = [value for c in columns for key in after.index for value in (native(key), native(after.at[key, c]))]
+    params += keys
+
+    start = time.perf_counter()
+    updated = 0
+    error = False
+    try:
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                conn.start_transaction()
+                conflicts = _conflicts(cursor, table, spec, before)
+                if conflicts:
+                    conn.rollback()
+                    return {"updated": 0, "conflicts": conflicts}
+                cursor.execute(query, params)
+                conn.commit()
+                updated = len(keys)
+            except mysql.connector.Error:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+    except Exception:
+        error = True
+        raise
+    finally:
+        metrics.registry.observe_statement(query, time.perf_counter() - start, updated, error)
+
+    db.invalidate({table})
+    return {"updated": updated, "conflicts": []}
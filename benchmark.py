@@ -0,0 +1,226 @@
+import argparse
+import json
+import math
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import analytics
+import db
+import lookup
+import pagination
+import search
+from cache import query_cache
+
+# Tables whose row counts are recorded with each run
+COUNTED_TABLES = ["HOSTEL", "ROOM", "STUDENT", "FEE", "EMPLOYEE"]
+
+
+def _middle_key(table, key):
+    # A keyset cursor halfway through the table, for a "deep page" read
+    rows = db.execute(f"SELECT {key} FROM {table} ORDER BY {key} LIMIT 1 OFFSET %s",
+                      (max(_count(table) // 2 - 1, 0),))
+    return rows[0][key] if rows else None
+
+
+def _busiest_hostel():
+    # The hostel with the most students, for the per-hostel scenarios
+    rows = db.execute("SELECT hostel_id FROM STUDENT WHERE hostel_id IS NOT NULL "
+                      "GROUP BY hostel_id ORDER BY COUNT(*) DESC LIMIT 1")
+    return rows[0]["hostel_id"] if rows else None
+
+
+def _count(table):
+    return db.execute(f"SELECT COUNT(*) AS count FROM {table}")[0]["count"]
+
+
+def scenarios():
+    # The statements each page issues, called through the same functions the
+    # pages use. Each entry is (name, page, callable).
+    middle_room = _middle_key("ROOM", "room_no")
+    middle_student = _middle_key("STUDENT", "student_id")
+    hostel = _busiest_hostel()
+    return [
+        # dashboard(): get_dashboard_stats, for all hostels and for one
+        ("dashboard_kpis", "Dashboard",
+         lambda: db.run_query("SELECT metric, dimension, CAST(SUM(value) AS SIGNED) AS value "
+                              "FROM DASHBOARD_STATS GROUP BY metric, dimension")),
+        ("dashboard_kpis_one_hostel", "Dashboard",
+         lambda: db.run_query("SELECT metric, dimension, value FROM DASHBOARD_STATS WHERE hostel_id = %s", (hostel,))),
+        # manage_rooms() View tab: one page of rooms with their occupants
+        ("rooms_first_page", "Rooms", lambda: pagination.fetch_page("ROOM")),
+        ("rooms_deep_page", "Rooms",
+         lambda: pagination.fetch_page("ROOM", after=(middle_room, middle_room))),
+        # manage_students() Add tab: rooms with a free bed
+        ("rooms_with_free_beds", "Students", lambda: db.run_query("""
+             SELECT r.room_no, r.type
+             FROM ROOM r
+            JOIN ROOM_OCCUPANCY ro ON r.room_no = ro.room_no
+             WHERE ro.current_occupancy < r.capacity
+             """)),
+        ("students_first_page", "Students", lambda: pagination.fetch_page("STUDENT")),
+        ("students_deep_page", "Students",
+         lambda: pagination.fetch_page("STUDENT", after=(middle_student, middle_student))),
+        # The same pages with a hostel selected
+        ("students_one_hostel_by_name", "Students",
+         lambda: pagination.fetch_page("STUDENT", sort="name", hostel_id=hostel)),
+        ("rooms_one_hostel", "Rooms", lambda: pagination.fetch_page("ROOM", hostel_id=hostel)),
+        # manage_fees() View tab
+        ("fees_all_first_page", "Fees",
+         lambda: db.call_procedure("get_fee_details", [None, None, None, 50, 0, None])),
+        ("fees_pending_first_page", "Fees",
+         lambda: db.call_procedure("get_fee_details", ["Pending", None, None, 50, 0, None])),
+        ("fees_pending_one_year", "Fees",
+         lambda: db.call_procedure("get_fee_details", ["Pending", "2023-01-01", "2023-12-31", 50, 0, None])),
+        ("fees_pending_one_hostel", "Fees",
+         lambda: db.call_procedure("get_fee_details", ["Pending", None, None, 50, 0, hostel])),
+        ("fees_offset_10000", "Fees",
+         lambda: db.call_procedure("get_fee_details", [None, None, None, 50, 10000, None])),
+        # The Fees page's largest page size, as row dicts and as a typed frame
+        ("fees_250_rows_dicts", "Fees",
+         lambda: db.call_procedure("get_fee_details", [None, None, None, 250, 0, None])),
+        ("fees_250_rows_frame", "Fees",
+         lambda: db.call_procedure_frame("get_fee_details", [None, None, None, 250, 0, None])),
+        # fee_analytics(): one year of fees, for all hostels and for one
+        ("fee_analytics_one_year", "Fee Analytics",
+         lambda: analytics.fee_summary("2023-01-01", "2023-12-31")),
+        ("fee_analytics_one_hostel", "Fee Analytics",
+         lambda: analytics.fee_summary("2023-01-01", "2023-12-31", hostel)),
+        # search_data()
+        ("search_student_fulltext", "Students", lambda: search.search("STUDENT", search.ALL_TEXT, "Priya Engineering")),
+        ("search_student_name_prefix", "Students", lambda: search.search("STUDENT", "name", "Pri")),
+        ("search_student_name_one_hostel", "Students",
+         lambda: search.search("STUDENT", "name", "Pri", hostel_id=hostel)),
+        ("search_student_id_exact", "Students", lambda: search.search("STUDENT", "student_id", "S050000")),
+        ("search_employee_fulltext", "Employees", lambda: search.search("EMPLOYEE", search.ALL_TEXT, "cleaning")),
+        # Update tabs: typeahead pickers
+        ("lookup_student_name", "Students", lambda: lookup.lookup("student", "Pri")),
+        ("lookup_fee_id", "Fees", lambda: lookup.lookup("fee", "F00012")),
+        ("lookup_room_number", "Rooms", lambda: lookup.lookup("room", "1500")),
+    ]
+
+
+def _percentile(samples, q):
+    # Linear interpolation between closest ranks, like numpy's default
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * q
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _rows(result):
+    if isinstance(result, tuple):  # fetch_page returns (rows, cursor)
+        result = result[0]
+    return len(result) if hasattr(result, "__len__") else 0
+
+
+def measure(func, iterations, warmup, warm_cache=False):
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    rows = 0
+    tracemalloc.start()
+    try:
+        for _ in range(iterations):
+            if not warm_cache:
+                # Measure the database, not the query cache
+                query_cache.clear()
+            tracemalloc.reset_peak()
+            started = time.perf_counter()
+            rows = _rows(func())
+            samples.append(time.perf_counter() - started)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "rows": rows,
+        "p50_ms": round(1000 * _percentile(samples, 0.5), 3),
+        "p95_ms": round(1000 * _percentile(samples, 0.95), 3),
+        "mean_ms": round(1000 * sum(samples) / len(samples), 3),
+        "min_ms": round(1000 * min(samples), 3),
+        "max_ms": round(1000 * max(samples), 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(iterations=50, warmup=5, warm_cache=False, only=None, log=print):
+    results = {}
+    for name, page, func in scenarios():
+        if only and name not in only:
+            continue
+        results[name] = dict(page=page, **measure(func, iterations, warmup, warm_cache))
+        log(f"{name:<28} p50 {results[name]['p50_ms']:>9.2f} ms   p95 {results[name]['p95_ms']:>9.2f} ms   "
+            f"rows {results[name]['rows']:>5}   peak {results[name]['peak_kib']:>8.1f} KiB")
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "warm_cache": warm_cache,
+        "table_rows": {table: _count(table) for table in COUNTED_TABLES},
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "scenarios": results,
+    }
+
+
+def compare(baseline, current, threshold=0.2, log=print):
+    # Returns the scenarios whose p95 grew by more than `threshold` (0.2 = 20%)
+    if baseline.get("table_rows") != current.get("table_rows"):
+        log(f"note: row counts differ from the baseline {baseline.get('table_rows')}")
+    regressions = []
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        change = (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        flag = "REGRESSION" if change > threshold else ""
+        log(f"{name:<28} p95 {before['p95_ms']:>9.2f} -> {result['p95_ms']:>9.2f} ms ({change:+.0%}) {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the queries behind each page.")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--warm-cache", action="store_true", help="let repeated reads hit the query cache")
+    parser.add_argument("--only", action="append", help="run just this scenario (repeatable)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="p95 growth counted as a regression with --compare (default 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    report = run(args.iterations, args.warmup, args.warm_cache, args.only)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
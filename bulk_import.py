@@ -0,0 +1,319 @@
+import argparse
+import os
+import sys
+import time
+
+import mysql.connector
+import pandas as pd
+
+import db
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 1000))
+
+# How each importable file maps onto its table. `enums` mirror the choices
+# offered by the forms in main.py; `references` are foreign keys checked
+# against the database before anything is written.
+IMPORT_SPECS = {
+    "students": {
+        "table": "STUDENT",
+        "key": "student_id",
+        "columns": ["student_id", "name", "course", "mess_plan", "laundry_plan", "hostel_id", "room_no"],
+        "required": ["student_id", "name", "mess_plan", "laundry_plan", "hostel_id", "room_no"],
+        "enums": {
+            "mess_plan": ["Standard", "Premium"],
+            "laundry_plan": ["Basic", "Standard", "Premium"],
+        },
+        "integers": ["hostel_id", "room_no"],
+        "references": {"hostel_id": ("HOSTEL", "hostel_id"), "room_no": ("ROOM", "room_no")},
+    },
+    # Incoming students queued for allocate_intake(); rooms are assigned later
+    "intake": {
+        "table": "STUDENT_INTAKE",
+        "key": "student_id",
+        "columns": ["student_id", "name", "course", "mess_plan", "laundry_plan", "hostel_id", "preferred_type"],
+        "required": ["student_id", "name", "mess_plan", "laundry_plan", "hostel_id"],
+        "enums": {
+            "mess_plan": ["Standard", "Premium"],
+            "laundry_plan": ["Basic", "Standard", "Premium"],
+            "preferred_type": ["Single", "Double", "Triple", "Dormitory"],
+        },
+        "integers": ["hostel_id"],
+        "references": {"hostel_id": ("HOSTEL", "hostel_id")},
+        "also_unique_in": "STUDENT",
+    },
+    "rooms": {
+        "table": "ROOM",
+        "key": "room_no",
+        "columns": ["room_no", "capacity", "type", "hostel_id"],
+        "required": ["room_no", "capacity", "type"],
+        "enums": {"type": ["Single", "Double", "Triple", "Dormitory"]},
+        "integers": ["room_no", "capacity", "hostel_id"],
+        "ranges": {"capacity": (1, 4)},
+        "references": {"hostel_id": ("HOSTEL", "hostel_id")},
+    },
+    "fees": {
+        "table": "FEE",
+        "key": "fee_id",
+        "columns": ["fee_id", "student_id", "amount", "status", "due_date"],
+        "required": ["fee_id", "student_id", "amount", "status", "due_date"],
+        "enums": {"status": ["Pending", "Paid", "Overdue"]},
+        "numbers": ["amount"],
+        "ranges": {"amount": (0, None)},
+        "dates": ["due_date"],
+        "references": {"student_id": ("STUDENT", "student_id")},
+    },
+    "employees": {
+        "table": "EMPLOYEE",
+        "key": "emp_id",
+        "columns": ["emp_id", "name", "activity", "service"],
+        "required": ["emp_id", "name", "activity", "service"],
+        "enums": {
+            "activity": ["Cleaning", "Cooking", "Security", "Maintenance", "Admin"],
+            "service": ["Housekeeping", "Cafeteria", "Guarding", "Plumbing", "Reception"],
+        },
+    },
+}
+
+# Values per IN (...) lookup when checking keys against the database
+LOOKUP_CHUNK = 1000
+
+
+class ImportFileError(Exception):
+    pass
+
+
+def read_file(source, filename=None):
+    # `source` is a path or a file-like object (e.g. a Streamlit upload).
+    # Excel files are read with openpyxl, which only reads .xlsx
+    name = (filename or getattr(source, "name", None) or str(source)).lower()
+    if name.endswith(".xls"):
+        raise ImportFileError("Legacy .xls files are not supported; save the sheet as .xlsx or CSV")
+    if name.endswith(".xlsx"):
+        try:
+            return pd.read_excel(source, dtype=str)
+        except ImportError as e:
+            raise ImportFileError(f"Reading Excel files needs openpyxl: {e}")
+    return pd.read_csv(source, dtype=str, skipinitialspace=True)
+
+
+def _existing(table, column, values):
+    found = set()
+    values = list(values)
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        chunk = values[start:start + LOOKUP_CHUNK]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        rows = db.execute(f"SELECT {column} AS value FROM {table} WHERE {column} IN ({placeholders})", chunk)
+        found.update(row["value"] for row in rows)
+    return found
+
+
+def _free_beds(room_numbers):
+    # room_no -> (free beds, hostel_id of the room)
+    free = {}
+    room_numbers = list(room_numbers)
+    for start in range(0, len(room_numbers), LOOKUP_CHUNK):
+        chunk = room_numbers[start:start + LOOKUP_CHUNK]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        rows = db.execute(f"""
+            SELECT r.room_no, r.capacity - COALESCE(ro.current_occupancy, 0) AS free, r.hostel_id
+            FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+            WHERE r.room_no IN ({placeholders})
+        """, chunk)
+        free.update((row["room_no"], (row["free"], row["hostel_id"])) for row in rows)
+    return free
+
+
+def validate(entity, df):
+    # Returns (valid rows, error report). Every check runs over whole columns;
+    # a row is rejected if any check flags it.
+    spec = IMPORT_SPECS[entity]
+    missing = [c for c in spec["required"] if c not in df.columns]
+    if missing:
+        raise ImportFileError(f"Missing columns: {', '.join(missing)}")
+
+    # Optional columns missing from the file are read as empty
+    df = df.reindex(columns=spec["columns"]).astype(object).reset_index(drop=True)
+    for column in spec["columns"]:
+        values = df[column].str.strip()
+        df[column] = values.where(values != "")
+    problems = []
+
+    def flag(mask, column, message):
+        mask = mask.fillna(False).astype(bool)
+        if mask.any():
+            problems.append(pd.DataFrame({
+                "row": df.index[mask] + 2,  # file line, counting the header
+                "column": column,
+                "value": df.loc[mask, column],
+                "error": message,
+            }))
+
+    for column in spec["required"]:
+        flag(df[column].isna(), column, "is required")
+
+    for column, choices in spec.get("enums", {}).items():
+        flag(df[column].notna() & ~df[column].isin(choices), column, f"must be one of {', '.join(choices)}")
+
+    for column in spec.get("integers", []) + spec.get("numbers", []):
+        parsed = pd.to_numeric(df[column], errors="coerce")
+        if column in spec.get("integers", []):
+            parsed = parsed.where(parsed.isna() | (parsed % 1 == 0))
+        flag(df[column].notna() & parsed.isna(), column, "must be a number")
+        low, high = spec.get("ranges", {}).get(column, (None, None))
+        if low is not None:
+            flag(parsed < low, column, f"must be at least {low}")
+        if high is not None:
+            flag(parsed > high, column, f"must be at most {high}")
+        df[column] = parsed.astype("Int64") if column in spec.get("integers", []) else parsed
+
+    for column in spec.get("dates", []):
+        parsed = pd.to_datetime(df[column], format="%Y-%m-%d", errors="coerce")
+        flag(df[column].notna() & parsed.isna(), column, "must be a YYYY-MM-DD date")
+        df[column] = parsed.dt.date
+
+    key = spec["key"]
+    flag(df[key].notna() & df[key].duplicated(keep=False), key, "is duplicated in the file")
+    keys = df[key].dropna().unique()
+    if len(keys):
+        existing = _existing(spec["table"], key, pd.Series(keys).tolist())
+        flag(df[key].isin(existing), key, "already exists")
+        if spec.get("also_unique_in"):
+            existing = _existing(spec["also_unique_in"], key, pd.Series(keys).tolist())
+            flag(df[key].isin(existing), key, f"already exists in {spec['also_unique_in']}")
+
+    for column, (table, target) in spec.get("references", {}).items():
+        values = df[column].dropna().unique()
+        if len(values):
+            found = _existing(table, target, pd.Series(values).tolist())
+            flag(df[column].notna() & ~df[column].isin(found), column, f"does not exist in {table}")
+
+    if entity == "students":
+        # Among rows that are otherwise valid, those whose room is in another
+        # hostel (as add_student_to_room refuses) or beyond a room's free
+        # beds (in file order) do not fit
+        rejected = set()
+        for problem in problems:
+            rejected.update(problem["row"] - 2)
+        candidates = df[~df.index.isin(list(rejected)) & df["room_no"].notna()]
+        rooms = _free_beds(pd.Series(candidates["room_no"].unique()).tolist())
+        free = pd.Series({room: beds for room, (beds, _) in rooms.items()}, dtype="float64")
+        room_hostel = candidates["room_no"].map(
+            pd.Series({room: hostel for room, (_, hostel) in rooms.items()}, dtype="float64"))
+        elsewhere = room_hostel.notna() & (room_hostel != candidates["hostel_id"].astype("float64"))
+        flag(pd.Series(df.index.isin(elsewhere[elsewhere].index), index=df.index),
+             "room_no", "room belongs to another hostel")
+        candidates = candidates[~elsewhere]
+        seat = candidates.groupby("room_no").cumcount()
+        full = seat >= candidates["room_no"].map(free).fillna(0)
+        flag(pd.Series(df.index.isin(full[full].index), index=df.index), "room_no", "room is full")
+
+    errors = pd.concat(problems, ignore_index=True) if problems else pd.DataFrame(columns=["row", "column", "value", "error"])
+    errors = errors.sort_values(["row", "column"], kind="stable").reset_index(drop=True)
+    valid = df.drop(index=errors["row"].unique() - 2)
+    return valid, errors
+
+
+def _records(df):
+    # Plain Python values (None for missing) as the connector expects
+    columns = [[None if pd.isna(v) else v for v in df[name].tolist()] for name in df.columns]
+    return list(zip(*columns))
+
+
+def write(entity, df, batch_size=IMPORT_BATCH_SIZE):
+    # Inserts `df` in batches of one executemany (a multi-row INSERT) per
+    # transaction. Returns (rows written, error report for failed batches).
+    spec = IMPORT_SPECS[entity]
+    columns = spec["columns"]
+    query = f"INSERT INTO {spec['table']} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    written = 0
+    failures = []
+    try:
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                for start in range(0, len(df), batch_size):
+                    batch = df.iloc[start:start + batch_size]
+                    try:
+                        conn.start_transaction()
+                        cursor.executemany(query, _records(batch[columns]))
+                        conn.commit()
+                        written += len(batch)
+                    except mysql.connector.Error as e:
+                        conn.rollback()
+                        failures.append(pd.DataFrame({
+                            "row": batch.index + 2,
+                            "column": "",
+                            "value": batch[spec["key"]].astype(str),
+                            "error": f"batch rejected by database: {e}",
+                        }))
+            finally:
+                cursor.close()
+    finally:
+        db.invalidate({spec["table"]})
+    errors = pd.concat(failures, ignore_index=True) if failures else pd.DataFrame(columns=["row", "column", "value", "error"])
+    return written, errors
+
+
+def allocate_intake(strict=False):
+    # Places every queued intake student in a free bed; returns the counts
+    # of students placed and still waiting
+    result = db.call_procedure("allocate_intake", [strict])
+    return result[0] if result else {"allocated": 0, "unallocated": 0}
+
+
+def import_file(entity, source, filename=None, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    started = time.perf_counter()
+    df = read_file(source, filename)
+    valid, errors = validate(entity, df)
+    written = 0
+    if not dry_run and len(valid):
+        written, write_errors = write(entity, valid, batch_size)
+        errors = pd.concat([errors, write_errors], ignore_index=True)
+    seconds = time.perf_counter() - started
+    return {
+        "rows": len(df),
+        "written": written,
+        "rejected": errors["row"].nunique(),
+        "seconds": seconds,
+        "rows_per_second": len(df) / seconds if seconds else 0.0,
+        "errors": errors,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import hostel data from CSV or Excel files.")
+    parser.add_argument("entity", choices=sorted(IMPORT_SPECS))
+    parser.add_argument("file")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--errors", help="write the per-row error report to this CSV file")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, write nothing")
+    parser.add_argument("--allocate", action="store_true",
+                        help="intake only: place the queued students in free beds after importing")
+    parser.add_argument("--strict", action="store_true",
+                        help="with --allocate, only place students in their preferred room type")
+    args = parser.parse_args(argv)
+
+    try:
+        report = import_file(args.entity, args.file, batch_size=args.batch_size, dry_run=args.dry_run)
+    except ImportFileError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    print(f"{report['rows']} rows read, {report['written']} written, {report['rejected']} rejected "
+          f"in {report['seconds']:.2f}s ({report['rows_per_second']:.0f} rows/s)")
+    if len(report["errors"]):
+        if args.errors:
+            report["errors"].to_csv(args.errors, index=False)
+            print(f"Error report written to {args.errors}")
+        else:
+            print(report["errors"].head(20).to_string(index=False))
+    if args.allocate and args.entity == "intake" and not args.dry_run:
+        started = time.perf_counter()
+        placed = allocate_intake(args.strict)
+        print(f"{placed['allocated']} students placed, {placed['unallocated']} still waiting "
+              f"in {time.perf_counter() - started:.2f}s")
+    return 1 if report["rejected"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
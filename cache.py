@@ -0,0 +1,141 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", 512))
+CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", 300))
+
+# Writes to these tables also change the listed tables through triggers and
+# foreign key actions (deleting a room sets its students' room_no to NULL)
+TRIGGER_DEPENDENCIES = {
+    "HOSTEL": {"ROOM", "STUDENT"},
+    "STUDENT": {"ROOM_OCCUPANCY", "DASHBOARD_STATS", "FEE"},
+    "ROOM": {"ROOM_OCCUPANCY", "DASHBOARD_STATS", "STUDENT"},
+    "FEE": {"DASHBOARD_STATS"},
+}
+
+# Tables read by stored procedures whose results may be cached
+PROCEDURE_READS = {
+    "get_fee_details": {"FEE", "STUDENT"},
+}
+
+# Tables written by stored procedures; their calls are never cached
+PROCEDURE_WRITES = {
+    "rebuild_dashboard_stats": {"DASHBOARD_STATS"},
+    "add_student_to_room": {"STUDENT"},
+    "allocate_intake": {"STUDENT", "STUDENT_INTAKE"},
+    "reconcile_occupancy": {"ROOM_OCCUPANCY", "DASHBOARD_STATS"},
+}
+
+_TABLE_PATTERN = re.compile(r"\b(?:FROM|JOIN|INTO|UPDATE|TABLE)\s+`?(\w+)`?", re.IGNORECASE)
+_CALL_PATTERN = re.compile(r"^\s*CALL\s+`?(\w+)`?", re.IGNORECASE)
+
+
+def tables_in(query):
+    return {name.upper() for name in _TABLE_PATTERN.findall(query)}
+
+
+def procedure_name(query):
+    match = _CALL_PATTERN.match(query)
+    return match.group(1) if match else None
+
+
+def with_dependents(tables):
+    # Transitively: a hostel delete changes ROOM, whose triggers change
+    # ROOM_OCCUPANCY
+    expanded = set(tables)
+    pending = list(expanded)
+    while pending:
+        for table in TRIGGER_DEPENDENCIES.get(pending.pop(), ()):
+            if table not in expanded:
+                expanded.add(table)
+                pending.append(table)
+    return expanded
+
+
+def make_key(query, params=None):
+    # Whitespace differences between otherwise identical queries share an entry
+    return " ".join(query.split()), tuple(params) if params else ()
+
+
+class QueryCache:
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, tables, value)
+        self._by_table = {}            # table -> set of keys reading it
+        self._versions = {}            # table -> number of writes seen
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidations": 0}
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        return stats
+
+    def version(self, tables):
+        with self._lock:
+            return {table: self._versions.get(table, 0) for table in tables}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+            expires_at, tables, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+        if isinstance(value, list):
+            # Rows are handed out as copies so a caller changing one does not
+            # change it for every later hit. Cached DataFrames are shared;
+            # their callers must not modify them in place.
+            value = [dict(row) if isinstance(row, dict) else row for row in value]
+        return True, value
+
+    def put(self, key, value, tables, version=None):
+        with self._lock:
+            # A write landed while this read was in flight; its result may be stale
+            if version and any(self._versions.get(t, 0) != v for t, v in version.items()):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, tables, value)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, tables):
+        with self._lock:
+            for table in with_dependents(tables):
+                self._versions[table] = self._versions.get(table, 0) + 1
+                for key in list(self._by_table.get(table, ())):
+                    self._remove(key)
+                    self._stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+
+    def _remove(self, key):
+        _, tables, _ = self._entries.pop(key)
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+
+query_cache = QueryCache()
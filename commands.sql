@@ -1,11 +1,13 @@
 -- Ensure tables are dropped if they exist
+DROP TABLE IF EXISTS FEE;
+DROP TABLE IF EXISTS STUDENT_INTAKE;
 DROP TABLE IF EXISTS STUDENT;
 DROP TABLE IF EXISTS ROOM;
-DROP TABLE IF EXISTS FEE;
 DROP TABLE IF EXISTS EMPLOYEE;
 DROP TABLE IF EXISTS HOSTEL_SERVICE;
 DROP TABLE IF EXISTS HOSTEL;
 DROP TABLE IF EXISTS ROOM_OCCUPANCY;
+DROP TABLE IF EXISTS DASHBOARD_STATS;
 
 -- Create the tables again
 CREATE TABLE IF NOT EXISTS HOSTEL (
@@ -16,7 +18,11 @@ CREATE TABLE IF NOT EXISTS HOSTEL (
 CREATE TABLE IF NOT EXISTS ROOM (
     room_no INT PRIMARY KEY,
     capacity INT,
-    type VARCHAR(50)
+    type VARCHAR(50),
+    hostel_id INT,
+    FOREIGN KEY (hostel_id) REFERENCES HOSTEL(hostel_id) ON DELETE SET NULL,
+    -- One hostel's rooms in room order
+    INDEX idx_room_hostel (hostel_id, room_no)
 );
 
 CREATE TABLE IF NOT EXISTS STUDENT (
@@ -28,57 +34,153 @@ CREATE TABLE IF NOT EXISTS STUDENT (
     hostel_id INT,
     room_no INT,
     FOREIGN KEY (hostel_id) REFERENCES HOSTEL(hostel_id) ON DELETE SET NULL,
-    FOREIGN KEY (room_no) REFERENCES ROOM(room_no) ON DELETE SET NULL
+    FOREIGN KEY (room_no) REFERENCES ROOM(room_no) ON DELETE SET NULL,
+    -- Search: prefix matches on name, ranked word matches on name and course
+    INDEX idx_student_name (name),
+    FULLTEXT INDEX ft_student (name, course),
+    -- The same lookups within one hostel: its students by room or by name
+    INDEX idx_student_hostel_room (hostel_id, room_no),
+    INDEX idx_student_hostel_name (hostel_id, name)
 );
 
+-- Incoming students waiting for allocate_intake() to place them in rooms
+CREATE TABLE IF NOT EXISTS STUDENT_INTAKE (
+    student_id VARCHAR(10) PRIMARY KEY,
+    name VARCHAR(255),
+    course VARCHAR(100),
+    mess_plan VARCHAR(50),
+    laundry_plan VARCHAR(50),
+    hostel_id INT,
+    preferred_type VARCHAR(50),
+    room_no INT
+);
+
+-- Partitioned by term (January-June, July-December) of due_date, so reads
+-- limited to a due-date range only open the terms it covers. A partitioned
+-- table can have no foreign keys and its unique keys must include due_date:
+-- before_fee_insert and before_fee_update check that student_id exists and
+-- that fee_id is unique, and before_student_delete does what
+-- ON DELETE SET NULL did. add_fee_partitions() adds terms ahead of time.
 CREATE TABLE IF NOT EXISTS FEE (
-    fee_id VARCHAR(10) PRIMARY KEY,
+    fee_id VARCHAR(10) NOT NULL,
+    student_id VARCHAR(10),
     amount FLOAT,
     status VARCHAR(50),
-    due_date DATE
+    due_date DATE NOT NULL,
+    PRIMARY KEY (fee_id, due_date),
+    INDEX idx_fee_student (student_id),
+    -- get_fee_details: status filter plus due-date range, or due-date order alone
+    INDEX idx_fee_status_due (status, due_date),
+    INDEX idx_fee_due (due_date)
+)
+PARTITION BY RANGE COLUMNS (due_date) (
+    PARTITION p_old VALUES LESS THAN ('2020-01-01'),
+    PARTITION p2020_1 VALUES LESS THAN ('2020-07-01'),
+    PARTITION p2020_2 VALUES LESS THAN ('2021-01-01'),
+    PARTITION p2021_1 VALUES LESS THAN ('2021-07-01'),
+    PARTITION p2021_2 VALUES LESS THAN ('2022-01-01'),
+    PARTITION p2022_1 VALUES LESS THAN ('2022-07-01'),
+    PARTITION p2022_2 VALUES LESS THAN ('2023-01-01'),
+    PARTITION p2023_1 VALUES LESS THAN ('2023-07-01'),
+    PARTITION p2023_2 VALUES LESS THAN ('2024-01-01'),
+    PARTITION p2024_1 VALUES LESS THAN ('2024-07-01'),
+    PARTITION p2024_2 VALUES LESS THAN ('2025-01-01'),
+    PARTITION p2025_1 VALUES LESS THAN ('2025-07-01'),
+    PARTITION p2025_2 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p2026_1 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p2026_2 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p2027_1 VALUES LESS THAN ('2027-07-01'),
+    PARTITION p2027_2 VALUES LESS THAN ('2028-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
 );
 
 CREATE TABLE IF NOT EXISTS EMPLOYEE (
     emp_id VARCHAR(10) PRIMARY KEY,
     name VARCHAR(255),
     activity VARCHAR(100),
-    service VARCHAR(100)
+    service VARCHAR(100),
+    INDEX idx_employee_name (name),
+    FULLTEXT INDEX ft_employee (name, activity, service)
 );
 
 CREATE TABLE IF NOT EXISTS HOSTEL_SERVICE (
     service_id VARCHAR(10) PRIMARY KEY,
     service_type VARCHAR(100),
-    details TEXT
+    details TEXT,
+    INDEX idx_service_type (service_type),
+    FULLTEXT INDEX ft_hostel_service (service_type, details)
 );
 
+-- One row per room, created by after_room_insert and removed with the room;
+-- the triggers keep current_occupancy equal to the room's students and
+-- reconcile_occupancy() repairs any drift
 CREATE TABLE IF NOT EXISTS ROOM_OCCUPANCY (
     room_no INT PRIMARY KEY,
     current_occupancy INT DEFAULT 0,
-    FOREIGN KEY (room_no) REFERENCES ROOM(room_no)
+    CONSTRAINT fk_occupancy_room FOREIGN KEY (room_no) REFERENCES ROOM(room_no) ON DELETE CASCADE
 );
 
-INSERT INTO ROOM_OCCUPANCY (room_no, current_occupancy)
-SELECT room_no, 0 FROM ROOM;
-
--- Update ROOM_OCCUPANCY table with correct occupancy count
-UPDATE ROOM_OCCUPANCY ro
-JOIN STUDENT s ON ro.room_no = s.room_no
-SET ro.current_occupancy = (
-    SELECT COUNT(*) 
-    FROM STUDENT 
-    WHERE room_no = ro.room_no
+-- Dashboard KPIs kept current by triggers, per hostel. Metrics without a
+-- breakdown use an empty dimension; the *_by_type and *_by_status metrics
+-- use the room type or fee status. Rooms count towards their own hostel,
+-- students and their fees towards the student's; hostel_id 0 holds rows
+-- without a hostel. Campus-wide figures are the sums over hostels.
+CREATE TABLE IF NOT EXISTS DASHBOARD_STATS (
+    hostel_id INT NOT NULL DEFAULT 0,
+    metric VARCHAR(50) NOT NULL,
+    dimension VARCHAR(50) NOT NULL DEFAULT '',
+    value INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (hostel_id, metric, dimension)
 );
 
 
 DELIMITER //
 
+-- Add delta to one hostel's DASHBOARD_STATS counter, creating it on first use
+CREATE PROCEDURE bump_stat(IN p_hostel_id INT, IN p_metric VARCHAR(50), IN p_dimension VARCHAR(50), IN p_delta INT)
+BEGIN
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    VALUES (COALESCE(p_hostel_id, 0), p_metric, COALESCE(p_dimension, ''), COALESCE(p_delta, 0))
+    ON DUPLICATE KEY UPDATE value = value + COALESCE(p_delta, 0);
+END //
+
 CREATE TRIGGER after_student_insert
 AFTER INSERT ON STUDENT
 FOR EACH ROW
 BEGIN
+    DECLARE room_capacity INT;
+    DECLARE room_type VARCHAR(50);
+    DECLARE room_hostel INT;
+    DECLARE occupancy INT;
+
     UPDATE ROOM_OCCUPANCY 
     SET current_occupancy = current_occupancy + 1
     WHERE room_no = NEW.room_no;
+
+    CALL bump_stat(NEW.hostel_id, 'students', '', 1);
+    IF NEW.room_no IS NOT NULL THEN
+        SELECT r.capacity, r.type, r.hostel_id, COALESCE(ro.current_occupancy, 0)
+        INTO room_capacity, room_type, room_hostel, occupancy
+        FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+        WHERE r.room_no = NEW.room_no;
+
+        CALL bump_stat(room_hostel, 'occupants_by_type', room_type, 1);
+        -- This student took the room's last free bed
+        IF occupancy = room_capacity THEN
+            CALL bump_stat(room_hostel, 'available_rooms', '', -1);
+        END IF;
+    END IF;
+END //
+
+-- A deleted student's fees lose their student_id, as ON DELETE SET NULL
+-- would do if FEE could have a foreign key. Done before the delete so that
+-- after_fee_update still finds the student's hostel and moves the fees'
+-- counts to hostel 0.
+CREATE TRIGGER before_student_delete
+BEFORE DELETE ON STUDENT
+FOR EACH ROW
+BEGIN
+    UPDATE FEE SET student_id = NULL WHERE student_id = OLD.student_id;
 END //
 
 -- Create trigger to update room occupancy after student delete
@@ -86,22 +188,553 @@ CREATE TRIGGER after_student_delete
 AFTER DELETE ON STUDENT
 FOR EACH ROW
 BEGIN
+    DECLARE room_capacity INT;
+    DECLARE room_type VARCHAR(50);
+    DECLARE room_hostel INT;
+    DECLARE occupancy INT;
+
     UPDATE ROOM_OCCUPANCY 
     SET current_occupancy = current_occupancy - 1
     WHERE room_no = OLD.room_no;
+
+    CALL bump_stat(OLD.hostel_id, 'students', '', -1);
+    IF OLD.room_no IS NOT NULL THEN
+        SELECT r.capacity, r.type, r.hostel_id, COALESCE(ro.current_occupancy, 0)
+        INTO room_capacity, room_type, room_hostel, occupancy
+        FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+        WHERE r.room_no = OLD.room_no;
+
+        CALL bump_stat(room_hostel, 'occupants_by_type', room_type, -1);
+        -- The room was full until this student left
+        IF occupancy = room_capacity - 1 THEN
+            CALL bump_stat(room_hostel, 'available_rooms', '', 1);
+        END IF;
+    END IF;
+END //
+
+-- A student moving rooms leaves one bed and takes another; a student
+-- moving hostels takes their own and their fees' counts along
+CREATE TRIGGER after_student_update
+AFTER UPDATE ON STUDENT
+FOR EACH ROW
+BEGIN
+    DECLARE room_capacity INT;
+    DECLARE room_type VARCHAR(50);
+    DECLARE room_hostel INT;
+    DECLARE occupancy INT;
+
+    -- The student's fees still refer to the old ID
+    IF OLD.student_id <> NEW.student_id
+       AND EXISTS (SELECT 1 FROM FEE WHERE student_id = OLD.student_id) THEN
+        SIGNAL SQLSTATE '23000' SET MYSQL_ERRNO = 1451,
+            MESSAGE_TEXT = 'Cannot change the ID of a student who has fees';
+    END IF;
+
+    IF NOT (OLD.room_no <=> NEW.room_no) THEN
+        IF OLD.room_no IS NOT NULL THEN
+            UPDATE ROOM_OCCUPANCY
+            SET current_occupancy = current_occupancy - 1
+            WHERE room_no = OLD.room_no;
+
+            SELECT r.capacity, r.type, r.hostel_id, COALESCE(ro.current_occupancy, 0)
+            INTO room_capacity, room_type, room_hostel, occupancy
+            FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+            WHERE r.room_no = OLD.room_no;
+
+            CALL bump_stat(room_hostel, 'occupants_by_type', room_type, -1);
+            IF occupancy = room_capacity - 1 THEN
+                CALL bump_stat(room_hostel, 'available_rooms', '', 1);
+            END IF;
+        END IF;
+
+        IF NEW.room_no IS NOT NULL THEN
+            UPDATE ROOM_OCCUPANCY
+            SET current_occupancy = current_occupancy + 1
+            WHERE room_no = NEW.room_no;
+
+            SELECT r.capacity, r.type, r.hostel_id, COALESCE(ro.current_occupancy, 0)
+            INTO room_capacity, room_type, room_hostel, occupancy
+            FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+            WHERE r.room_no = NEW.room_no;
+
+            CALL bump_stat(room_hostel, 'occupants_by_type', room_type, 1);
+            IF occupancy = room_capacity THEN
+                CALL bump_stat(room_hostel, 'available_rooms', '', -1);
+            END IF;
+        END IF;
+    END IF;
+
+    IF NOT (OLD.hostel_id <=> NEW.hostel_id) THEN
+        CALL bump_stat(OLD.hostel_id, 'students', '', -1);
+        CALL bump_stat(NEW.hostel_id, 'students', '', 1);
+
+        INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+        SELECT moved.hostel_id, 'fees_by_status', COALESCE(f.status, ''), moved.sign * COUNT(*)
+        FROM FEE f
+        CROSS JOIN (SELECT COALESCE(OLD.hostel_id, 0) AS hostel_id, -1 AS sign
+                    UNION ALL SELECT COALESCE(NEW.hostel_id, 0), 1) moved
+        WHERE f.student_id = NEW.student_id
+        GROUP BY moved.hostel_id, moved.sign, f.status
+        ON DUPLICATE KEY UPDATE value = value + VALUES(value);
+    END IF;
+END //
+
+-- Every new room starts with an empty ROOM_OCCUPANCY row
+CREATE TRIGGER after_room_insert
+AFTER INSERT ON ROOM
+FOR EACH ROW
+BEGIN
+    INSERT INTO ROOM_OCCUPANCY (room_no, current_occupancy) VALUES (NEW.room_no, 0);
+
+    CALL bump_stat(NEW.hostel_id, 'rooms', '', 1);
+    CALL bump_stat(NEW.hostel_id, 'rooms_by_type', NEW.type, 1);
+    CALL bump_stat(NEW.hostel_id, 'beds_by_type', NEW.type, NEW.capacity);
+    IF NEW.capacity > 0 THEN
+        CALL bump_stat(NEW.hostel_id, 'available_rooms', '', 1);
+    END IF;
+END //
+
+-- A room's students must belong to its hostel, so an occupied room cannot
+-- move to another one. Clearing the hostel is allowed: a room without a
+-- hostel takes students of any, and deleting a hostel does that.
+CREATE TRIGGER before_room_update
+BEFORE UPDATE ON ROOM
+FOR EACH ROW
+BEGIN
+    IF NEW.hostel_id IS NOT NULL AND NOT (OLD.hostel_id <=> NEW.hostel_id)
+       AND EXISTS (SELECT 1 FROM ROOM_OCCUPANCY WHERE room_no = OLD.room_no AND current_occupancy > 0) THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Room has occupants; move them before changing its hostel';
+    END IF;
+END //
+
+-- Takes the room's old figures out of its old hostel and adds the new ones
+-- to its new hostel; for an unchanged hostel the pairs net out
+CREATE TRIGGER after_room_update
+AFTER UPDATE ON ROOM
+FOR EACH ROW
+BEGIN
+    DECLARE occupancy INT DEFAULT 0;
+
+    SELECT COALESCE(MAX(current_occupancy), 0) INTO occupancy
+    FROM ROOM_OCCUPANCY WHERE room_no = NEW.room_no;
+
+    CALL bump_stat(OLD.hostel_id, 'rooms', '', -1);
+    CALL bump_stat(NEW.hostel_id, 'rooms', '', 1);
+    CALL bump_stat(OLD.hostel_id, 'rooms_by_type', OLD.type, -1);
+    CALL bump_stat(NEW.hostel_id, 'rooms_by_type', NEW.type, 1);
+    CALL bump_stat(OLD.hostel_id, 'beds_by_type', OLD.type, -OLD.capacity);
+    CALL bump_stat(NEW.hostel_id, 'beds_by_type', NEW.type, NEW.capacity);
+    CALL bump_stat(OLD.hostel_id, 'occupants_by_type', OLD.type, -occupancy);
+    CALL bump_stat(NEW.hostel_id, 'occupants_by_type', NEW.type, occupancy);
+    CALL bump_stat(OLD.hostel_id, 'available_rooms', '', -(occupancy < OLD.capacity));
+    CALL bump_stat(NEW.hostel_id, 'available_rooms', '', occupancy < NEW.capacity);
+END //
+
+-- Runs before the delete because ON DELETE CASCADE removes the room's
+-- ROOM_OCCUPANCY row together with the room
+CREATE TRIGGER before_room_delete
+BEFORE DELETE ON ROOM
+FOR EACH ROW
+BEGIN
+    DECLARE occupancy INT DEFAULT 0;
+
+    SELECT COALESCE(MAX(current_occupancy), 0) INTO occupancy
+    FROM ROOM_OCCUPANCY WHERE room_no = OLD.room_no;
+
+    CALL bump_stat(OLD.hostel_id, 'rooms', '', -1);
+    CALL bump_stat(OLD.hostel_id, 'rooms_by_type', OLD.type, -1);
+    CALL bump_stat(OLD.hostel_id, 'beds_by_type', OLD.type, -OLD.capacity);
+    CALL bump_stat(OLD.hostel_id, 'occupants_by_type', OLD.type, -occupancy);
+    IF occupancy < OLD.capacity THEN
+        CALL bump_stat(OLD.hostel_id, 'available_rooms', '', -1);
+    END IF;
+END //
+
+-- The checks FEE's primary key and foreign key made before partitioning.
+-- The locking reads block concurrent inserts of the same fee_id and
+-- deletes of the referenced student until this transaction ends.
+CREATE TRIGGER before_fee_insert
+BEFORE INSERT ON FEE
+FOR EACH ROW
+BEGIN
+    DECLARE v_found INT;
+
+    SELECT COUNT(*) INTO v_found FROM FEE WHERE fee_id = NEW.fee_id FOR UPDATE;
+    IF v_found > 0 THEN
+        SIGNAL SQLSTATE '23000' SET MYSQL_ERRNO = 1062,
+            MESSAGE_TEXT = 'Duplicate fee_id';
+    END IF;
+
+    IF NEW.student_id IS NOT NULL THEN
+        SELECT COUNT(*) INTO v_found FROM STUDENT WHERE student_id = NEW.student_id LOCK IN SHARE MODE;
+        IF v_found = 0 THEN
+            SIGNAL SQLSTATE '23000' SET MYSQL_ERRNO = 1452,
+                MESSAGE_TEXT = 'Cannot add a fee for a student that does not exist';
+        END IF;
+    END IF;
+END //
+
+CREATE TRIGGER before_fee_update
+BEFORE UPDATE ON FEE
+FOR EACH ROW
+BEGIN
+    DECLARE v_found INT;
+
+    IF NEW.fee_id <> OLD.fee_id THEN
+        SELECT COUNT(*) INTO v_found FROM FEE WHERE fee_id = NEW.fee_id FOR UPDATE;
+        IF v_found > 0 THEN
+            SIGNAL SQLSTATE '23000' SET MYSQL_ERRNO = 1062,
+                MESSAGE_TEXT = 'Duplicate fee_id';
+        END IF;
+    END IF;
+
+    IF NEW.student_id IS NOT NULL AND NOT (NEW.student_id <=> OLD.student_id) THEN
+        SELECT COUNT(*) INTO v_found FROM STUDENT WHERE student_id = NEW.student_id LOCK IN SHARE MODE;
+        IF v_found = 0 THEN
+            SIGNAL SQLSTATE '23000' SET MYSQL_ERRNO = 1452,
+                MESSAGE_TEXT = 'Cannot move a fee to a student that does not exist';
+        END IF;
+    END IF;
+END //
+
+-- Fees count towards their student's hostel
+CREATE TRIGGER after_fee_insert
+AFTER INSERT ON FEE
+FOR EACH ROW
+BEGIN
+    CALL bump_stat((SELECT hostel_id FROM STUDENT WHERE student_id = NEW.student_id), 'fees_by_status', NEW.status, 1);
+END //
+
+CREATE TRIGGER after_fee_update
+AFTER UPDATE ON FEE
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.status <=> NEW.status AND OLD.student_id <=> NEW.student_id) THEN
+        CALL bump_stat((SELECT hostel_id FROM STUDENT WHERE student_id = OLD.student_id), 'fees_by_status', OLD.status, -1);
+        CALL bump_stat((SELECT hostel_id FROM STUDENT WHERE student_id = NEW.student_id), 'fees_by_status', NEW.status, 1);
+    END IF;
+END //
+
+CREATE TRIGGER after_fee_delete
+AFTER DELETE ON FEE
+FOR EACH ROW
+BEGIN
+    CALL bump_stat((SELECT hostel_id FROM STUDENT WHERE student_id = OLD.student_id), 'fees_by_status', OLD.status, -1);
+END //
+
+-- Add one student to a room in a single round trip. The room row stays
+-- locked from the capacity check to the insert, so concurrent adds to the
+-- same room cannot overfill it. A room that belongs to a hostel only takes
+-- that hostel's students.
+CREATE PROCEDURE add_student_to_room(
+    IN p_student_id VARCHAR(10),
+    IN p_name VARCHAR(255),
+    IN p_course VARCHAR(100),
+    IN p_mess_plan VARCHAR(50),
+    IN p_laundry_plan VARCHAR(50),
+    IN p_hostel_id INT,
+    IN p_room_no INT
+)
+BEGIN
+    DECLARE v_capacity INT;
+    DECLARE v_occupancy INT;
+    DECLARE v_hostel_id INT;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    START TRANSACTION;
+
+    SELECT r.capacity, COALESCE(ro.current_occupancy, 0), r.hostel_id
+    INTO v_capacity, v_occupancy, v_hostel_id
+    FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+    WHERE r.room_no = p_room_no
+    FOR UPDATE;
+
+    IF v_capacity IS NULL THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Room does not exist';
+    END IF;
+    IF v_hostel_id IS NOT NULL AND NOT (v_hostel_id <=> p_hostel_id) THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Room belongs to another hostel';
+    END IF;
+    IF v_occupancy >= v_capacity THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Room is already full';
+    END IF;
+
+    INSERT INTO STUDENT (student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no)
+    VALUES (p_student_id, p_name, p_course, p_mess_plan, p_laundry_plan, p_hostel_id, p_room_no);
+
+    COMMIT;
+END //
+
+-- Place every student in STUDENT_INTAKE into a free bed of their hostel
+-- with set-based statements. Rooms and students without a hostel form one
+-- more group (hostel 0). Within a hostel, pass 1 gives the k-th applicant
+-- for a room type the k-th free bed of that type; pass 2 fills the
+-- remaining beds, in room order, with students who have no preference (or,
+-- unless p_strict, whose preferred type ran out). Placed students move to
+-- STUDENT; the rest stay queued.
+CREATE PROCEDURE allocate_intake(IN p_strict BOOLEAN)
+BEGIN
+    DECLARE v_allocated INT;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    START TRANSACTION;
+
+    -- Blocks add_student_to_room until the batch commits
+    SELECT COUNT(*) INTO v_allocated FROM ROOM FOR UPDATE;
+
+    DROP TEMPORARY TABLE IF EXISTS free_bed, spare_bed, intake_rank, waiting;
+
+    -- One row per free bed, numbered within its hostel and room type; rooms
+    -- without a type get '' so they still fit the key (and only pass 2 uses them)
+    CREATE TEMPORARY TABLE free_bed (
+        hostel_id INT,
+        room_no INT,
+        type VARCHAR(50) NOT NULL,
+        type_rank INT,
+        taken BOOLEAN NOT NULL DEFAULT FALSE,
+        PRIMARY KEY (hostel_id, type, type_rank)
+    );
+    INSERT INTO free_bed (hostel_id, room_no, type, type_rank)
+    SELECT COALESCE(r.hostel_id, 0), r.room_no, COALESCE(r.type, ''),
+           ROW_NUMBER() OVER (PARTITION BY COALESCE(r.hostel_id, 0), COALESCE(r.type, '') ORDER BY r.room_no, slot.n)
+    FROM ROOM r
+    LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+    JOIN (
+        SELECT tens.d * 10 + ones.d + 1 AS n
+        FROM (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+              UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) ones
+        CROSS JOIN (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+              UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) tens
+    ) slot ON slot.n <= r.capacity - COALESCE(ro.current_occupancy, 0);
+
+    -- Pass 1: preferred room type
+    UPDATE STUDENT_INTAKE SET room_no = NULL;
+    CREATE TEMPORARY TABLE intake_rank (PRIMARY KEY (student_id))
+    SELECT student_id, COALESCE(hostel_id, 0) AS hostel_id, preferred_type,
+           ROW_NUMBER() OVER (PARTITION BY COALESCE(hostel_id, 0), preferred_type ORDER BY student_id) AS type_rank
+    FROM STUDENT_INTAKE
+    WHERE preferred_type IS NOT NULL;
+
+    UPDATE STUDENT_INTAKE i
+    JOIN intake_rank k ON k.student_id = i.student_id
+    JOIN free_bed b ON b.hostel_id = k.hostel_id AND b.type = k.preferred_type AND b.type_rank = k.type_rank
+    SET i.room_no = b.room_no;
+
+    UPDATE free_bed b
+    JOIN (
+        SELECT COALESCE(hostel_id, 0) AS hostel_id, preferred_type, COUNT(*) AS assigned
+        FROM STUDENT_INTAKE
+        WHERE room_no IS NOT NULL
+        GROUP BY COALESCE(hostel_id, 0), preferred_type
+    ) a ON a.hostel_id = b.hostel_id AND a.preferred_type = b.type
+    SET b.taken = TRUE
+    WHERE b.type_rank <= a.assigned;
+
+    -- Pass 2: any remaining bed in the hostel
+    CREATE TEMPORARY TABLE spare_bed (PRIMARY KEY (hostel_id, bed_rank))
+    SELECT hostel_id, room_no, ROW_NUMBER() OVER (PARTITION BY hostel_id ORDER BY room_no, type_rank) AS bed_rank
+    FROM free_bed
+    WHERE NOT taken;
+
+    CREATE TEMPORARY TABLE waiting (PRIMARY KEY (student_id))
+    SELECT student_id, COALESCE(hostel_id, 0) AS hostel_id,
+           ROW_NUMBER() OVER (PARTITION BY COALESCE(hostel_id, 0) ORDER BY student_id) AS bed_rank
+    FROM STUDENT_INTAKE
+    WHERE room_no IS NULL AND (preferred_type IS NULL OR NOT p_strict);
+
+    UPDATE STUDENT_INTAKE i
+    JOIN waiting w ON w.student_id = i.student_id
+    JOIN spare_bed s ON s.hostel_id = w.hostel_id AND s.bed_rank = w.bed_rank
+    SET i.room_no = s.room_no;
+
+    INSERT INTO STUDENT (student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no)
+    SELECT student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no
+    FROM STUDENT_INTAKE
+    WHERE room_no IS NOT NULL;
+    SET v_allocated = ROW_COUNT();
+
+    DELETE FROM STUDENT_INTAKE WHERE room_no IS NOT NULL;
+    DROP TEMPORARY TABLE free_bed, spare_bed, intake_rank, waiting;
+
+    COMMIT;
+
+    SELECT v_allocated AS allocated, COUNT(*) AS unallocated FROM STUDENT_INTAKE;
+END //
+
+-- Recompute DASHBOARD_STATS from scratch, e.g. after bulk loads or drift
+CREATE PROCEDURE rebuild_dashboard_stats()
+BEGIN
+    START TRANSACTION;
+    DELETE FROM DASHBOARD_STATS;
+
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    SELECT COALESCE(hostel_id, 0), 'students', '', COUNT(*) FROM STUDENT GROUP BY COALESCE(hostel_id, 0)
+    UNION ALL
+    SELECT COALESCE(hostel_id, 0), 'rooms', '', COUNT(*) FROM ROOM GROUP BY COALESCE(hostel_id, 0)
+    UNION ALL
+    SELECT COALESCE(r.hostel_id, 0), 'available_rooms', '', COUNT(*)
+    FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+    WHERE COALESCE(ro.current_occupancy, 0) < r.capacity
+    GROUP BY COALESCE(r.hostel_id, 0)
+    UNION ALL
+    SELECT COALESCE(hostel_id, 0), 'rooms_by_type', COALESCE(type, ''), COUNT(*)
+    FROM ROOM GROUP BY COALESCE(hostel_id, 0), type
+    UNION ALL
+    SELECT COALESCE(hostel_id, 0), 'beds_by_type', COALESCE(type, ''), COALESCE(SUM(capacity), 0)
+    FROM ROOM GROUP BY COALESCE(hostel_id, 0), type
+    UNION ALL
+    SELECT COALESCE(r.hostel_id, 0), 'occupants_by_type', COALESCE(r.type, ''), COALESCE(SUM(ro.current_occupancy), 0)
+    FROM ROOM r JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no GROUP BY COALESCE(r.hostel_id, 0), r.type
+    UNION ALL
+    SELECT COALESCE(s.hostel_id, 0), 'fees_by_status', COALESCE(f.status, ''), COUNT(*)
+    FROM FEE f LEFT JOIN STUDENT s ON s.student_id = f.student_id
+    GROUP BY COALESCE(s.hostel_id, 0), f.status;
+    COMMIT;
+END //
+
+-- Repair ROOM_OCCUPANCY drift (e.g. from rooms created before the triggers,
+-- edits made directly to the table or restores that skip triggers) with
+-- set-based statements: add the rows missing for rooms, then correct every
+-- count that differs from the room's students in one grouped join. The
+-- dashboard counters derived from occupancy are rebuilt if anything
+-- changed. Returns the number of rows added and corrected. Concurrent calls
+-- do not overlap; a call made while another runs returns zeros at once.
+CREATE PROCEDURE reconcile_occupancy()
+reconcile: BEGIN
+    DECLARE v_missing INT DEFAULT 0;
+    DECLARE v_corrected INT DEFAULT 0;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        DO RELEASE_LOCK('reconcile_occupancy');
+        RESIGNAL;
+    END;
+
+    IF NOT GET_LOCK('reconcile_occupancy', 0) THEN
+        SELECT 0 AS missing, 0 AS corrected;
+        LEAVE reconcile;
+    END IF;
+
+    START TRANSACTION;
+
+    INSERT INTO ROOM_OCCUPANCY (room_no, current_occupancy)
+    SELECT r.room_no, 0
+    FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+    WHERE ro.room_no IS NULL;
+    SET v_missing = ROW_COUNT();
+
+    UPDATE ROOM_OCCUPANCY ro
+    LEFT JOIN (
+        SELECT room_no, COUNT(*) AS occupants
+        FROM STUDENT
+        WHERE room_no IS NOT NULL
+        GROUP BY room_no
+    ) s ON s.room_no = ro.room_no
+    SET ro.current_occupancy = COALESCE(s.occupants, 0)
+    WHERE NOT (ro.current_occupancy <=> COALESCE(s.occupants, 0));
+    SET v_corrected = ROW_COUNT();
+
+    COMMIT;
+
+    IF v_missing + v_corrected > 0 THEN
+        CALL rebuild_dashboard_stats();
+    END IF;
+    DO RELEASE_LOCK('reconcile_occupancy');
+
+    SELECT v_missing AS missing, v_corrected AS corrected;
 END //
 
 DELIMITER ;
 
--- Initial population of ROOM_OCCUPANCY table
 DELIMITER //
 
-CREATE PROCEDURE get_fee_details()
+-- Split FEE's p_future partition into terms until p_until, so new fees land
+-- in a partition of their own term instead of p_future. Returns the number
+-- of terms added.
+CREATE PROCEDURE add_fee_partitions(IN p_until DATE)
+BEGIN
+    DECLARE v_start DATE;
+    DECLARE v_end DATE;
+    DECLARE v_parts TEXT DEFAULT '';
+    DECLARE v_added INT DEFAULT 0;
+
+    -- p_future starts at the bound of the last term partition
+    SELECT MAX(STR_TO_DATE(TRIM(BOTH '''' FROM PARTITION_DESCRIPTION), '%Y-%m-%d')) INTO v_start
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'FEE' AND PARTITION_DESCRIPTION <> 'MAXVALUE';
+
+    WHILE v_start <= p_until DO
+        SET v_end = v_start + INTERVAL 6 MONTH;
+        SET v_parts = CONCAT(v_parts, 'PARTITION p', YEAR(v_start), '_', IF(MONTH(v_start) < 7, 1, 2),
+                             ' VALUES LESS THAN (''', v_end, '''), ');
+        SET v_start = v_end;
+        SET v_added = v_added + 1;
+    END WHILE;
+
+    IF v_added > 0 THEN
+        SET @add_fee_partitions = CONCAT('ALTER TABLE FEE REORGANIZE PARTITION p_future INTO (', v_parts,
+                                         'PARTITION p_future VALUES LESS THAN (MAXVALUE))');
+        PREPARE stmt FROM @add_fee_partitions;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+
+    SELECT v_added AS added;
+END //
+
+-- Fees with their student's name, optionally filtered by status, due date
+-- range and the student's hostel, one page at a time. NULL arguments mean
+-- "no filter"/"no limit".
+CREATE PROCEDURE get_fee_details(
+    IN p_status VARCHAR(50),
+    IN p_due_from DATE,
+    IN p_due_to DATE,
+    IN p_limit INT,
+    IN p_offset INT,
+    IN p_hostel_id INT
+)
 BEGIN
-    SELECT f.*, s.name AS student_name
-    FROM FEE f
-    JOIN STUDENT s 
-    ON f.fee_id = CONCAT('F', LPAD(SUBSTRING(s.student_id, 2), 3, '0'));
+    DECLARE v_due_from DATE DEFAULT COALESCE(p_due_from, '1000-01-01');
+    DECLARE v_due_to DATE DEFAULT COALESCE(p_due_to, '9999-12-31');
+    DECLARE v_limit BIGINT UNSIGNED DEFAULT COALESCE(p_limit, 18446744073709551615);
+    DECLARE v_offset BIGINT UNSIGNED DEFAULT COALESCE(p_offset, 0);
+
+    -- Separate statements keep each one a plain range on one index. One
+    -- hostel's fees are found through its students (idx_student_hostel_room)
+    -- and their fees (the FEE.student_id index), then sorted.
+    IF p_hostel_id IS NOT NULL THEN
+        SELECT f.*, s.name AS student_name
+        FROM STUDENT s
+        JOIN FEE f ON f.student_id = s.student_id
+        WHERE s.hostel_id = p_hostel_id
+          AND (p_status IS NULL OR f.status = p_status)
+          AND f.due_date BETWEEN v_due_from AND v_due_to
+        ORDER BY f.due_date, f.fee_id
+        LIMIT v_limit OFFSET v_offset;
+    ELSEIF p_status IS NULL THEN
+        SELECT f.*, s.name AS student_name
+        FROM FEE f
+        JOIN STUDENT s ON s.student_id = f.student_id
+        WHERE f.due_date BETWEEN v_due_from AND v_due_to
+        ORDER BY f.due_date, f.fee_id
+        LIMIT v_limit OFFSET v_offset;
+    ELSE
+        SELECT f.*, s.name AS student_name
+        FROM FEE f
+        JOIN STUDENT s ON s.student_id = f.student_id
+        WHERE f.status = p_status
+          AND f.due_date BETWEEN v_due_from AND v_due_to
+        ORDER BY f.due_date, f.fee_id
+        LIMIT v_limit OFFSET v_offset;
+    END IF;
 END //
 
 DELIMITER ;
@@ -112,12 +745,12 @@ INSERT INTO HOSTEL (name) VALUES
 ('Beta Hostel'),
 ('Gamma Hostel');
 
-INSERT INTO ROOM (room_no, capacity, type) VALUES 
-(101, 2, 'Double'),
-(102, 1, 'Single'),
-(103, 4, 'Dormitory'),
-(201, 3, 'Triple'),
-(202, 2, 'Double');
+INSERT INTO ROOM (room_no, capacity, type, hostel_id) VALUES 
+(101, 2, 'Double', 1),
+(102, 1, 'Single', 1),
+(103, 4, 'Dormitory', 2),
+(201, 3, 'Triple', 3),
+(202, 2, 'Double', 2);
 
 INSERT INTO STUDENT (student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no) VALUES 
 ('S001', 'Alice Brown', 'Engineering', 'Standard', 'Basic', 1, 101),
@@ -126,12 +759,12 @@ INSERT INTO STUDENT (student_id, name, course, mess_plan, laundry_plan, hostel_i
 ('S004', 'Daisy Johnson', 'Engineering', 'Premium', 'Premium', 3, 201),
 ('S005', 'Evan Lee', 'Medicine', 'Standard', 'Standard', 2, 202);
 
-INSERT INTO FEE (fee_id, amount, status, due_date) VALUES 
-('F001', 500.0, 'Paid', '2023-05-10'),
-('F002', 750.0, 'Pending', '2023-06-15'),
-('F003', 600.0, 'Paid', '2023-07-20'),
-('F004', 800.0, 'Overdue', '2023-08-25'),
-('F005', 700.0, 'Pending', '2023-09-30');
+INSERT INTO FEE (fee_id, student_id, amount, status, due_date) VALUES 
+('F001', 'S001', 500.0, 'Paid', '2023-05-10'),
+('F002', 'S002', 750.0, 'Pending', '2023-06-15'),
+('F003', 'S003', 600.0, 'Paid', '2023-07-20'),
+('F004', 'S004', 800.0, 'Overdue', '2023-08-25'),
+('F005', 'S005', 700.0, 'Pending', '2023-09-30');
 
 INSERT INTO EMPLOYEE (emp_id, name, activity, service) VALUES 
 ('E001', 'John Doe', 'Cleaning', 'Housekeeping'),
@@ -147,18 +780,7 @@ INSERT INTO HOSTEL_SERVICE (service_id, service_type, details) VALUES
 ('SVC004', 'Security', '24/7 CCTV and security guard service'),
 ('SVC005', 'Cafeteria', 'Cafeteria provides three meals a day');
 
--- Create trigger to update room occupancy after student insert
--- Insert initial data into ROOM_OCCUPANCY if it's empty
-INSERT INTO ROOM_OCCUPANCY (room_no, current_occupancy)
-SELECT room_no, 0 FROM ROOM;
-
--- Update ROOM_OCCUPANCY table with correct occupancy count
-UPDATE ROOM_OCCUPANCY ro
-JOIN STUDENT s ON ro.room_no = s.room_no
-SET ro.current_occupancy = (
-    SELECT COUNT(*) 
-    FROM STUDENT 
-    WHERE room_no = ro.room_no
-);
-
--- Insert initial data into ROOM_OCCUPANCY if it's empty
+-- The triggers kept ROOM_OCCUPANCY current while the sample data went in;
+-- check it anyway, then seed DASHBOARD_STATS
+CALL reconcile_occupancy();
+CALL rebuild_dashboard_stats();
@@ -0,0 +1,618 @@
+import functools
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from queue import Empty, LifoQueue
+
+import mysql.connector
+from dotenv import load_dotenv
+
+import frames
+import metrics
+from backends import get_backend
+from cache import PROCEDURE_READS, PROCEDURE_WRITES, make_key, procedure_name, query_cache, tables_in, with_dependents
+
+load_dotenv()
+
+# Streamlit re-executes main.py on every rerun, but imported modules are
+# loaded once per process, so the pool below is shared by every session.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 8))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+# Idle connections older than this (seconds) are pinged before being handed out
+POOL_PING_AFTER = float(os.getenv("DB_POOL_PING_AFTER", 30))
+# Threads shared by all sessions for running a page's independent reads
+# concurrently; never more than the pool has connections
+FETCH_WORKERS = int(os.getenv("DB_FETCH_WORKERS", 4))
+# Rows fetched per round trip when building a DataFrame
+FRAME_BATCH_ROWS = int(os.getenv("FRAME_BATCH_ROWS", 5000))
+
+# Read replicas as "host:port,host:port"; plain SELECTs are spread across
+# them and everything else stays on DB_HOST. Ignored by the sqlite backend.
+REPLICAS = [r.strip() for r in os.getenv("DB_REPLICAS", "").split(",") if r.strip()]
+# Replicas further behind than this (seconds) leave the rotation
+REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", 5))
+# How often each replica's lag is checked (by the scheduler thread)
+REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", 5))
+# Seconds to wait for a replica to accept a connection, and for any one
+# reply from it, before giving up on it and ejecting it
+REPLICA_CONNECT_TIMEOUT = int(os.getenv("DB_REPLICA_CONNECT_TIMEOUT", 2))
+REPLICA_READ_TIMEOUT = int(os.getenv("DB_REPLICA_READ_TIMEOUT", 30))
+
+
+class PoolTimeout(mysql.connector.errors.PoolError):
+    pass
+
+
+def connection_config(host=None, port=None):
+    # Replicas share the primary's credentials unless DB_REPLICA_USER /
+    # DB_REPLICA_PASSWORD are set, and time out quickly so one that stopped
+    # answering is dropped instead of holding up a page
+    replica = host is not None
+    config = dict(
+        host=host or os.getenv("DB_HOST", "127.0.0.1"),
+        port=int(port or os.getenv("DB_PORT", 4121)),
+        user=(replica and os.getenv("DB_REPLICA_USER")) or os.getenv("DB_USER", "root"),
+        password=(replica and os.getenv("DB_REPLICA_PASSWORD")) or os.getenv("DB_PASSWORD", "root_password"),
+        database=os.getenv("DB_NAME", "HostelManagement"),
+        charset='utf8mb4',
+        collation='utf8mb4_unicode_ci',
+        autocommit=True,
+    )
+    if replica:
+        config.update(connection_timeout=REPLICA_CONNECT_TIMEOUT, read_timeout=REPLICA_READ_TIMEOUT)
+    return config
+
+
+def _connect(host=None, port=None):
+    # A connection to the configured backend (backends.DB_BACKEND); every
+    # backend's connections follow the mysql.connector API
+    return get_backend().connect(connection_config(host, port))
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    def __init__(self, size=POOL_SIZE, timeout=POOL_TIMEOUT, ping_after=POOL_PING_AFTER, connect=_connect):
+        self.size = size
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self._connect = connect
+        # LIFO keeps the warmest connections in use and lets the rest go idle
+        self._idle = LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._stats = {
+            "checkouts": 0,
+            "in_use": 0,
+            "created": 0,
+            "reconnects": 0,
+            "discarded": 0,
+            "exhausted": 0,
+            "timeouts": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["size"] = self.size
+        stats["idle"] = self._idle.qsize()
+        return stats
+
+    def acquire(self):
+        start = time.perf_counter()
+        if not self._slots.acquire(blocking=False):
+            # Every connection is checked out; wait for one to come back
+            self._count("exhausted")
+            if not self._slots.acquire(timeout=self.timeout):
+                self._count("timeouts")
+                raise PoolTimeout(f"No database connection available after {self.timeout}s")
+        waited = time.perf_counter() - start
+
+        try:
+            conn = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+        metrics.registry.observe_acquire(time.perf_counter() - start)
+
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["in_use"] += 1
+            self._stats["wait_seconds_total"] += waited
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+        return conn
+
+    def _checkout(self):
+        while True:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except Empty:
+                self._count("created")
+                return self._connect()
+
+            if time.monotonic() - last_used < self.ping_after:
+                return conn
+            try:
+                conn.ping()
+                return conn
+            except mysql.connector.Error:
+                pass
+            try:
+                conn.reconnect(attempts=2, delay=0)
+                self._count("reconnects")
+                return conn
+            except mysql.connector.Error:
+                # Server went away and could not be reached again; drop it
+                self._count("discarded")
+                _close_quietly(conn)
+
+    def release(self, conn, discard=False):
+        try:
+            if not discard:
+                try:
+                    if conn.unread_result:
+                        conn.consume_results()
+                    if conn.in_transaction:
+                        conn.rollback()
+                except mysql.connector.Error:
+                    discard = True
+            if discard:
+                self._count("discarded")
+                _close_quietly(conn)
+            else:
+                self._idle.put((conn, time.monotonic()))
+        finally:
+            self._count("in_use", -1)
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError):
+            discard = True
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def close(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except Empty:
+                return
+            _close_quietly(conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def connection():
+    return get_pool().connection()
+
+
+class Replica:
+    def __init__(self, address, pool):
+        self.address = address
+        self.pool = pool
+        self.healthy = False  # until the first lag check finds it caught up
+        self.lag = None
+        self.error = "not checked yet"
+        self.reads = 0
+        self.checked_at = float("-inf")
+        self.checking = threading.Lock()
+
+
+class ReadRouter:
+    # Picks where a read runs: replicas in turn, skipping any that lag too
+    # far, or the primary when the read touches a table written in the last
+    # `pin_seconds` (so a page sees its own writes) or no replica is healthy.
+    def __init__(self, replicas, max_lag=REPLICA_MAX_LAG, check_interval=REPLICA_CHECK_INTERVAL, pin_seconds=None):
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        # Long enough to outlast the lag of any replica still in rotation
+        self.pin_seconds = max_lag + check_interval if pin_seconds is None else pin_seconds
+        self._turn = itertools.count()
+        self._written = {}  # table -> monotonic time of its last write
+        self._lock = threading.Lock()
+        self._stats = {"replica_reads": 0, "primary_reads": 0, "pinned_reads": 0, "ejections": 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["replicas"] = len(self.replicas)
+        stats["healthy_replicas"] = sum(r.healthy for r in self.replicas)
+        return stats
+
+    def replica_status(self):
+        return [
+            {"replica": r.address, "healthy": r.healthy, "lag_s": r.lag, "reads": r.reads, "error": r.error}
+            for r in self.replicas
+        ]
+
+    def record_write(self, tables):
+        now = time.monotonic()
+        with self._lock:
+            for table in with_dependents(tables):
+                self._written[table] = now
+
+    def _recently_written(self, tables):
+        cutoff = time.monotonic() - self.pin_seconds
+        with self._lock:
+            return any(self._written.get(table, cutoff) > cutoff for table in tables)
+
+    def check(self, replica):
+        # A replica that is behind, not replicating or unreachable leaves the
+        # rotation until a later check finds it caught up
+        try:
+            with replica.pool.connection() as conn:
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute("SHOW SLAVE STATUS")
+                status = cursor.fetchall()
+                cursor.close()
+            replica.lag = status[0]["Seconds_Behind_Master"] if status else None
+            replica.error = None if replica.lag is not None else "replication is not running"
+        except mysql.connector.Error as e:
+            replica.lag = None
+            replica.error = str(e)
+        healthy = replica.lag is not None and replica.lag <= self.max_lag
+        if replica.healthy and not healthy:
+            self._count("ejections")
+        replica.healthy = healthy
+        replica.checked_at = time.monotonic()
+
+    def refresh(self, replica):
+        # Starts a check of `replica` in a background thread unless one is
+        # already running, so no read waits on a replica that stopped answering
+        if not replica.checking.acquire(blocking=False):
+            return False
+
+        def run():
+            try:
+                self.check(replica)
+            finally:
+                replica.checking.release()
+
+        threading.Thread(target=run, name=f"replica-check-{replica.address}", daemon=True).start()
+        return True
+
+    def check_all(self):
+        # Run every `check_interval` seconds by the scheduler thread; skips
+        # replicas a refresh() is already checking
+        for replica in self.replicas:
+            if replica.checking.acquire(blocking=False):
+                try:
+                    self.check(replica)
+                finally:
+                    replica.checking.release()
+        return {"healthy": sum(r.healthy for r in self.replicas), "replicas": len(self.replicas)}
+
+    def eject(self, replica, error):
+        if replica.healthy:
+            self._count("ejections")
+        replica.healthy = False
+        replica.error = str(error)
+        replica.checked_at = time.monotonic()
+
+    def choose(self, tables):
+        # Returns a Replica, or None for the primary. `tables` None means the
+        # tables read are unknown, which is treated like a recent write.
+        # Only the last check's state is read here; a replica whose check is
+        # overdue (no scheduler in this process, or it is busy) gets one
+        # started in the background.
+        if not self.replicas:
+            return None
+        if tables is None or self._recently_written(tables):
+            self._count("pinned_reads")
+            return None
+        start = next(self._turn)
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(start + i) % len(self.replicas)]
+            if time.monotonic() - replica.checked_at >= self.check_interval:
+                self.refresh(replica)
+            if replica.healthy:
+                replica.reads += 1
+                self._count("replica_reads")
+                return replica
+        self._count("primary_reads")
+        return None
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                replicas = []
+                for address in (REPLICAS if get_backend().supports_replicas else []):
+                    host, _, port = address.partition(":")
+                    connect = functools.partial(_connect, host, port or 3306)
+                    replicas.append(Replica(address, ConnectionPool(connect=connect)))
+                _router = ReadRouter(replicas)
+                # Replicas serve reads once their first check finds them caught up
+                for replica in replicas:
+                    _router.refresh(replica)
+    return _router
+
+
+@contextmanager
+def read_connection(tables=None):
+    # A connection for reading `tables`: from a replica when the router
+    # picks one, else from the primary. A replica that cannot be reached is
+    # taken out of rotation and the read goes to the primary instead.
+    router = get_router()
+    replica = router.choose(tables)
+    conn = None
+    if replica is not None:
+        try:
+            conn = replica.pool.acquire()
+        except PoolTimeout:
+            pass
+        except mysql.connector.Error as e:
+            router.eject(replica, e)
+    if conn is None:
+        with connection() as conn:
+            yield conn
+        return
+
+    discard = False
+    try:
+        yield conn
+    except (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError) as e:
+        discard = True
+        router.eject(replica, e)
+        raise
+    finally:
+        replica.pool.release(conn, discard=discard)
+
+
+def invalidate(tables):
+    # After a write: drop cached reads of `tables` and keep reads of them on
+    # the primary until replicas have caught up
+    query_cache.invalidate(tables)
+    get_router().record_write(tables)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max(1, min(FETCH_WORKERS, POOL_SIZE)),
+                                               thread_name_prefix="db-fetch")
+    return _executor
+
+
+def run_concurrently(*calls):
+    # Each call is (func, *args), e.g. (run_query, "SELECT ..."). Returns
+    # the results in order, so a page waits for its slowest read rather
+    # than the sum of them. The first error is raised once all have finished.
+    if len(calls) <= 1:
+        return [func(*args) for func, *args in calls]
+    futures = [get_executor().submit(func, *args) for func, *args in calls]
+    wait(futures)
+    return [future.result() for future in futures]
+
+
+def _is_select(query):
+    return query.lstrip().upper().startswith('SELECT')
+
+
+def run_query(query, params=None):
+    # Returns rows for SELECT/CALL statements and True for writes; raises on error
+    if _is_select(query):
+        key = make_key(query, params)
+        hit, rows = query_cache.get(key)
+        if hit:
+            return rows
+        tables = tables_in(query)
+        version = query_cache.version(tables)
+        rows = execute(query, params)
+        query_cache.put(key, rows, tables, version)
+        return rows
+
+    result = execute(query, params)
+    proc = procedure_name(query)
+    if proc is None:
+        invalidate(tables_in(query))
+    elif proc in PROCEDURE_WRITES:
+        invalidate(PROCEDURE_WRITES[proc])
+    return result
+
+
+def execute(query, params=None):
+    # Runs a statement directly, bypassing the query cache. SELECTs may run
+    # on a replica; everything else runs on the primary.
+    start = time.perf_counter()
+    rows = 0
+    error = False
+    try:
+        with (read_connection(tables_in(query)) if _is_select(query) else connection()) as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
+                if query.strip().upper().startswith('SELECT') or query.strip().upper().startswith('CALL'):
+                    result = cursor.fetchall()
+
+                    # Consume any remaining result sets (if it's a stored procedure)
+                    while cursor.nextset():
+                        cursor.fetchall()
+
+                    rows = len(result)
+                    return result
+
+                # Pooled connections run in autocommit mode, so the write is already durable
+                rows = cursor.rowcount
+                return True
+            finally:
+                cursor.close()
+    except Exception:
+        error = True
+        raise
+    finally:
+        metrics.registry.observe_statement(query, time.perf_counter() - start, rows, error)
+
+
+def call_procedure(proc_name, params=None):
+    cacheable = proc_name in PROCEDURE_READS
+    if cacheable:
+        key = make_key(f"CALL {proc_name}", params)
+        hit, rows = query_cache.get(key)
+        if hit:
+            return rows
+        version = query_cache.version(PROCEDURE_READS[proc_name])
+
+    start = time.perf_counter()
+    result = []
+    error = False
+    try:
+        with (read_connection(PROCEDURE_READS[proc_name]) if cacheable else connection()) as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.callproc(proc_name, params or [])
+
+                # Fetch all the result sets returned by the stored procedure
+                for result_set in cursor.stored_results():
+                    result.extend(result_set.fetchall())
+            finally:
+                cursor.close()
+    except Exception:
+        error = True
+        raise
+    finally:
+        placeholders = ", ".join(["?"] * len(params or []))
+        metrics.registry.observe_statement(f"CALL {proc_name}({placeholders})", time.perf_counter() - start,
+                                           len(result), error)
+
+    if cacheable:
+        query_cache.put(key, result, PROCEDURE_READS[proc_name], version)
+    elif proc_name in PROCEDURE_WRITES:
+        invalidate(PROCEDURE_WRITES[proc_name])
+    return result
+
+
+def _build_frame(result_sets):
+    # Reads every result set in tuple batches into one typed DataFrame
+    builder = None
+    for cursor in result_sets:
+        if cursor.description is None:
+            continue
+        if builder is None:
+            builder = frames.FrameBuilder(cursor.description)
+        while True:
+            batch = cursor.fetchmany(FRAME_BATCH_ROWS)
+            if not batch:
+                break
+            builder.add(batch)
+    return (builder or frames.FrameBuilder(None)).frame()
+
+
+def _fetch_frame(statement, tables, run):
+    # `run(cursor)` executes the statement and returns its result cursors
+    start = time.perf_counter()
+    frame = None
+    error = False
+    try:
+        with read_connection(tables) as conn:
+            cursor = conn.cursor()
+            try:
+                frame = _build_frame(run(cursor))
+                return frame
+            finally:
+                cursor.close()
+    except Exception:
+        error = True
+        raise
+    finally:
+        metrics.registry.observe_statement(statement, time.perf_counter() - start,
+                                           0 if frame is None else len(frame), error)
+
+
+def fetch_frame(query, params=None):
+    # A SELECT as a typed DataFrame (categoricals for enum columns, float64
+    # and datetime64 for numbers and dates) instead of a list of row dicts.
+    # Cached like run_query; callers must not modify the frame in place.
+    key = ("frame",) + make_key(query, params)
+    hit, frame = query_cache.get(key)
+    if hit:
+        return frame
+    tables = tables_in(query)
+    version = query_cache.version(tables)
+
+    def run(cursor):
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+        return [cursor]
+
+    frame = _fetch_frame(query, tables, run)
+    query_cache.put(key, frame, tables, version)
+    return frame
+
+
+def call_procedure_frame(proc_name, params=None):
+    # call_procedure for read-only procedures, returning a typed DataFrame
+    if proc_name not in PROCEDURE_READS:
+        raise ValueError(f"{proc_name} is not a read-only procedure")
+    key = ("frame",) + make_key(f"CALL {proc_name}", params)
+    hit, frame = query_cache.get(key)
+    if hit:
+        return frame
+    version = query_cache.version(PROCEDURE_READS[proc_name])
+
+    def run(cursor):
+        cursor.callproc(proc_name, params or [])
+        return cursor.stored_results()
+
+    placeholders = ", ".join(["?"] * len(params or []))
+    frame = _fetch_frame(f"CALL {proc_name}({placeholders})", PROCEDURE_READS[proc_name], run)
+    query_cache.put(key, frame, PROCEDURE_READS[proc_name], version)
+    return frame
+
+
+def prometheus_text():
+    return metrics.prometheus_text(get_pool().stats(), query_cache.stats(), get_router().stats())
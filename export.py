@@ -0,0 +1,179 @@
+import argparse
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+
+from mysql.connector import FieldType
+
+import db
+from schema import catalog
+
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", 5000))
+EXPORT_FORMATS = ["csv", "parquet"]
+
+# Stored procedures that can be exported, with the arguments they take
+EXPORTABLE_PROCEDURES = {
+    "get_fee_details": ["status", "due_from", "due_to", "limit", "offset", "hostel_id"],
+}
+
+
+def _stream_rows(query, params=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    # Yields the cursor description, then lists of up to `chunk_rows` tuples.
+    # The cursor is unbuffered, so rows stay on the server until fetched.
+    pool = db.get_pool()
+    conn = pool.acquire()
+    finished = False
+    try:
+        cursor = conn.cursor(buffered=False)
+        cursor.execute(query, params or ())
+        yield cursor.description
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield rows
+        # A CALL also returns a status result; drain it before reuse
+        while cursor.nextset():
+            cursor.fetchall()
+        cursor.close()
+        finished = True
+    finally:
+        # An abandoned export leaves unread rows on the wire; dropping the
+        # connection is cheaper than reading them all
+        pool.release(conn, discard=not finished)
+
+
+def _write_csv(chunks, description, target):
+    text = io.TextIOWrapper(target, encoding="utf-8", newline="", write_through=True)
+    try:
+        writer = csv.writer(text)
+        writer.writerow([column[0] for column in description])
+        rows = 0
+        for chunk in chunks:
+            writer.writerows(chunk)
+            rows += len(chunk)
+        return rows
+    finally:
+        # Leave the caller's stream open
+        text.detach()
+
+
+def _arrow_schema(description):
+    import pyarrow as pa
+
+    integers = {FieldType.TINY, FieldType.SHORT, FieldType.LONG, FieldType.LONGLONG, FieldType.INT24, FieldType.YEAR}
+    floats = {FieldType.FLOAT, FieldType.DOUBLE, FieldType.DECIMAL, FieldType.NEWDECIMAL}
+    fields = []
+    for name, type_code, *_ in description:
+        if type_code in integers:
+            arrow_type = pa.int64()
+        elif type_code in floats:
+            arrow_type = pa.float64()
+        elif type_code in (FieldType.DATE, FieldType.NEWDATE):
+            arrow_type = pa.date32()
+        elif type_code in (FieldType.DATETIME, FieldType.TIMESTAMP):
+            arrow_type = pa.timestamp("us")
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _write_parquet(chunks, description, target):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet export needs pyarrow (pip install pyarrow)")
+
+    # The schema comes from the result metadata, so every row group agrees
+    # even when the first chunk is all NULLs in some column
+    schema = _arrow_schema(description)
+    rows = 0
+    with pq.ParquetWriter(target, schema) as writer:
+        for chunk in chunks:
+            columns = list(zip(*chunk))
+            arrays = []
+            for values, field in zip(columns, schema):
+                if field.type == pa.float64():
+                    # DECIMAL columns arrive as Decimal objects
+                    values = [None if v is None else float(v) for v in values]
+                arrays.append(pa.array(values, type=field.type))
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            rows += len(chunk)
+    return rows
+
+
+def export_query(query, params, target, fmt="csv", chunk_rows=EXPORT_CHUNK_ROWS):
+    # Streams the query result into `target` (a path or binary file object)
+    # one chunk at a time; returns the number of rows written.
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    chunks = _stream_rows(query, params, chunk_rows)
+    description = next(chunks)
+    write = _write_csv if fmt == "csv" else _write_parquet
+    try:
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, "wb") as f:
+                return write(chunks, description, f)
+        return write(chunks, description, target)
+    finally:
+        chunks.close()
+
+
+def export_table(table, target, fmt="csv", chunk_rows=EXPORT_CHUNK_ROWS):
+    # Validates the name against the schema before it is placed in SQL
+    catalog.table(table)
+    return export_query(f"SELECT * FROM {table}", None, target, fmt, chunk_rows)
+
+
+def export_procedure(proc_name, args, target, fmt="csv", chunk_rows=EXPORT_CHUNK_ROWS):
+    if proc_name not in EXPORTABLE_PROCEDURES:
+        raise ValueError(f"Unknown procedure: {proc_name}")
+    args = list(args) + [None] * (len(EXPORTABLE_PROCEDURES[proc_name]) - len(args))
+    placeholders = ", ".join(["%s"] * len(args))
+    return export_query(f"CALL {proc_name}({placeholders})", args, target, fmt, chunk_rows)
+
+
+def export_to_tempfile(export, *args, **kwargs):
+    # For download buttons: spool the export to disk, not memory, and hand
+    # back the open file rewound to the start
+    f = tempfile.TemporaryFile()
+    export(*args, target=f, **kwargs)
+    f.seek(0)
+    return f
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a table or stored procedure result to CSV or Parquet.")
+    parser.add_argument("source", help="table name, or procedure name with --procedure")
+    parser.add_argument("output", help="file to write, or - for stdout")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=None,
+                        help="defaults to the output file's extension, else csv")
+    parser.add_argument("--procedure", action="store_true", help="export a stored procedure result")
+    parser.add_argument("--arg", action="append", default=[], help="procedure argument (repeat in order)")
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("parquet" if args.output.endswith(".parquet") else "csv")
+    target = sys.stdout.buffer if args.output == "-" else args.output
+    started = time.perf_counter()
+    try:
+        if args.procedure:
+            proc_args = [None if a.upper() == "NULL" else a for a in args.arg]
+            rows = export_procedure(args.source, proc_args, target, fmt, args.chunk_rows)
+        else:
+            rows = export_table(args.source, target, fmt, args.chunk_rows)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    seconds = time.perf_counter() - started
+    print(f"{rows} rows exported in {seconds:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from mysql.connector import FieldType
+
+# Low-cardinality columns returned as pandas categoricals. The choices mirror
+# the forms in main.py and the `enums` of bulk_import.IMPORT_SPECS; values
+# outside them are kept as extra categories rather than dropped.
+CATEGORIES = {
+    "mess_plan": ["Standard", "Premium"],
+    "laundry_plan": ["Basic", "Standard", "Premium"],
+    "status": ["Pending", "Paid", "Overdue"],
+    "type": ["Single", "Double", "Triple", "Dormitory"],
+    "preferred_type": ["Single", "Double", "Triple", "Dormitory"],
+    "activity": ["Cleaning", "Cooking", "Security", "Maintenance", "Admin"],
+    "service": ["Housekeeping", "Cafeteria", "Guarding", "Plumbing", "Reception"],
+}
+
+INTEGER_TYPES = {FieldType.TINY, FieldType.SHORT, FieldType.LONG, FieldType.LONGLONG, FieldType.INT24, FieldType.YEAR}
+FLOAT_TYPES = {FieldType.FLOAT, FieldType.DOUBLE, FieldType.DECIMAL, FieldType.NEWDECIMAL}
+DATE_TYPES = {FieldType.DATE, FieldType.NEWDATE}
+DATETIME_TYPES = {FieldType.DATETIME, FieldType.TIMESTAMP}
+
+
+def column_kind(type_code):
+    # One of "int", "float", "date", "datetime" or "str" for a cursor type code
+    if type_code in INTEGER_TYPES:
+        return "int"
+    if type_code in FLOAT_TYPES:
+        return "float"
+    if type_code in DATE_TYPES:
+        return "date"
+    if type_code in DATETIME_TYPES:
+        return "datetime"
+    return "str"
+
+
+def _series(name, type_code, values):
+    kind = column_kind(type_code)
+    if name in CATEGORIES and kind == "str":
+        known = CATEGORIES[name]
+        extra = sorted({v for v in values if v is not None} - set(known))
+        return pd.Series(pd.Categorical(values, categories=known + extra), name=name)
+    if kind == "int":
+        if any(v is None for v in values):
+            return pd.Series(pd.array(values, dtype="Int64"), name=name)
+        return pd.Series(np.array(values, dtype=np.int64), name=name)
+    if kind == "float":
+        # DECIMAL arrives as Decimal and NULL as None; both convert to float64
+        return pd.Series(np.array([np.nan if v is None else v for v in values], dtype=np.float64), name=name)
+    if kind in ("date", "datetime"):
+        return pd.Series(pd.to_datetime(values), name=name)
+    return pd.Series(values, name=name, dtype=object)
+
+
+class FrameBuilder:
+    # Collects tuple batches column by column (no per-row dicts) and builds a
+    # typed DataFrame from them at the end
+    def __init__(self, description):
+        self.description = description or []
+        self.columns = [[] for _ in self.description]
+
+    def add(self, rows):
+        if rows:
+            for column, values in zip(self.columns, zip(*rows)):
+                column.extend(values)
+
+    def frame(self):
+        if not self.description:
+            return pd.DataFrame()
+        return pd.concat(
+            [_series(name, type_code, values)
+             for (name, type_code, *_), values in zip(self.description, self.columns)],
+            axis=1,
+        )
+
+
+def native(value):
+    # A DataFrame cell as a plain Python value that can be bound as a query
+    # parameter: NaN/NA become None, numpy scalars their Python equivalent
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
@@ -0,0 +1,166 @@
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import mysql.connector
+
+import db
+from cache import query_cache
+
+ROOM_TYPES = {"Single": 1, "Double": 2, "Triple": 3, "Dormitory": 4}
+COURSES = ["Engineering", "Arts", "Science", "Medicine", "Commerce", "Law", "Design", "Architecture"]
+MESS_PLANS = ["Standard", "Premium"]
+LAUNDRY_PLANS = ["Basic", "Standard", "Premium"]
+FEE_STATUSES = ["Paid", "Pending", "Overdue"]
+FIRST_NAMES = ["Alice", "Bob", "Charlie", "Daisy", "Evan", "Farah", "Gita", "Hari", "Isha", "Jon",
+               "Kiran", "Lena", "Mohan", "Nisha", "Omar", "Priya", "Quinn", "Ravi", "Sara", "Tara"]
+LAST_NAMES = ["Brown", "Smith", "Davis", "Johnson", "Lee", "Khan", "Patel", "Rao", "Singh", "Wong",
+              "Garcia", "Iyer", "Menon", "Das", "Nair", "Shah", "Kapoor", "Roy", "Bose", "Gupta"]
+
+# Rooms added beyond --rooms leave about this share of their beds taken,
+# so the free-bed pages still have rooms to show
+ADDED_ROOM_FILL = 0.9
+
+# Tables emptied by --reset, children first
+RESET_ORDER = ["FEE", "STUDENT_INTAKE", "STUDENT", "ROOM_OCCUPANCY", "ROOM", "HOSTEL"]
+
+
+def _insert(conn, table, columns, rows, batch_size):
+    # One multi-row INSERT (executemany) per batch, one transaction per batch
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    cursor = conn.cursor()
+    try:
+        for start in range(0, len(rows), batch_size):
+            conn.start_transaction()
+            cursor.executemany(query, rows[start:start + batch_size])
+            conn.commit()
+    finally:
+        cursor.close()
+
+
+def generate(hostels, rooms, students, fees, seed=0):
+    # Builds every row in memory first; rooms are filled to at most their
+    # capacity so ROOM_OCCUPANCY stays valid. `rooms` is a minimum: more are
+    # added until every student has a bed. Rooms and students carry a
+    # hostel index (0 to hostels - 1), not an id, and every student lives in
+    # a room of their own hostel. The same seed gives the same rows.
+    if hostels < 1:
+        raise ValueError("at least one hostel is needed")
+    rng = random.Random(seed)
+
+    room_rows = []
+    bed_count = 0
+    while len(room_rows) < rooms or bed_count * ADDED_ROOM_FILL < students:
+        room_type = rng.choice(list(ROOM_TYPES))
+        room_rows.append((len(room_rows) + 1, ROOM_TYPES[room_type], room_type, rng.randrange(hostels)))
+        bed_count += ROOM_TYPES[room_type]
+    room_hostel = {room_no: hostel for room_no, _, _, hostel in room_rows}
+
+    beds = [room_no for room_no, capacity, _, _ in room_rows for _ in range(capacity)]
+    rng.shuffle(beds)
+
+    student_rows = []
+    for i in range(students):
+        student_rows.append((
+            f"S{i + 1:06d}",
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            rng.choice(COURSES),
+            rng.choice(MESS_PLANS),
+            rng.choice(LAUNDRY_PLANS),
+            room_hostel[beds[i]],
+            beds[i],
+        ))
+
+    start = date(2020, 1, 1)
+    fee_rows = []
+    for i in range(fees):
+        fee_rows.append((
+            f"F{i + 1:07d}",
+            rng.choice(student_rows)[0] if student_rows else None,
+            float(rng.choice([500, 600, 700, 750, 800, 1000, 1200])),
+            rng.choices(FEE_STATUSES, weights=[6, 3, 1])[0],
+            start + timedelta(days=rng.randint(0, 6 * 365)),
+        ))
+
+    return room_rows, student_rows, fee_rows
+
+
+def load(hostels, rooms, students, fees, seed=0, batch_size=5000, reset=False, log=print):
+    room_rows, student_rows, fee_rows = generate(hostels, rooms, students, fees, seed)
+    timings = {}
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        if reset:
+            for table in RESET_ORDER:
+                cursor.execute(f"DELETE FROM {table}")
+            cursor.execute("ALTER TABLE HOSTEL AUTO_INCREMENT = 1")
+
+        # New rooms are numbered after any that already exist
+        cursor.execute("SELECT COALESCE(MAX(room_no), 0) FROM ROOM")
+        offset = cursor.fetchone()[0]
+        cursor.execute("SELECT COALESCE(MAX(hostel_id), 0) FROM HOSTEL")
+        last_hostel = cursor.fetchone()[0]
+        _insert(conn, "HOSTEL", ["name"], [(f"Hostel {last_hostel + i + 1}",) for i in range(hostels)], batch_size)
+        cursor.execute("SELECT hostel_id FROM HOSTEL WHERE hostel_id > %s ORDER BY hostel_id", (last_hostel,))
+        hostel_ids = [row[0] for row in cursor.fetchall()]
+        timings["HOSTEL"] = {"rows": len(hostel_ids)}
+
+        room_rows = [(room_no + offset, capacity, room_type, hostel_ids[hostel])
+                     for room_no, capacity, room_type, hostel in room_rows]
+        student_rows = [row[:5] + (hostel_ids[row[5]], row[6] + offset) for row in student_rows]
+        # after_room_insert creates each room's ROOM_OCCUPANCY row
+        steps = [
+            ("ROOM", ["room_no", "capacity", "type", "hostel_id"], room_rows),
+            ("STUDENT", ["student_id", "name", "course", "mess_plan", "laundry_plan", "hostel_id", "room_no"], student_rows),
+            ("FEE", ["fee_id", "student_id", "amount", "status", "due_date"], fee_rows),
+        ]
+        for table, columns, rows in steps:
+            started = time.perf_counter()
+            _insert(conn, table, columns, rows, batch_size)
+            seconds = time.perf_counter() - started
+            timings[table] = {"rows": len(rows), "seconds": round(seconds, 3)}
+            log(f"{table}: {len(rows)} rows in {seconds:.1f}s ({len(rows) / seconds if seconds else 0:,.0f} rows/s)")
+
+        # Triggers kept the counters current; rebuild anyway so a benchmark
+        # starts from a known-consistent state with fresh index statistics
+        cursor.callproc("rebuild_dashboard_stats")
+        for table in ("HOSTEL", "ROOM", "ROOM_OCCUPANCY", "STUDENT", "FEE", "DASHBOARD_STATS"):
+            cursor.execute(f"ANALYZE TABLE {table}")
+            cursor.fetchall()
+        cursor.close()
+
+    query_cache.clear()
+    return timings
+
+
+def _parser():
+    parser = argparse.ArgumentParser(description="Fill the database with synthetic hostel data.")
+    parser.add_argument("--hostels", type=int, default=50)
+    parser.add_argument("--rooms", type=int, default=20000,
+                        help="minimum number of rooms; more are added if the students need the beds")
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--fees", type=int, default=500000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--reset", action="store_true", help="delete existing hostels, rooms, students and fees first")
+    return parser
+
+
+def main(argv=None):
+    args = _parser().parse_args(argv)
+
+    try:
+        load(args.hostels, args.rooms, args.students, args.fees, args.seed, args.batch_size, args.reset)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    except mysql.connector.IntegrityError as e:
+        print(f"error: {e} (run with --reset to replace earlier generated data)", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
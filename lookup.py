@@ -0,0 +1,70 @@
+import os
+
+import db
+from search import escape_like
+
+# Matches offered by a typeahead picker; typing more narrows them
+LOOKUP_LIMIT = int(os.getenv("LOOKUP_LIMIT", 20))
+
+# Entities that can be picked by typing part of an ID or name. Every column
+# in `prefix` leads an index, so each `LIKE 'term%'` is a short range scan
+# that stops after LOOKUP_LIMIT rows however large the table is. `scope`
+# is the column that limits the matches to one hostel.
+LOOKUPS = {
+    "student": {
+        "select": "SELECT student_id AS id, CONCAT(student_id, ' - ', COALESCE(name, '')) AS label FROM STUDENT",
+        "prefix": ["student_id", "name"],
+        "scope": "hostel_id",
+    },
+    "employee": {
+        "select": "SELECT emp_id AS id, CONCAT(COALESCE(name, ''), ' (', emp_id, ')') AS label FROM EMPLOYEE",
+        "prefix": ["emp_id", "name"],
+    },
+    "fee": {
+        "select": """
+            SELECT f.fee_id AS id,
+                   CONCAT(f.fee_id, ' - ', COALESCE(s.name, 'unknown student'), ' (₹', COALESCE(f.amount, 0), ')') AS label
+            FROM FEE f LEFT JOIN STUDENT s ON s.student_id = f.student_id
+        """,
+        "prefix": ["f.fee_id", "f.student_id"],
+        "scope": "s.hostel_id",
+    },
+    # Room numbers are integers: list the rooms from the typed number upwards
+    "room": {
+        "select": "SELECT room_no AS id, CONCAT('Room ', room_no, ' (', COALESCE(type, ''), ')') AS label FROM ROOM",
+        "from_number": "room_no",
+        "scope": "hostel_id",
+    },
+}
+
+
+def lookup(entity, term, limit=LOOKUP_LIMIT, hostel_id=None):
+    # Returns up to `limit` {"id", "label"} rows matching the start of `term`,
+    # only from hostel `hostel_id` if given. Reads go through db.run_query,
+    # so repeated terms are served from the query cache until a write to the
+    # table invalidates them.
+    spec = LOOKUPS[entity]
+    term = term.strip()
+    if not term:
+        return []
+    select = " ".join(spec["select"].split())
+    scope, scope_params = "", []
+    if hostel_id is not None and "scope" in spec:
+        scope, scope_params = f" AND {spec['scope']} = %s", [hostel_id]
+
+    if "from_number" in spec:
+        if not term.isdigit():
+            return []
+        column = spec["from_number"]
+        return db.run_query(f"{select} WHERE {column} >= %s{scope} ORDER BY {column} LIMIT %s",
+                            [int(term)] + scope_params + [limit])
+
+    # One index range scan per column; the UNION removes rows matched twice.
+    # Each scan is a derived table so its LIMIT also works on SQLite.
+    parts = [f"SELECT * FROM ({select} WHERE {column} LIKE %s{scope} ORDER BY {column} LIMIT %s) AS m{i}"
+             for i, column in enumerate(spec["prefix"])]
+    params = []
+    for _ in parts:
+        params += [escape_like(term) + "%"] + scope_params + [limit]
+    return db.run_query(f"SELECT id, label FROM ({' UNION '.join(parts)}) AS matches ORDER BY label LIMIT %s",
+                        params + [limit])
@@ -1,132 +1,143 @@
 import streamlit as st
-import mysql.connector
 import pandas as pd
 import os
-from datetime import datetime
-import plotly.express as px
+from datetime import date, datetime, timedelta
 from dotenv import load_dotenv
 
+import analytics
+import bulk_import
+import db
+import export
+import metrics
+import scheduler
+import schema
+import search
+import startup
+import widgets
+
 # st.set_page_config(
 #         page_title="Hostel Management System",
 #         page_icon="🏢",
 #         layout="wide"
 #     )
 load_dotenv()
-def create_connection():
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST", "127.0.0.1"),
-        port=int(os.getenv("DB_PORT", 4121)),
-
-        user=os.getenv("DB_USER", "root"),
-        password=os.getenv("DB_PASSWORD", "root_password"),
-        database=os.getenv("DB_NAME", "HostelManagement"),
-        charset='utf8mb4',
-        collation='utf8mb4_unicode_ci'  # Replace with your database name
-    )
-
-def get_database_connection():
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST", "127.0.0.1"),
-        port=int(os.getenv("DB_PORT", 4121)),
-
-        user=os.getenv("DB_USER", "root"),
-        password=os.getenv("DB_PASSWORD", "root_password"),
-        database=os.getenv("DB_NAME", "HostelManagement"),
-        charset='utf8mb4',
-        collation='utf8mb4_unicode_ci'
-    )
 
+@metrics.timed("function")
 def get_columns(table_name):
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute(f"DESCRIBE {table_name};")
-    columns = cursor.fetchall()
-    conn.close()
-    return [column[0] for column in columns]
+    return list(search.table_columns(table_name))
 
 # Function to search in a table by a selected column
-def search_data(table_name, column, search_value):
-    conn = create_connection()
-    cursor = conn.cursor(dictionary=True)
-    query = f"SELECT * FROM {table_name} WHERE {column} LIKE %s"
-    cursor.execute(query, (f"%{search_value}%",))
-    results = cursor.fetchall()
-    conn.close()
-    return pd.DataFrame(results)
+@metrics.timed("function")
+def search_data(table_name, column, search_value, hostel_id=None):
+    try:
+        return pd.DataFrame(search.search(table_name, column, search_value, hostel_id=hostel_id))
+    except Exception as e:
+        st.error(f"Search error: {str(e)}")
+        return pd.DataFrame()
 
 def init_session_state():
     if 'page' not in st.session_state:
         st.session_state.page = 'Dashboard'
 
+@metrics.timed("function")
 def run_query(query, params=None):
-    conn = get_database_connection()
-    cursor = conn.cursor(dictionary=True)
     try:
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-
-        # Check if the query is a SELECT statement
-        if query.strip().upper().startswith('SELECT') or query.strip().upper().startswith('CALL'):
-            result = cursor.fetchall()
-
-            # Consume any remaining result sets (if it's a stored procedure)
-            while cursor.nextset():
-                cursor.fetchall()
-
-            return result
-        
-        # Commit changes if it's an INSERT, UPDATE, or DELETE query
-        conn.commit()
-        return True
+        return db.run_query(query, params)
     except Exception as e:
         st.error(f"Database error: {str(e)}")
         return False
-    finally:
-        cursor.close()
-        conn.close()
 
 
-def dashboard():
+# Every KPI comes from the trigger-maintained DASHBOARD_STATS table, which
+# keeps each hostel's counters; the campus-wide figures are their sums.
+# startup.py reads it once before the first session so it starts cached.
+DASHBOARD_STATS_QUERY = "SELECT metric, dimension, CAST(SUM(value) AS SIGNED) AS value FROM DASHBOARD_STATS GROUP BY metric, dimension"
+HOSTEL_STATS_QUERY = "SELECT metric, dimension, value FROM DASHBOARD_STATS WHERE hostel_id = %s"
+
+# The headline counters of every hostel side by side
+HOSTEL_KPIS_QUERY = """
+    SELECT h.name AS hostel,
+           CAST(SUM(CASE WHEN d.metric = 'students' THEN d.value ELSE 0 END) AS SIGNED) AS students,
+           CAST(SUM(CASE WHEN d.metric = 'rooms' THEN d.value ELSE 0 END) AS SIGNED) AS rooms,
+           CAST(SUM(CASE WHEN d.metric = 'available_rooms' THEN d.value ELSE 0 END) AS SIGNED) AS available_rooms,
+           CAST(SUM(CASE WHEN d.metric = 'beds_by_type' THEN d.value ELSE 0 END) AS SIGNED) AS beds,
+           CAST(SUM(CASE WHEN d.metric = 'occupants_by_type' THEN d.value ELSE 0 END) AS SIGNED) AS occupants,
+           CAST(SUM(CASE WHEN d.metric = 'fees_by_status' AND d.dimension = 'Pending' THEN d.value ELSE 0 END) AS SIGNED) AS pending_fees
+    FROM HOSTEL h
+    LEFT JOIN DASHBOARD_STATS d ON d.hostel_id = h.hostel_id
+    GROUP BY h.hostel_id, h.name
+    ORDER BY h.name
+"""
+
+def get_dashboard_stats(hostel_id=None):
+    if hostel_id is None:
+        rows = run_query(DASHBOARD_STATS_QUERY)
+    else:
+        rows = run_query(HOSTEL_STATS_QUERY, (hostel_id,))
+    stats = {}
+    for row in rows or []:
+        stats.setdefault(row['metric'], {})[row['dimension']] = row['value']
+    return stats
+
+@metrics.timed("page")
+def dashboard(hostel_id=None):
+    # plotly is only needed for the charts below, so it is not loaded until
+    # the dashboard is first shown (startup.py imports it ahead of time)
+    import plotly.express as px
+
     st.title("Hostel Management Dashboard")
     
+    stats = get_dashboard_stats(hostel_id)
     col1, col2, col3 = st.columns(3)
     
     # Total Students
-    total_students = run_query("SELECT COUNT(*) as count FROM STUDENT")[0]['count']
-    col1.metric("Total Students", total_students)
+    col1.metric("Total Students", stats.get('students', {}).get('', 0))
     
-    # Available Rooms
-    # occupied_rooms = run_query("SELECT COUNT(DISTINCT room_no) as count FROM STUDENT")[0]['count']
-    # total_rooms = run_query("SELECT COUNT(*) as count FROM ROOM")[0]['count']
-    # col2.metric("Available Rooms", total_rooms - occupied_rooms)
+    # Available Rooms (rooms with at least one free bed)
+    col2.metric("Available Rooms", stats.get('available_rooms', {}).get('', 0))
     
     # Pending Fees
-    pending_fees = run_query("SELECT COUNT(*) as count FROM FEE WHERE status = 'Pending'")[0]['count']
-    col3.metric("Pending Fees", pending_fees)
+    col3.metric("Pending Fees", stats.get('fees_by_status', {}).get('Pending', 0))
     
     # Room Occupancy Chart
-    room_data = run_query("""
-        SELECT r.type, COUNT(*) as count 
-        FROM ROOM r 
-        GROUP BY r.type
-    """)
+    rooms_by_type = stats.get('rooms_by_type', {})
+    room_data = [{'type': t, 'count': c} for t, c in rooms_by_type.items() if c]
     if room_data:
         df_rooms = pd.DataFrame(room_data)
         fig = px.pie(df_rooms, values='count', names='type', title='Room Distribution')
         st.plotly_chart(fig)
 
-def manage_students():
+    # Occupancy by room type
+    beds_by_type = stats.get('beds_by_type', {})
+    occupants_by_type = stats.get('occupants_by_type', {})
+    occupancy_data = [
+        {'type': t, 'occupancy %': round(100 * occupants_by_type.get(t, 0) / beds, 1)}
+        for t, beds in beds_by_type.items() if beds
+    ]
+    if occupancy_data:
+        fig = px.bar(pd.DataFrame(occupancy_data), x='type', y='occupancy %', title='Occupancy by Room Type')
+        st.plotly_chart(fig)
+
+    # Every hostel's own figures, when no single hostel is selected
+    if hostel_id is None:
+        hostels = pd.DataFrame(run_query(HOSTEL_KPIS_QUERY) or [])
+        if not hostels.empty:
+            st.subheader("By Hostel")
+            beds = hostels.pop('beds')
+            hostels['occupancy %'] = (100 * hostels.pop('occupants') / beds.where(beds > 0)).round(1)
+            st.dataframe(hostels, hide_index=True)
+
+@metrics.timed("page")
+def manage_students(hostel_id=None):
     st.header("Student Management")
     
     # Creating tabs for different operations
-    tab1, tab2, tab3 = st.tabs(["View Students", "Add Student", "Update/Delete Student"])
+    tab = widgets.lazy_tabs(["View Students", "Add Student", "Update/Delete Student"], key="students_tab")
     
     # Tab 1: View Students
-    with tab1:
+    if tab == "View Students":
         # Get column names for STUDENT table
-        columns = get_columns("STUDENT")
+        columns = [search.ALL_TEXT] + get_columns("STUDENT")
         
         # Select column to search
         column_option = st.selectbox("Select Column", columns)
@@ -137,7 +148,7 @@ def manage_students():
         if st.button("Search"):
             if search_value:
                 # Fetch and display search results
-                results = search_data("STUDENT", column_option, search_value)
+                results = search_data("STUDENT", column_option, search_value, hostel_id)
                 if results.empty:
                     st.write(f"No results found for {search_value} in column {column_option}.")
                 else:
@@ -146,13 +157,15 @@ def manage_students():
             else:
                 st.warning("Please enter a search term.")
 
-        # View all students
-        students = run_query("SELECT * FROM STUDENT")
-        if students:
-            st.dataframe(pd.DataFrame(students))
+        # View students one page at a time, or edit the page in a grid
+        widgets.paginated_table("STUDENT", editable=st.toggle("Edit in grid", key="students_edit"),
+                                hostel_id=hostel_id)
 
     
-    with tab2:
+    if tab == "Add Student":
+        # Outside the form so the room list follows the chosen hostel
+        hostel = widgets.hostel_picker("Hostel", key="add_student_hostel", default=hostel_id)
+
         with st.form("add_student_form"):
             student_id = st.text_input("Student ID")
             name = st.text_input("Name")
@@ -160,68 +173,41 @@ def manage_students():
             mess_plan = st.selectbox("Mess Plan", ["Standard", "Premium"])
             laundry_plan = st.selectbox("Laundry Plan", ["Basic", "Standard", "Premium"])
 
-            # Fetch and display available hostels
-            hostels = run_query("SELECT hostel_id, name FROM HOSTEL")
-            hostel_dict = {h['name']: h['hostel_id'] for h in hostels}
-            hostel = st.selectbox("Hostel", list(hostel_dict.keys()))
-
-            # Fetch and display available rooms
+            # Rooms of the chosen hostel with a free bed (idx_room_hostel)
             rooms = run_query("""
              SELECT r.room_no, r.type
              FROM ROOM r
             JOIN ROOM_OCCUPANCY ro ON r.room_no = ro.room_no
-             WHERE ro.current_occupancy < r.capacity
-             """)
+             WHERE r.hostel_id = %s AND ro.current_occupancy < r.capacity
+             """, (hostel,))
 
 # Create a dictionary for rooms that are not full
-            room_dict = {f"Room {r['room_no']} ({r['type']})": r['room_no'] for r in rooms}
+            room_dict = {f"Room {r['room_no']} ({r['type']})": r['room_no'] for r in rooms or []}
 
 # Allow the user to select a room from the available options
             room = st.selectbox("Room", list(room_dict.keys()))
 
             # Add Student button
             if st.form_submit_button("Add Student"):
-                # Check current occupancy and capacity of the selected room
-                room_no = room_dict[room]
-                current_occupancy_result = run_query(
-                    "SELECT current_occupancy FROM ROOM_OCCUPANCY WHERE room_no = %s", (room_no,)
-                )
-                print(current_occupancy_result)
-                capacity_result = run_query(
-                    "SELECT capacity FROM ROOM WHERE room_no = %s", (room_no,)
-                )
-                print(capacity_result)
-
-                current_occupancy = current_occupancy_result[0]['current_occupancy'] if current_occupancy_result else 0
-                capacity = capacity_result[0]['capacity'] if capacity_result else 0
-
-                # Check if the room is full
-                if current_occupancy >= capacity:
-                    st.error(f"Room {room_no} is already full. Please choose another room.")
-                else:
-                    print(capacity-current_occupancy)
-                    print(capacity-current_occupancy)
-
-                    # Proceed to add the student if there's space
-                    query = """
-                    INSERT INTO STUDENT (student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """
-                    params = (student_id, name, course, mess_plan, laundry_plan, hostel_dict[hostel], room_no)
-                    
-                    # Insert student and update occupancy
-                    if run_query(query, params):
-                        st.success("Student added successfully!")
-                        st.rerun()
+                # Capacity check and insert happen atomically in the database
+                room_no = room_dict.get(room)
+                params = [student_id, name, course, mess_plan, laundry_plan, hostel, room_no]
+                if call_stored_procedure("add_student_to_room", params) is not False:
+                    st.success("Student added successfully!")
+                    st.rerun()
 
-    with tab3:
-        student_to_update = st.selectbox(
-            "Select Student to Update/Delete",
-            [s['student_id'] + " - " + s['name'] for s in run_query("SELECT student_id, name FROM STUDENT")]
-        )
-        if student_to_update:
-            student_id = student_to_update.split(" - ")[0]
-            student = run_query("SELECT * FROM STUDENT WHERE student_id = %s", (student_id,))[0]
+    if tab == "Update/Delete Student":
+        student_id = widgets.typeahead("student", "Find Student to Update/Delete", key="student_lookup",
+                                       hostel_id=hostel_id)
+        if student_id:
+            # The typeahead's suggestions may be cached; the student may be gone
+            rows = run_query("SELECT * FROM STUDENT WHERE student_id = %s", (student_id,))
+            if not rows:
+                # False: run_query has already shown the database error
+                if rows is not False:
+                    st.warning(f"Student {student_id} no longer exists.")
+                return
+            student = rows[0]
             
             with st.form("update_student_form"):
                 name = st.text_input("Name", student['name'])
@@ -250,14 +236,15 @@ def manage_students():
                             st.success("Student deleted successfully!")
                             st.rerun
 
-def manage_rooms():
+@metrics.timed("page")
+def manage_rooms(hostel_id=None):
     st.header("Room Management")
     
-    tab1, tab2, tab3 = st.tabs(["View Rooms", "Add Room", "Update Room"])
+    tab = widgets.lazy_tabs(["View Rooms", "Add Room", "Update Room"], key="rooms_tab")
     
     # View Rooms tab
     
-    with tab1:
+    if tab == "View Rooms":
          columns = get_columns("ROOM")
         
         # Select column to search
@@ -269,7 +256,7 @@ def manage_rooms():
          if st.button("Search"):
             if search_value:
                 # Fetch and display search results
-                results = search_data("ROOM", column_option, search_value)
+                results = search_data("ROOM", column_option, search_value, hostel_id)
                 if results.empty:
                     st.write(f"No results found for {search_value} in column {column_option}.")
                 else:
@@ -278,56 +265,68 @@ def manage_rooms():
             else:
                 st.warning("Please enter a search term.")
 
-         rooms = run_query("""
-                SELECT r.*, COUNT(s.student_id) as occupants
-                FROM ROOM r
-                LEFT JOIN STUDENT s ON r.room_no = s.room_no
-                GROUP BY r.room_no
-            """)
-         if rooms:
-                st.dataframe(pd.DataFrame(rooms))
+         widgets.paginated_table("ROOM", editable=st.toggle("Edit in grid", key="rooms_edit"), hostel_id=hostel_id)
     
     # Add Room tab
-    with tab2:
+    if tab == "Add Room":
         with st.form("add_room_form"):
             room_no = st.number_input("Room Number", min_value=1)
             capacity = st.number_input("Capacity", min_value=1, max_value=4)
             room_type = st.selectbox("Room Type", ["Single", "Double", "Triple", "Dormitory"])
+            hostel = widgets.hostel_picker("Hostel", key="add_room_hostel", default=hostel_id)
             
             if st.form_submit_button("Add Room"):
-                query = "INSERT INTO ROOM (room_no, capacity, type) VALUES (%s, %s, %s)"
-                params = (room_no, capacity, room_type)
+                query = "INSERT INTO ROOM (room_no, capacity, type, hostel_id) VALUES (%s, %s, %s, %s)"
+                params = (room_no, capacity, room_type, hostel)
                 if run_query(query, params):
                     st.success("Room added successfully!")
                     st.rerun()
     
     # Update Room tab
-    with tab3:
-        rooms = run_query("SELECT room_no, capacity, type FROM ROOM")
-        room_options = {f"Room {r['room_no']}": r for r in rooms}
-        selected_room = st.selectbox("Select Room to Update", list(room_options.keys()))
+    if tab == "Update Room":
+        selected_room = widgets.typeahead("room", "Find Room to Update (room number)", key="room_lookup",
+                                          hostel_id=hostel_id)
         
         if selected_room:
-            room_details = room_options[selected_room]
+            rows = run_query("""
+                SELECT r.room_no, r.capacity, r.type, r.hostel_id, COALESCE(ro.current_occupancy, 0) AS occupants
+                FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+                WHERE r.room_no = %s
+            """, (selected_room,))
+            if not rows:
+                if rows is not False:
+                    st.warning(f"Room {selected_room} no longer exists.")
+                return
+            room_details = rows[0]
             new_capacity = st.number_input("New Capacity", min_value=1, max_value=4, value=room_details["capacity"])
             new_type = st.selectbox("New Room Type", ["Single", "Double", "Triple", "Dormitory"], index=["Single", "Double", "Triple", "Dormitory"].index(room_details["type"]))
+            if room_details["occupants"]:
+                # Its students would be left outside their hostel; the
+                # before_room_update trigger refuses it as well
+                st.caption(f"The room has {room_details['occupants']} occupant(s); move them out to change its hostel.")
+                new_hostel = room_details["hostel_id"]
+            else:
+                new_hostel = widgets.hostel_picker("Hostel", key="update_room_hostel", default=room_details["hostel_id"])
             
             if st.button("Update Room"):
-                query = "UPDATE ROOM SET capacity = %s, type = %s WHERE room_no = %s"
-                params = (new_capacity, new_type, room_details["room_no"])
+                query = "UPDATE ROOM SET capacity = %s, type = %s, hostel_id = %s WHERE room_no = %s"
+                params = (new_capacity, new_type, new_hostel, room_details["room_no"])
                 if run_query(query, params):
                     st.success("Room updated successfully!")
                     st.rerun()
 
-def manage_employees():
+@metrics.timed("page")
+def manage_employees(hostel_id=None):
     st.header("Employee Management")
+    if hostel_id is not None:
+        st.caption("Employees are shared by all hostels, so this page is not limited to the selected hostel.")
 
     # Tabs for different operations
-    tab1, tab2, tab3 = st.tabs(["View Employees", "Add Employee", "Update Employee"])
+    tab = widgets.lazy_tabs(["View Employees", "Add Employee", "Update Employee"], key="employees_tab")
 
     # Tab 1: View Employees
-    with tab1:
-        columns = get_columns("EMPLOYEE")
+    if tab == "View Employees":
+        columns = [search.ALL_TEXT] + get_columns("EMPLOYEE")
         
         # Select column to search
         column_option = st.selectbox("Select Column", columns)
@@ -347,12 +346,10 @@ def manage_employees():
             else:
                 st.warning("Please enter a search term.")
 
-        employees = run_query("SELECT * FROM EMPLOYEE")
-        if employees:
-            st.dataframe(pd.DataFrame(employees))
+        widgets.paginated_table("EMPLOYEE")
 
     # Tab 2: Add Employee
-    with tab2:
+    if tab == "Add Employee":
         # print(run_query("CALL get_fee_details();"))
 
         with st.form("add_employee_form"):
@@ -370,86 +367,99 @@ def manage_employees():
                     st.rerun
 
     # Tab 3: Update Employee
-    with tab3:
-        employees = run_query("SELECT emp_id, name FROM EMPLOYEE")
-        emp_dict = {f"{e['name']} ({e['emp_id']})": e['emp_id'] for e in employees}
-
-        if emp_dict:
-            emp_to_update = st.selectbox("Select Employee to Update", list(emp_dict.keys()))
-            if emp_to_update:
-                emp_id = emp_dict[emp_to_update]
-                employee = run_query("SELECT * FROM EMPLOYEE WHERE emp_id = %s", (emp_id,))[0]
-
-                with st.form("update_employee_form"):
-                    name = st.text_input("Name", value=employee['name'])
-                    activity = st.selectbox(
-                        "Activity",
-                        ["Cleaning", "Cooking", "Security", "Maintenance", "Admin"],
-                        index=["Cleaning", "Cooking", "Security", "Maintenance", "Admin"].index(employee['activity'])
-                    )
-                    service = st.selectbox(
-                        "Service",
-                        ["Housekeeping", "Cafeteria", "Guarding", "Plumbing", "Reception"],
-                        index=["Housekeeping", "Cafeteria", "Guarding", "Plumbing", "Reception"].index(employee['service'])
-                    )
-
-                    # Button to update the employee
-                    if st.form_submit_button("Update Employee"):
-                        query = """
-                        UPDATE EMPLOYEE 
-                        SET name = %s, activity = %s, service = %s 
-                        WHERE emp_id = %s
-                        """
-                        params = (name, activity, service, emp_id)
-                        if run_query(query, params):
-                            st.success("Employee updated successfully!")
-                            st.rerun
+    if tab == "Update Employee":
+        emp_id = widgets.typeahead("employee", "Find Employee to Update", key="employee_lookup")
+
+        if emp_id:
+            rows = run_query("SELECT * FROM EMPLOYEE WHERE emp_id = %s", (emp_id,))
+            if not rows:
+                if rows is not False:
+                    st.warning(f"Employee {emp_id} no longer exists.")
+                return
+            employee = rows[0]
+
+            with st.form("update_employee_form"):
+                name = st.text_input("Name", value=employee['name'])
+                activity = st.selectbox(
+                    "Activity",
+                    ["Cleaning", "Cooking", "Security", "Maintenance", "Admin"],
+                    index=["Cleaning", "Cooking", "Security", "Maintenance", "Admin"].index(employee['activity'])
+                )
+                service = st.selectbox(
+                    "Service",
+                    ["Housekeeping", "Cafeteria", "Guarding", "Plumbing", "Reception"],
+                    index=["Housekeeping", "Cafeteria", "Guarding", "Plumbing", "Reception"].index(employee['service'])
+                )
+
+                # Button to update the employee
+                if st.form_submit_button("Update Employee"):
+                    query = """
+                    UPDATE EMPLOYEE 
+                    SET name = %s, activity = %s, service = %s 
+                    WHERE emp_id = %s
+                    """
+                    params = (name, activity, service, emp_id)
+                    if run_query(query, params):
+                        st.success("Employee updated successfully!")
+                        st.rerun
 
+@metrics.timed("function")
 def call_stored_procedure(proc_name, params=None):
-    conn = get_database_connection()
-    cursor = conn.cursor(dictionary=True)
     try:
-        # Call the stored procedure with parameters if provided
-        cursor.callproc(proc_name, params or [])
-        result = []
-        
-        # Fetch all the result sets returned by the stored procedure
-        for result_set in cursor.stored_results():
-            result.extend(result_set.fetchall())
-        
-        return result
+        return db.call_procedure(proc_name, params)
     except Exception as e:
         st.error(f"Database error: {str(e)}")
         return False
-    finally:
-        cursor.close()
-        conn.close()
+
+@metrics.timed("function")
+def call_procedure_frame(proc_name, params=None):
+    # Typed DataFrame result of a read-only procedure; empty on error
+    try:
+        return db.call_procedure_frame(proc_name, params)
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return pd.DataFrame()
 
 
-def manage_fees():
+@metrics.timed("page")
+def manage_fees(hostel_id=None):
     st.header("Fee Management")
     
-    tab1, tab2 = st.tabs(["View Fees", "Update Fee Status"])
-    
-    with tab1:
-        # fees = run_query("""
-        #     SELECT f.*, s.name as student_name
-        #     FROM FEE f
-        #     JOIN STUDENT s ON f.fee_id = CONCAT('F', LPAD(SUBSTRING(s.student_id, 2), 3, '0'))
-        # """)
-        fees = call_stored_procedure("get_fee_details")  # Using stored procedure
-
-        
-        if fees:
-            st.dataframe(pd.DataFrame(fees))
+    tab = widgets.lazy_tabs(["View Fees", "Update Fee Status"], key="fees_tab")
     
-    with tab2:
-        fee_to_update = st.selectbox(
-            "Select Fee to Update",
-            [f"{f['fee_id']} - {f['student_name']} (₹{f['amount']})" for f in fees]
+    if tab == "View Fees":
+        # Filters are applied inside get_fee_details, so only the shown page is
+        # fetched; a selected hostel limits it to that hostel's students' fees
+        col1, col2, col3 = st.columns(3)
+        status_filter = col1.selectbox("Status", ["All", "Pending", "Paid", "Overdue"])
+        due_range = col2.date_input("Due between", value=(), key="fee_due_range")
+        page_size = col3.selectbox("Rows per page", [25, 50, 100, 250], index=1, key="fee_page_size")
+        page = st.number_input("Page", min_value=1, value=1, key="fee_page")
+
+        due_from = due_range[0] if len(due_range) > 0 else None
+        due_to = due_range[1] if len(due_range) > 1 else None
+        filters = [None if status_filter == "All" else status_filter, due_from, due_to]
+        fees = call_procedure_frame("get_fee_details", filters + [page_size, (page - 1) * page_size, hostel_id])
+
+        if not fees.empty and st.toggle("Edit in grid", key="fees_edit"):
+            widgets.edit_grid("FEE", fees, key="fees_editor")
+        elif not fees.empty:
+            st.dataframe(fees)
+        else:
+            st.write("No fees match these filters.")
+
+        # Every matching fee, not just this page
+        st.download_button(
+            "Export Matching Fees (CSV)",
+            lambda: export.export_to_tempfile(export.export_procedure, "get_fee_details",
+                                              filters + [None, None, hostel_id]),
+            file_name="fees.csv", mime="text/csv",
         )
-        if fee_to_update:
-            fee_id = fee_to_update.split(" - ")[0]
+    
+    if tab == "Update Fee Status":
+        fee_id = widgets.typeahead("fee", "Find Fee to Update (fee ID or student ID)", key="fee_lookup",
+                                   hostel_id=hostel_id)
+        if fee_id:
             with st.form("update_fee_form"):
                 status = st.selectbox("Status", ["Pending", "Paid", "Overdue"])
                 if st.form_submit_button("Update Status"):
@@ -459,29 +469,220 @@ def manage_fees():
                         st.success("Fee status updated successfully!")
                         st.rerun
 
+@metrics.timed("page")
+def fee_analytics(hostel_id=None):
+    import plotly.express as px
+
+    st.header("Fee Analytics")
+    due_range = st.date_input("Due between", value=(date.today() - timedelta(days=365), date.today()),
+                              key="analytics_due_range")
+    if len(due_range) < 2:
+        st.info("Pick the last due date of the range.")
+        return
+
+    try:
+        summary = analytics.fee_summary(due_range[0], due_range[1], hostel_id)
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return
+    if summary.empty:
+        st.write("No fees are due in this range.")
+        return
+
+    aging = analytics.aging(summary)
+    monthly = analytics.monthly(summary)
+    overdue = aging[aging["bucket"] != "Not yet due"]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Collected", f"{monthly['collected'].sum():,.2f}")
+    col2.metric("Overdue", f"{overdue['amount'].sum():,.2f}", f"{int(overdue['fees'].sum())} fees", delta_color="off")
+    billed = monthly["collected"].sum() + monthly["pending"].sum()
+    col3.metric("Collection Rate", f"{100 * monthly['collected'].sum() / billed:.1f}%" if billed else "n/a")
+
+    # Unpaid fees by how long ago they were due
+    fig = px.bar(aging, x="bucket", y="amount", hover_data=["fees"], title="Unpaid Fees by Age")
+    st.plotly_chart(fig)
+
+    # Collected versus still unpaid, by the month the fees were due
+    fig = px.bar(monthly, x="month", y=["collected", "pending"], title="Collected vs Pending by Due Month")
+    st.plotly_chart(fig)
+    fig = px.line(monthly, x="month", y="collected_to_date", title="Collected to Date")
+    st.plotly_chart(fig)
+
+    with st.expander("Monthly Figures"):
+        st.dataframe(monthly, hide_index=True)
+
+@metrics.timed("page")
+def import_data():
+    st.header("Bulk Import")
+    st.write("Upload a CSV or Excel file whose header row names the table's columns.")
+
+    entity = st.selectbox("Import", list(bulk_import.IMPORT_SPECS))
+    st.caption("Columns: " + ", ".join(bulk_import.IMPORT_SPECS[entity]["columns"]))
+    uploaded = st.file_uploader("File", type=["csv", "xlsx"])
+    dry_run = st.checkbox("Validate only", value=False)
+
+    if uploaded and st.button("Run Import"):
+        try:
+            report = bulk_import.import_file(entity, uploaded, uploaded.name, dry_run=dry_run)
+        except Exception as e:
+            st.error(f"Import error: {str(e)}")
+            return
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Rows Written", report["written"], f"of {report['rows']}")
+        col2.metric("Rows Rejected", report["rejected"])
+        col3.metric("Rows / Second", f"{report['rows_per_second']:,.0f}")
+        if len(report["errors"]):
+            st.warning("Some rows were rejected:")
+            st.dataframe(report["errors"])
+            st.download_button("Download Error Report", report["errors"].to_csv(index=False),
+                               file_name=f"{entity}_import_errors.csv", mime="text/csv")
+        else:
+            st.success("All rows passed validation." if dry_run else "Import finished successfully!")
+
+    if entity == "intake":
+        st.subheader("Room Allocation")
+        strict = st.checkbox("Only place students in their preferred room type")
+        if st.button("Allocate Rooms to Intake"):
+            try:
+                placed = bulk_import.allocate_intake(strict)
+            except Exception as e:
+                st.error(f"Allocation error: {str(e)}")
+            else:
+                st.success(f"{placed['allocated']} students placed, {placed['unallocated']} still waiting.")
+
+@metrics.timed("page")
+def export_data():
+    st.header("Export")
+
+    source = st.selectbox("Export", schema.catalog.tables() + list(export.EXPORTABLE_PROCEDURES))
+    fmt = st.selectbox("Format", export.EXPORT_FORMATS)
+    if source in export.EXPORTABLE_PROCEDURES:
+        data = lambda: export.export_to_tempfile(export.export_procedure, source, [], fmt=fmt)
+    else:
+        data = lambda: export.export_to_tempfile(export.export_table, source, fmt=fmt)
+
+    # The export only runs when the button is clicked, streaming rows to a
+    # temporary file chunk by chunk
+    st.download_button(f"Download {source}", data, file_name=f"{source.lower()}.{fmt}",
+                       mime="text/csv" if fmt == "csv" else "application/octet-stream")
+
+@metrics.timed("page")
+def diagnostics():
+    st.header("Diagnostics")
+
+    pool = db.get_pool().stats()
+    cache = db.query_cache.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Connections In Use", f"{pool['in_use']} / {pool['size']}")
+    col2.metric("Pool Exhausted", pool['exhausted'])
+    col3.metric("Avg Checkout Wait", f"{1000 * pool['wait_seconds_total'] / max(pool['checkouts'], 1):.2f} ms")
+    lookups = cache['hits'] + cache['misses']
+    col4.metric("Cache Hit Rate", f"{100 * cache['hits'] / lookups:.0f}%" if lookups else "n/a")
+
+    router = db.get_router()
+    if router.replicas:
+        st.subheader("Read Replicas")
+        st.dataframe(pd.DataFrame(router.replica_status()), hide_index=True)
+
+    st.subheader("Cold Start")
+    if metrics.cold_start:
+        cold = metrics.cold_start
+        st.metric("This Process", f"{cold['total_s']:.2f} s",
+                  f"{cold['total_s'] - cold['budget_s']:+.2f} s vs {cold['budget_s']:.0f} s budget", delta_color="inverse")
+    else:
+        st.write("Not measured; start the app with `python startup.py` to warm it up and time it.")
+    runs = startup.history()
+    if runs:
+        # Recorded starts, one stacked bar of phase timings per start
+        st.bar_chart(pd.DataFrame([run["phases"] for run in runs], index=[run["time"] for run in runs]))
+
+    st.subheader("Background Jobs")
+    jobs = scheduler.get_scheduler()
+    repaired = sum(metrics.registry.counter("occupancy_rows_repaired", kind=kind) for kind in ("missing", "corrected"))
+    st.metric("Occupancy Rows Repaired", repaired)
+    if jobs.stats():
+        st.dataframe(pd.DataFrame(jobs.stats()), hide_index=True)
+    else:
+        st.write("No background jobs; set RECONCILE_INTERVAL to reconcile room occupancy periodically.")
+    if st.button("Reconcile Occupancy Now"):
+        try:
+            if "reconcile_occupancy" in jobs.jobs:
+                result = jobs.run_now("reconcile_occupancy")
+            else:
+                result = scheduler.reconcile_occupancy()
+            st.success(f"Added {result['missing']} missing and corrected {result['corrected']} drifted occupancy rows.")
+        except Exception as e:
+            st.error(f"Database error: {str(e)}")
+
+    st.subheader("Statements")
+    statements = metrics.registry.statement_summary()
+    if statements:
+        st.dataframe(pd.DataFrame(statements).sort_values("total_s", ascending=False), hide_index=True)
+
+    st.subheader("Pages and Functions")
+    functions = metrics.registry.function_summary()
+    if functions:
+        st.dataframe(pd.DataFrame(functions).sort_values("p95_ms", ascending=False), hide_index=True)
+
+    st.subheader(f"Slow Queries (over {metrics.SLOW_QUERY_SECONDS}s)")
+    if metrics.registry.slow_queries:
+        st.dataframe(pd.DataFrame(list(metrics.registry.slow_queries)[::-1]), hide_index=True)
+    else:
+        st.write("No slow queries recorded.")
+
+    with st.expander("Connection Pool and Cache Counters"):
+        st.json({"pool": pool, "cache": cache, "router": router.stats()})
+
+    col1, col2, col3 = st.columns(3)
+    col1.download_button("Download Prometheus Metrics", db.prometheus_text(),
+                         file_name="metrics.prom", mime="text/plain")
+    if col2.button("Reset Metrics"):
+        metrics.registry.reset()
+        st.rerun()
+    if col3.button("Rebuild Dashboard Statistics"):
+        if call_stored_procedure("rebuild_dashboard_stats") is not False:
+            st.success("Dashboard statistics rebuilt.")
+
 def main():
     
     
     init_session_state()
+    # Loads every table's columns and indexes once per process
+    schema.catalog.tables()
+    if os.getenv("METRICS_PORT"):
+        metrics.start_http_server(int(os.getenv("METRICS_PORT")), db.prometheus_text)
+    # Periodic maintenance such as the occupancy reconciliation
+    scheduler.get_scheduler()
     
     with st.sidebar:
         st.title("🏢 Hostel Management")
         selected = st.radio(
             "Navigate to",
-            ["Dashboard", "Students", "Rooms", "Fees", "Employees"]
+            ["Dashboard", "Students", "Rooms", "Fees", "Fee Analytics", "Employees", "Import", "Export", "Diagnostics"]
         )
         st.session_state.page = selected
+        # Limits every page to one hostel's rows
+        hostel_id = widgets.hostel_scope()
 
     if st.session_state.page == "Dashboard":
-        dashboard()
+        dashboard(hostel_id)
     elif st.session_state.page == "Students":
-        manage_students()
+        manage_students(hostel_id)
     elif st.session_state.page == "Rooms":
-        manage_rooms()
+        manage_rooms(hostel_id)
     elif st.session_state.page == "Fees":
-        manage_fees()
+        manage_fees(hostel_id)
+    elif st.session_state.page == "Fee Analytics":
+        fee_analytics(hostel_id)
     elif st.session_state.page == "Employees":
-        manage_employees()
+        manage_employees(hostel_id)
+    elif st.session_state.page == "Import":
+        import_data()
+    elif st.session_state.page == "Export":
+        export_data()
+    elif st.session_state.page == "Diagnostics":
+        diagnostics()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,272 @@
+import functools
+import os
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Statements slower than this (seconds) are kept in the slow query log
+SLOW_QUERY_SECONDS = float(os.getenv("SLOW_QUERY_SECONDS", 0.5))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", 200))
+# Distinct normalized statements tracked before the rest share one series
+MAX_STATEMENTS = int(os.getenv("METRICS_MAX_STATEMENTS", 500))
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_CASE_ARMS = re.compile(r"\bWHEN \? THEN \?(?:\s+WHEN \? THEN \?)*", re.IGNORECASE)
+
+
+def normalize_sql(query):
+    # Literals and placeholders become ?, so one statement shape is one series
+    query = _STRING_LITERAL.sub("?", query)
+    query = query.replace("%s", "?")
+    query = _NUMBER.sub("?", query)
+    query = _PLACEHOLDER_LIST.sub("(?, ...)", query)
+    query = _CASE_ARMS.sub("WHEN ? THEN ? ...", query)
+    return " ".join(query.split())
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        # Linear interpolation inside the bucket holding the q-th observation
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, n in enumerate(self.counts):
+            upper = min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+            if n and seen + n >= rank:
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+            lower = upper
+        return self.max
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.statements = {}  # normalized SQL -> {"latency": Histogram, "rows": int, "errors": int}
+            self.functions = {}   # (kind, name) -> Histogram
+            self.acquire = Histogram()
+            self.counters = {}    # (name, ((label, value), ...)) -> total
+            self.slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+            self.started = time.time()
+
+    def observe_statement(self, query, seconds, rows=0, error=False):
+        statement = normalize_sql(query)
+        with self._lock:
+            entry = self.statements.get(statement)
+            if entry is None:
+                if len(self.statements) >= MAX_STATEMENTS:
+                    statement = "(other)"
+                entry = self.statements.setdefault(statement, {"latency": Histogram(), "rows": 0, "errors": 0})
+            entry["latency"].observe(seconds)
+            entry["rows"] += rows
+            entry["errors"] += int(error)
+            if seconds >= SLOW_QUERY_SECONDS:
+                self.slow_queries.append({
+                    "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "seconds": round(seconds, 4),
+                    "rows": rows,
+                    "statement": statement,
+                })
+
+    def observe_function(self, kind, name, seconds):
+        with self._lock:
+            self.functions.setdefault((kind, name), Histogram()).observe(seconds)
+
+    def increment(self, name, amount=1, **labels):
+        # Exported as hostel_<name>_total with the given labels
+        with self._lock:
+            key = (name, tuple(sorted(labels.items())))
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def counter(self, name, **labels):
+        with self._lock:
+            return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def observe_acquire(self, seconds):
+        with self._lock:
+            self.acquire.observe(seconds)
+
+    def statement_summary(self):
+        with self._lock:
+            return [
+                {
+                    "statement": statement,
+                    "calls": entry["latency"].count,
+                    "total_s": round(entry["latency"].sum, 4),
+                    "p50_ms": round(1000 * entry["latency"].quantile(0.5), 2),
+                    "p95_ms": round(1000 * entry["latency"].quantile(0.95), 2),
+                    "max_ms": round(1000 * entry["latency"].max, 2),
+                    "rows": entry["rows"],
+                    "errors": entry["errors"],
+                }
+                for statement, entry in self.statements.items()
+            ]
+
+    def function_summary(self):
+        with self._lock:
+            return [
+                {
+                    "kind": kind,
+                    "name": name,
+                    "calls": histogram.count,
+                    "p50_ms": round(1000 * histogram.quantile(0.5), 2),
+                    "p95_ms": round(1000 * histogram.quantile(0.95), 2),
+                    "max_ms": round(1000 * histogram.max, 2),
+                }
+                for (kind, name), histogram in self.functions.items()
+            ]
+
+
+registry = Registry()
+
+# This process's cold start as measured by startup.py:
+# {"total_s": ..., "budget_s": ..., "phases": {phase: seconds}}
+cold_start = None
+
+
+def timed(kind):
+    # Decorator recording the wall time of every call under (kind, function name)
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.observe_function(kind, func.__name__, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def _histogram_lines(name, histogram, labels=""):
+    lines = []
+    cumulative = 0
+    for bound, n in zip(histogram.buckets, histogram.counts):
+        cumulative += n
+        lines.append(f'{name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels}le="+Inf"}} {histogram.count}')
+    plain = f"{{{labels.rstrip(',')}}}" if labels else ""
+    lines.append(f"{name}_sum{plain} {histogram.sum}")
+    lines.append(f"{name}_count{plain} {histogram.count}")
+    return lines
+
+
+def prometheus_text(pool_stats=None, cache_stats=None, router_stats=None):
+    # Prometheus text exposition format (version 0.0.4)
+    lines = []
+    with registry._lock:
+        statements = list(registry.statements.items())
+        functions = list(registry.functions.items())
+        acquire = registry.acquire
+        counters = sorted(registry.counters.items())
+
+        lines += ["# HELP hostel_db_statement_seconds Statement latency by normalized SQL.",
+                  "# TYPE hostel_db_statement_seconds histogram"]
+        for statement, entry in statements:
+            lines += _histogram_lines("hostel_db_statement_seconds", entry["latency"],
+                                      f'statement="{_escape_label(statement)}",')
+        lines += ["# HELP hostel_db_statement_rows_total Rows returned by normalized SQL.",
+                  "# TYPE hostel_db_statement_rows_total counter"]
+        lines += [f'hostel_db_statement_rows_total{{statement="{_escape_label(s)}"}} {e["rows"]}' for s, e in statements]
+        lines += ["# HELP hostel_db_statement_errors_total Failed statements by normalized SQL.",
+                  "# TYPE hostel_db_statement_errors_total counter"]
+        lines += [f'hostel_db_statement_errors_total{{statement="{_escape_label(s)}"}} {e["errors"]}' for s, e in statements]
+
+        lines += ["# HELP hostel_function_seconds Wall time of data access functions and page renders.",
+                  "# TYPE hostel_function_seconds histogram"]
+        for (kind, name), histogram in functions:
+            lines += _histogram_lines("hostel_function_seconds", histogram,
+                                      f'kind="{_escape_label(kind)}",name="{_escape_label(name)}",')
+
+        lines += ["# HELP hostel_db_connection_acquire_seconds Time to check a connection out of the pool.",
+                  "# TYPE hostel_db_connection_acquire_seconds histogram"]
+        lines += _histogram_lines("hostel_db_connection_acquire_seconds", acquire)
+
+        declared = set()
+        for (name, labels), value in counters:
+            if name not in declared:
+                lines.append(f"# TYPE hostel_{name}_total counter")
+                declared.add(name)
+            label_text = ",".join(f'{label}="{_escape_label(v)}"' for label, v in labels)
+            lines.append(f"hostel_{name}_total{{{label_text}}} {value}" if label_text else f"hostel_{name}_total {value}")
+
+    if cold_start:
+        lines += ["# HELP hostel_startup_seconds Seconds spent in each cold start phase.",
+                  "# TYPE hostel_startup_seconds gauge"]
+        lines += [f'hostel_startup_seconds{{phase="{_escape_label(phase)}"}} {seconds}'
+                  for phase, seconds in cold_start["phases"].items()]
+        lines += ["# TYPE hostel_startup_total_seconds gauge", f"hostel_startup_total_seconds {cold_start['total_s']}",
+                  "# TYPE hostel_startup_budget_seconds gauge", f"hostel_startup_budget_seconds {cold_start['budget_s']}"]
+
+    for prefix, stats in (("hostel_db_pool", pool_stats), ("hostel_query_cache", cache_stats),
+                          ("hostel_db_router", router_stats)):
+        for key, value in (stats or {}).items():
+            lines += [f"# TYPE {prefix}_{key} gauge", f"{prefix}_{key} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_http_server(port, collect):
+    # Serves `collect()` (Prometheus text) at /metrics from a daemon thread;
+    # later calls reuse the running server
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = collect().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        _server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+        threading.Thread(target=_server.serve_forever, daemon=True).start()
+        return _server
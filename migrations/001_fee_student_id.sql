@@ -0,0 +1,55 @@
+-- Link FEE rows to their student with a real, indexed foreign key.
+-- Databases created from commands.sql after this change already have it;
+-- run this once against databases created before it:
+--   mariadb -h 127.0.0.1 -P 4121 -u root -p HostelManagement < migrations/001_fee_student_id.sql
+
+ALTER TABLE FEE ADD COLUMN student_id VARCHAR(10) AFTER fee_id;
+
+-- Backfill from the old ID convention (F<nnn> belongs to S<n>); this is the
+-- last time the unindexable expression is evaluated
+UPDATE FEE f
+JOIN STUDENT s ON f.fee_id = CONCAT('F', LPAD(SUBSTRING(s.student_id, 2), 3, '0'))
+SET f.student_id = s.student_id
+WHERE f.student_id IS NULL;
+
+ALTER TABLE FEE
+    ADD FOREIGN KEY (student_id) REFERENCES STUDENT(student_id) ON DELETE SET NULL,
+    ADD INDEX idx_fee_status_due (status, due_date),
+    ADD INDEX idx_fee_due (due_date);
+
+DROP PROCEDURE IF EXISTS get_fee_details;
+
+DELIMITER //
+
+CREATE PROCEDURE get_fee_details(
+    IN p_status VARCHAR(50),
+    IN p_due_from DATE,
+    IN p_due_to DATE,
+    IN p_limit INT,
+    IN p_offset INT
+)
+BEGIN
+    DECLARE v_due_from DATE DEFAULT COALESCE(p_due_from, '1000-01-01');
+    DECLARE v_due_to DATE DEFAULT COALESCE(p_due_to, '9999-12-31');
+    DECLARE v_limit BIGINT UNSIGNED DEFAULT COALESCE(p_limit, 18446744073709551615);
+    DECLARE v_offset BIGINT UNSIGNED DEFAULT COALESCE(p_offset, 0);
+
+    IF p_status IS NULL THEN
+        SELECT f.*, s.name AS student_name
+        FROM FEE f
+        JOIN STUDENT s ON s.student_id = f.student_id
+        WHERE f.due_date BETWEEN v_due_from AND v_due_to
+        ORDER BY f.due_date, f.fee_id
+        LIMIT v_limit OFFSET v_offset;
+    ELSE
+        SELECT f.*, s.name AS student_name
+        FROM FEE f
+        JOIN STUDENT s ON s.student_id = f.student_id
+        WHERE f.status = p_status
+          AND f.due_date BETWEEN v_due_from AND v_due_to
+        ORDER BY f.due_date, f.fee_id
+        LIMIT v_limit OFFSET v_offset;
+    END IF;
+END //
+
+DELIMITER ;
@@ -0,0 +1,437 @@
+-- Scope rooms, students and the dashboard counters by hostel.
+-- Databases created from commands.sql after this change already have it;
+-- run this once against databases created before it:
+--   mariadb -h 127.0.0.1 -P 4121 -u root -p HostelManagement < migrations/002_hostel_scope.sql
+
+ALTER TABLE ROOM
+    ADD COLUMN hostel_id INT,
+    ADD FOREIGN KEY (hostel_id) REFERENCES HOSTEL(hostel_id) ON DELETE SET NULL,
+    ADD INDEX idx_room_hostel (hostel_id, room_no);
+
+-- Each existing room joins the hostel most of its current students are in;
+-- empty rooms stay without a hostel until one is set
+UPDATE ROOM r
+JOIN (
+    SELECT room_no, hostel_id,
+           ROW_NUMBER() OVER (PARTITION BY room_no ORDER BY COUNT(*) DESC, hostel_id) AS pick
+    FROM STUDENT
+    WHERE room_no IS NOT NULL AND hostel_id IS NOT NULL
+    GROUP BY room_no, hostel_id
+) h ON h.room_no = r.room_no AND h.pick = 1
+SET r.hostel_id = h.hostel_id;
+
+ALTER TABLE STUDENT
+    ADD INDEX idx_student_hostel_room (hostel_id, room_no),
+    ADD INDEX idx_student_hostel_name (hostel_id, name);
+
+ALTER TABLE DASHBOARD_STATS
+    ADD COLUMN hostel_id INT NOT NULL DEFAULT 0 FIRST,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (hostel_id, metric, dimension);
+
+DROP PROCEDURE IF EXISTS bump_stat;
+DROP PROCEDURE IF EXISTS add_student_to_room;
+DROP PROCEDURE IF EXISTS allocate_intake;
+DROP PROCEDURE IF EXISTS rebuild_dashboard_stats;
+DROP PROCEDURE IF EXISTS get_fee_details;
+DROP TRIGGER IF EXISTS after_student_insert;
+DROP TRIGGER IF EXISTS before_student_delete;
+DROP TRIGGER IF EXISTS after_student_delete;
+DROP TRIGGER IF EXISTS after_room_insert;
+DROP TRIGGER IF EXISTS after_room_update;
+DROP TRIGGER IF EXISTS after_room_delete;
+DROP TRIGGER IF EXISTS after_fee_insert;
+DROP TRIGGER IF EXISTS after_fee_update;
+DROP TRIGGER IF EXISTS after_fee_delete;
+
+DELIMITER //
+
+-- Add delta to one hostel's DASHBOARD_STATS counter, creating it on first use
+CREATE PROCEDURE bump_stat(IN p_hostel_id INT, IN p_metric VARCHAR(50), IN p_dimension VARCHAR(50), IN p_delta INT)
+BEGIN
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    VALUES (COALESCE(p_hostel_id, 0), p_metric, COALESCE(p_dimension, ''), COALESCE(p_delta, 0))
+    ON DUPLICATE KEY UPDATE value = value + COALESCE(p_delta, 0);
+END //
+
+CREATE TRIGGER after_student_insert
+AFTER INSERT ON STUDENT
+FOR EACH ROW
+BEGIN
+    DECLARE room_capacity INT;
+    DECLARE room_type VARCHAR(50);
+    DECLARE room_hostel INT;
+    DECLARE occupancy INT;
+
+    UPDATE ROOM_OCCUPANCY 
+    SET current_occupancy = current_occupancy + 1
+    WHERE room_no = NEW.room_no;
+
+    CALL bump_stat(NEW.hostel_id, 'students', '', 1);
+    IF NEW.room_no IS NOT NULL THEN
+        SELECT r.capacity, r.type, r.hostel_id, COALESCE(ro.current_occupancy, 0)
+        INTO room_capacity, room_type, room_hostel, occupancy
+        FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+        WHERE r.room_no = NEW.room_no;
+
+        CALL bump_stat(room_hostel, 'occupants_by_type', room_type, 1);
+        -- This student took the room's last free bed
+        IF occupancy = room_capacity THEN
+            CALL bump_stat(room_hostel, 'available_rooms', '', -1);
+        END IF;
+    END IF;
+END //
+
+-- A deleted student's fees lose their student_id (ON DELETE SET NULL) and
+-- with it their hostel. Foreign key actions do not fire the FEE triggers,
+-- so move those fees' counts to hostel 0 here, while they can still be found.
+CREATE TRIGGER before_student_delete
+BEFORE DELETE ON STUDENT
+FOR EACH ROW
+BEGIN
+    IF COALESCE(OLD.hostel_id, 0) <> 0 THEN
+        INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+        SELECT moved.hostel_id, 'fees_by_status', COALESCE(f.status, ''), moved.sign * COUNT(*)
+        FROM FEE f
+        CROSS JOIN (SELECT OLD.hostel_id AS hostel_id, -1 AS sign UNION ALL SELECT 0, 1) moved
+        WHERE f.student_id = OLD.student_id
+        GROUP BY moved.hostel_id, moved.sign, f.status
+        ON DUPLICATE KEY UPDATE value = value + VALUES(value);
+    END IF;
+END //
+
+-- Create trigger to update room occupancy after student delete
+CREATE TRIGGER after_student_delete
+AFTER DELETE ON STUDENT
+FOR EACH ROW
+BEGIN
+    DECLARE room_capacity INT;
+    DECLARE room_type VARCHAR(50);
+    DECLARE room_hostel INT;
+    DECLARE occupancy INT;
+
+    UPDATE ROOM_OCCUPANCY 
+    SET current_occupancy = current_occupancy - 1
+    WHERE room_no = OLD.room_no;
+
+    CALL bump_stat(OLD.hostel_id, 'students', '', -1);
+    IF OLD.room_no IS NOT NULL THEN
+        SELECT r.capacity, r.type, r.hostel_id, COALESCE(ro.current_occupancy, 0)
+        INTO room_capacity, room_type, room_hostel, occupancy
+        FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+        WHERE r.room_no = OLD.room_no;
+
+        CALL bump_stat(room_hostel, 'occupants_by_type', room_type, -1);
+        -- The room was full until this student left
+        IF occupancy = room_capacity - 1 THEN
+            CALL bump_stat(room_hostel, 'available_rooms', '', 1);
+        END IF;
+    END IF;
+END //
+
+CREATE TRIGGER after_room_insert
+AFTER INSERT ON ROOM
+FOR EACH ROW
+BEGIN
+    CALL bump_stat(NEW.hostel_id, 'rooms', '', 1);
+    CALL bump_stat(NEW.hostel_id, 'rooms_by_type', NEW.type, 1);
+    CALL bump_stat(NEW.hostel_id, 'beds_by_type', NEW.type, NEW.capacity);
+    IF NEW.capacity > 0 THEN
+        CALL bump_stat(NEW.hostel_id, 'available_rooms', '', 1);
+    END IF;
+END //
+
+-- Takes the room's old figures out of its old hostel and adds the new ones
+-- to its new hostel; for an unchanged hostel the pairs net out
+CREATE TRIGGER after_room_update
+AFTER UPDATE ON ROOM
+FOR EACH ROW
+BEGIN
+    DECLARE occupancy INT DEFAULT 0;
+
+    SELECT COALESCE(MAX(current_occupancy), 0) INTO occupancy
+    FROM ROOM_OCCUPANCY WHERE room_no = NEW.room_no;
+
+    CALL bump_stat(OLD.hostel_id, 'rooms', '', -1);
+    CALL bump_stat(NEW.hostel_id, 'rooms', '', 1);
+    CALL bump_stat(OLD.hostel_id, 'rooms_by_type', OLD.type, -1);
+    CALL bump_stat(NEW.hostel_id, 'rooms_by_type', NEW.type, 1);
+    CALL bump_stat(OLD.hostel_id, 'beds_by_type', OLD.type, -OLD.capacity);
+    CALL bump_stat(NEW.hostel_id, 'beds_by_type', NEW.type, NEW.capacity);
+    CALL bump_stat(OLD.hostel_id, 'occupants_by_type', OLD.type, -occupancy);
+    CALL bump_stat(NEW.hostel_id, 'occupants_by_type', NEW.type, occupancy);
+    CALL bump_stat(OLD.hostel_id, 'available_rooms', '', -(occupancy < OLD.capacity));
+    CALL bump_stat(NEW.hostel_id, 'available_rooms', '', occupancy < NEW.capacity);
+END //
+
+CREATE TRIGGER after_room_delete
+AFTER DELETE ON ROOM
+FOR EACH ROW
+BEGIN
+    DECLARE occupancy INT DEFAULT 0;
+
+    SELECT COALESCE(MAX(current_occupancy), 0) INTO occupancy
+    FROM ROOM_OCCUPANCY WHERE room_no = OLD.room_no;
+
+    CALL bump_stat(OLD.hostel_id, 'rooms', '', -1);
+    CALL bump_stat(OLD.hostel_id, 'rooms_by_type', OLD.type, -1);
+    CALL bump_stat(OLD.hostel_id, 'beds_by_type', OLD.type, -OLD.capacity);
+    CALL bump_stat(OLD.hostel_id, 'occupants_by_type', OLD.type, -occupancy);
+    IF occupancy < OLD.capacity THEN
+        CALL bump_stat(OLD.hostel_id, 'available_rooms', '', -1);
+    END IF;
+END //
+
+-- Fees count towards their student's hostel
+CREATE TRIGGER after_fee_insert
+AFTER INSERT ON FEE
+FOR EACH ROW
+BEGIN
+    CALL bump_stat((SELECT hostel_id FROM STUDENT WHERE student_id = NEW.student_id), 'fees_by_status', NEW.status, 1);
+END //
+
+CREATE TRIGGER after_fee_update
+AFTER UPDATE ON FEE
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.status <=> NEW.status AND OLD.student_id <=> NEW.student_id) THEN
+        CALL bump_stat((SELECT hostel_id FROM STUDENT WHERE student_id = OLD.student_id), 'fees_by_status', OLD.status, -1);
+        CALL bump_stat((SELECT hostel_id FROM STUDENT WHERE student_id = NEW.student_id), 'fees_by_status', NEW.status, 1);
+    END IF;
+END //
+
+CREATE TRIGGER after_fee_delete
+AFTER DELETE ON FEE
+FOR EACH ROW
+BEGIN
+    CALL bump_stat((SELECT hostel_id FROM STUDENT WHERE student_id = OLD.student_id), 'fees_by_status', OLD.status, -1);
+END //
+
+-- Add one student to a room in a single round trip. The room row stays
+-- locked from the capacity check to the insert, so concurrent adds to the
+-- same room cannot overfill it. A room that belongs to a hostel only takes
+-- that hostel's students.
+CREATE PROCEDURE add_student_to_room(
+    IN p_student_id VARCHAR(10),
+    IN p_name VARCHAR(255),
+    IN p_course VARCHAR(100),
+    IN p_mess_plan VARCHAR(50),
+    IN p_laundry_plan VARCHAR(50),
+    IN p_hostel_id INT,
+    IN p_room_no INT
+)
+BEGIN
+    DECLARE v_capacity INT;
+    DECLARE v_occupancy INT;
+    DECLARE v_hostel_id INT;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    START TRANSACTION;
+
+    SELECT r.capacity, COALESCE(ro.current_occupancy, 0), r.hostel_id
+    INTO v_capacity, v_occupancy, v_hostel_id
+    FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+    WHERE r.room_no = p_room_no
+    FOR UPDATE;
+
+    IF v_capacity IS NULL THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Room does not exist';
+    END IF;
+    IF v_hostel_id IS NOT NULL AND NOT (v_hostel_id <=> p_hostel_id) THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Room belongs to another hostel';
+    END IF;
+    IF v_occupancy >= v_capacity THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Room is already full';
+    END IF;
+
+    INSERT INTO STUDENT (student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no)
+    VALUES (p_student_id, p_name, p_course, p_mess_plan, p_laundry_plan, p_hostel_id, p_room_no);
+
+    COMMIT;
+END //
+
+-- Place every student in STUDENT_INTAKE into a free bed of their hostel
+-- with set-based statements. Rooms and students without a hostel form one
+-- more group (hostel 0). Within a hostel, pass 1 gives the k-th applicant
+-- for a room type the k-th free bed of that type; pass 2 fills the
+-- remaining beds, in room order, with students who have no preference (or,
+-- unless p_strict, whose preferred type ran out). Placed students move to
+-- STUDENT; the rest stay queued.
+CREATE PROCEDURE allocate_intake(IN p_strict BOOLEAN)
+BEGIN
+    DECLARE v_allocated INT;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    START TRANSACTION;
+
+    -- Blocks add_student_to_room until the batch commits
+    SELECT COUNT(*) INTO v_allocated FROM ROOM FOR UPDATE;
+
+    DROP TEMPORARY TABLE IF EXISTS free_bed, spare_bed, intake_rank, waiting;
+
+    -- One row per free bed, numbered within its hostel and room type
+    CREATE TEMPORARY TABLE free_bed (
+        hostel_id INT,
+        room_no INT,
+        type VARCHAR(50),
+        type_rank INT,
+        taken BOOLEAN NOT NULL DEFAULT FALSE,
+        PRIMARY KEY (hostel_id, type, type_rank)
+    );
+    INSERT INTO free_bed (hostel_id, room_no, type, type_rank)
+    SELECT COALESCE(r.hostel_id, 0), r.room_no, r.type,
+           ROW_NUMBER() OVER (PARTITION BY COALESCE(r.hostel_id, 0), r.type ORDER BY r.room_no, slot.n)
+    FROM ROOM r
+    LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+    JOIN (
+        SELECT tens.d * 10 + ones.d + 1 AS n
+        FROM (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+              UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) ones
+        CROSS JOIN (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+              UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) tens
+    ) slot ON slot.n <= r.capacity - COALESCE(ro.current_occupancy, 0);
+
+    -- Pass 1: preferred room type
+    UPDATE STUDENT_INTAKE SET room_no = NULL;
+    CREATE TEMPORARY TABLE intake_rank (PRIMARY KEY (student_id))
+    SELECT student_id, COALESCE(hostel_id, 0) AS hostel_id, preferred_type,
+           ROW_NUMBER() OVER (PARTITION BY COALESCE(hostel_id, 0), preferred_type ORDER BY student_id) AS type_rank
+    FROM STUDENT_INTAKE
+    WHERE preferred_type IS NOT NULL;
+
+    UPDATE STUDENT_INTAKE i
+    JOIN intake_rank k ON k.student_id = i.student_id
+    JOIN free_bed b ON b.hostel_id = k.hostel_id AND b.type = k.preferred_type AND b.type_rank = k.type_rank
+    SET i.room_no = b.room_no;
+
+    UPDATE free_bed b
+    JOIN (
+        SELECT COALESCE(hostel_id, 0) AS hostel_id, preferred_type, COUNT(*) AS assigned
+        FROM STUDENT_INTAKE
+        WHERE room_no IS NOT NULL
+        GROUP BY COALESCE(hostel_id, 0), preferred_type
+    ) a ON a.hostel_id = b.hostel_id AND a.preferred_type = b.type
+    SET b.taken = TRUE
+    WHERE b.type_rank <= a.assigned;
+
+    -- Pass 2: any remaining bed in the hostel
+    CREATE TEMPORARY TABLE spare_bed (PRIMARY KEY (hostel_id, bed_rank))
+    SELECT hostel_id, room_no, ROW_NUMBER() OVER (PARTITION BY hostel_id ORDER BY room_no, type_rank) AS bed_rank
+    FROM free_bed
+    WHERE NOT taken;
+
+    CREATE TEMPORARY TABLE waiting (PRIMARY KEY (student_id))
+    SELECT student_id, COALESCE(hostel_id, 0) AS hostel_id,
+           ROW_NUMBER() OVER (PARTITION BY COALESCE(hostel_id, 0) ORDER BY student_id) AS bed_rank
+    FROM STUDENT_INTAKE
+    WHERE room_no IS NULL AND (preferred_type IS NULL OR NOT p_strict);
+
+    UPDATE STUDENT_INTAKE i
+    JOIN waiting w ON w.student_id = i.student_id
+    JOIN spare_bed s ON s.hostel_id = w.hostel_id AND s.bed_rank = w.bed_rank
+    SET i.room_no = s.room_no;
+
+    INSERT INTO STUDENT (student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no)
+    SELECT student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no
+    FROM STUDENT_INTAKE
+    WHERE room_no IS NOT NULL;
+    SET v_allocated = ROW_COUNT();
+
+    DELETE FROM STUDENT_INTAKE WHERE room_no IS NOT NULL;
+    DROP TEMPORARY TABLE free_bed, spare_bed, intake_rank, waiting;
+
+    COMMIT;
+
+    SELECT v_allocated AS allocated, COUNT(*) AS unallocated FROM STUDENT_INTAKE;
+END //
+
+-- Recompute DASHBOARD_STATS from scratch, e.g. after bulk loads or drift
+CREATE PROCEDURE rebuild_dashboard_stats()
+BEGIN
+    START TRANSACTION;
+    DELETE FROM DASHBOARD_STATS;
+
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    SELECT COALESCE(hostel_id, 0), 'students', '', COUNT(*) FROM STUDENT GROUP BY COALESCE(hostel_id, 0)
+    UNION ALL
+    SELECT COALESCE(hostel_id, 0), 'rooms', '', COUNT(*) FROM ROOM GROUP BY COALESCE(hostel_id, 0)
+    UNION ALL
+    SELECT COALESCE(r.hostel_id, 0), 'available_rooms', '', COUNT(*)
+    FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+    WHERE COALESCE(ro.current_occupancy, 0) < r.capacity
+    GROUP BY COALESCE(r.hostel_id, 0)
+    UNION ALL
+    SELECT COALESCE(hostel_id, 0), 'rooms_by_type', COALESCE(type, ''), COUNT(*)
+    FROM ROOM GROUP BY COALESCE(hostel_id, 0), type
+    UNION ALL
+    SELECT COALESCE(hostel_id, 0), 'beds_by_type', COALESCE(type, ''), COALESCE(SUM(capacity), 0)
+    FROM ROOM GROUP BY COALESCE(hostel_id, 0), type
+    UNION ALL
+    SELECT COALESCE(r.hostel_id, 0), 'occupants_by_type', COALESCE(r.type, ''), COALESCE(SUM(ro.current_occupancy), 0)
+    FROM ROOM r JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no GROUP BY COALESCE(r.hostel_id, 0), r.type
+    UNION ALL
+    SELECT COALESCE(s.hostel_id, 0), 'fees_by_status', COALESCE(f.status, ''), COUNT(*)
+    FROM FEE f LEFT JOIN STUDENT s ON s.student_id = f.student_id
+    GROUP BY COALESCE(s.hostel_id, 0), f.status;
+    COMMIT;
+END //
+
+-- Fees with their student's name, optionally filtered by status, due date
+-- range and the student's hostel, one page at a time. NULL arguments mean
+-- "no filter"/"no limit".
+CREATE PROCEDURE get_fee_details(
+    IN p_status VARCHAR(50),
+    IN p_due_from DATE,
+    IN p_due_to DATE,
+    IN p_limit INT,
+    IN p_offset INT,
+    IN p_hostel_id INT
+)
+BEGIN
+    DECLARE v_due_from DATE DEFAULT COALESCE(p_due_from, '1000-01-01');
+    DECLARE v_due_to DATE DEFAULT COALESCE(p_due_to, '9999-12-31');
+    DECLARE v_limit BIGINT UNSIGNED DEFAULT COALESCE(p_limit, 18446744073709551615);
+    DECLARE v_offset BIGINT UNSIGNED DEFAULT COALESCE(p_offset, 0);
+
+    -- Separate statements keep each one a plain range on one index. One
+    -- hostel's fees are found through its students (idx_student_hostel_room)
+    -- and their fees (the FEE.student_id index), then sorted.
+    IF p_hostel_id IS NOT NULL THEN
+        SELECT f.*, s.name AS student_name
+        FROM STUDENT s
+        JOIN FEE f ON f.student_id = s.student_id
+        WHERE s.hostel_id = p_hostel_id
+          AND (p_status IS NULL OR f.status = p_status)
+          AND f.due_date BETWEEN v_due_from AND v_due_to
+        ORDER BY f.due_date, f.fee_id
+        LIMIT v_limit OFFSET v_offset;
+    ELSEIF p_status IS NULL THEN
+        SELECT f.*, s.name AS student_name
+        FROM FEE f
+        JOIN STUDENT s ON s.student_id = f.student_id
+        WHERE f.due_date BETWEEN v_due_from AND v_due_to
+        ORDER BY f.due_date, f.fee_id
+        LIMIT v_limit OFFSET v_offset;
+    ELSE
+        SELECT f.*, s.name AS student_name
+        FROM FEE f
+        JOIN STUDENT s ON s.student_id = f.student_id
+        WHERE f.status = p_status
+          AND f.due_date BETWEEN v_due_from AND v_due_to
+        ORDER BY f.due_date, f.fee_id
+        LIMIT v_limit OFFSET v_offset;
+    END IF;
+END //
+
+DELIMITER ;
+
+-- Recount every counter per hostel
+CALL rebuild_dashboard_stats();
@@ -0,0 +1,170 @@
+-- Keep ROOM_OCCUPANCY in step with room moves, new rooms and deleted rooms,
+-- and add reconcile_occupancy() for repairing drift.
+-- Databases created from commands.sql after this change already have it;
+-- run this once against databases created before it:
+--   mariadb -h 127.0.0.1 -P 4121 -u root -p HostelManagement < migrations/003_occupancy_reconciliation.sql
+
+-- Occupancy rows go with their room instead of blocking its deletion
+ALTER TABLE ROOM_OCCUPANCY
+    DROP FOREIGN KEY ROOM_OCCUPANCY_ibfk_1,
+    ADD CONSTRAINT fk_occupancy_room FOREIGN KEY (room_no) REFERENCES ROOM(room_no) ON DELETE CASCADE;
+
+DROP TRIGGER IF EXISTS after_student_update;
+DROP TRIGGER IF EXISTS after_room_insert;
+DROP TRIGGER IF EXISTS after_room_delete;
+DROP TRIGGER IF EXISTS before_room_delete;
+DROP PROCEDURE IF EXISTS reconcile_occupancy;
+
+DELIMITER //
+
+-- A student moving rooms leaves one bed and takes another; a student
+-- moving hostels takes their own and their fees' counts along
+CREATE TRIGGER after_student_update
+AFTER UPDATE ON STUDENT
+FOR EACH ROW
+BEGIN
+    DECLARE room_capacity INT;
+    DECLARE room_type VARCHAR(50);
+    DECLARE room_hostel INT;
+    DECLARE occupancy INT;
+
+    IF NOT (OLD.room_no <=> NEW.room_no) THEN
+        IF OLD.room_no IS NOT NULL THEN
+            UPDATE ROOM_OCCUPANCY
+            SET current_occupancy = current_occupancy - 1
+            WHERE room_no = OLD.room_no;
+
+            SELECT r.capacity, r.type, r.hostel_id, COALESCE(ro.current_occupancy, 0)
+            INTO room_capacity, room_type, room_hostel, occupancy
+            FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+            WHERE r.room_no = OLD.room_no;
+
+            CALL bump_stat(room_hostel, 'occupants_by_type', room_type, -1);
+            IF occupancy = room_capacity - 1 THEN
+                CALL bump_stat(room_hostel, 'available_rooms', '', 1);
+            END IF;
+        END IF;
+
+        IF NEW.room_no IS NOT NULL THEN
+            UPDATE ROOM_OCCUPANCY
+            SET current_occupancy = current_occupancy + 1
+            WHERE room_no = NEW.room_no;
+
+            SELECT r.capacity, r.type, r.hostel_id, COALESCE(ro.current_occupancy, 0)
+            INTO room_capacity, room_type, room_hostel, occupancy
+            FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+            WHERE r.room_no = NEW.room_no;
+
+            CALL bump_stat(room_hostel, 'occupants_by_type', room_type, 1);
+            IF occupancy = room_capacity THEN
+                CALL bump_stat(room_hostel, 'available_rooms', '', -1);
+            END IF;
+        END IF;
+    END IF;
+
+    IF NOT (OLD.hostel_id <=> NEW.hostel_id) THEN
+        CALL bump_stat(OLD.hostel_id, 'students', '', -1);
+        CALL bump_stat(NEW.hostel_id, 'students', '', 1);
+
+        INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+        SELECT moved.hostel_id, 'fees_by_status', COALESCE(f.status, ''), moved.sign * COUNT(*)
+        FROM FEE f
+        CROSS JOIN (SELECT COALESCE(OLD.hostel_id, 0) AS hostel_id, -1 AS sign
+                    UNION ALL SELECT COALESCE(NEW.hostel_id, 0), 1) moved
+        WHERE f.student_id = NEW.student_id
+        GROUP BY moved.hostel_id, moved.sign, f.status
+        ON DUPLICATE KEY UPDATE value = value + VALUES(value);
+    END IF;
+END //
+
+-- Every new room starts with an empty ROOM_OCCUPANCY row
+CREATE TRIGGER after_room_insert
+AFTER INSERT ON ROOM
+FOR EACH ROW
+BEGIN
+    INSERT INTO ROOM_OCCUPANCY (room_no, current_occupancy) VALUES (NEW.room_no, 0);
+
+    CALL bump_stat(NEW.hostel_id, 'rooms', '', 1);
+    CALL bump_stat(NEW.hostel_id, 'rooms_by_type', NEW.type, 1);
+    CALL bump_stat(NEW.hostel_id, 'beds_by_type', NEW.type, NEW.capacity);
+    IF NEW.capacity > 0 THEN
+        CALL bump_stat(NEW.hostel_id, 'available_rooms', '', 1);
+    END IF;
+END //
+
+-- Runs before the delete because ON DELETE CASCADE removes the room's
+-- ROOM_OCCUPANCY row together with the room
+CREATE TRIGGER before_room_delete
+BEFORE DELETE ON ROOM
+FOR EACH ROW
+BEGIN
+    DECLARE occupancy INT DEFAULT 0;
+
+    SELECT COALESCE(MAX(current_occupancy), 0) INTO occupancy
+    FROM ROOM_OCCUPANCY WHERE room_no = OLD.room_no;
+
+    CALL bump_stat(OLD.hostel_id, 'rooms', '', -1);
+    CALL bump_stat(OLD.hostel_id, 'rooms_by_type', OLD.type, -1);
+    CALL bump_stat(OLD.hostel_id, 'beds_by_type', OLD.type, -OLD.capacity);
+    CALL bump_stat(OLD.hostel_id, 'occupants_by_type', OLD.type, -occupancy);
+    IF occupancy < OLD.capacity THEN
+        CALL bump_stat(OLD.hostel_id, 'available_rooms', '', -1);
+    END IF;
+END //
+
+-- Repair ROOM_OCCUPANCY drift (e.g. from rooms created before the triggers,
+-- edits made directly to the table or restores that skip triggers) with
+-- set-based statements: add the rows missing for rooms, then correct every
+-- count that differs from the room's students in one grouped join. The
+-- dashboard counters derived from occupancy are rebuilt if anything
+-- changed. Returns the number of rows added and corrected. Concurrent calls
+-- do not overlap; a call made while another runs returns zeros at once.
+CREATE PROCEDURE reconcile_occupancy()
+reconcile: BEGIN
+    DECLARE v_missing INT DEFAULT 0;
+    DECLARE v_corrected INT DEFAULT 0;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        DO RELEASE_LOCK('reconcile_occupancy');
+        RESIGNAL;
+    END;
+
+    IF NOT GET_LOCK('reconcile_occupancy', 0) THEN
+        SELECT 0 AS missing, 0 AS corrected;
+        LEAVE reconcile;
+    END IF;
+
+    START TRANSACTION;
+
+    INSERT INTO ROOM_OCCUPANCY (room_no, current_occupancy)
+    SELECT r.room_no, 0
+    FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+    WHERE ro.room_no IS NULL;
+    SET v_missing = ROW_COUNT();
+
+    UPDATE ROOM_OCCUPANCY ro
+    LEFT JOIN (
+        SELECT room_no, COUNT(*) AS occupants
+        FROM STUDENT
+        WHERE room_no IS NOT NULL
+        GROUP BY room_no
+    ) s ON s.room_no = ro.room_no
+    SET ro.current_occupancy = COALESCE(s.occupants, 0)
+    WHERE NOT (ro.current_occupancy <=> COALESCE(s.occupants, 0));
+    SET v_corrected = ROW_COUNT();
+
+    COMMIT;
+
+    IF v_missing + v_corrected > 0 THEN
+        CALL rebuild_dashboard_stats();
+    END IF;
+    DO RELEASE_LOCK('reconcile_occupancy');
+
+    SELECT v_missing AS missing, v_corrected AS corrected;
+END //
+
+DELIMITER ;
+
+-- Adds rows for rooms created without one and fixes the counts that drifted
+CALL reconcile_occupancy();
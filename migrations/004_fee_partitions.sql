@@ -0,0 +1,209 @@
+-- Partition FEE by term of due_date. Partitioned tables cannot have foreign
+-- keys, and every unique key must include due_date, so the foreign key to
+-- STUDENT and the uniqueness of fee_id move into triggers.
+-- Databases created from commands.sql after this change already have it;
+-- run this once against databases created before it:
+--   mariadb -h 127.0.0.1 -P 4121 -u root -p HostelManagement < migrations/004_fee_partitions.sql
+--
+-- Every fee needs a due date to be placed in a term. Find those without one
+-- and give them a due date first, or the ALTER below fails:
+--   SELECT fee_id FROM FEE WHERE due_date IS NULL;
+
+ALTER TABLE FEE
+    DROP FOREIGN KEY IF EXISTS FEE_ibfk_1,
+    DROP INDEX IF EXISTS student_id,
+    ADD INDEX idx_fee_student (student_id),
+    MODIFY due_date DATE NOT NULL,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (fee_id, due_date);
+
+ALTER TABLE FEE
+PARTITION BY RANGE COLUMNS (due_date) (
+    PARTITION p_old VALUES LESS THAN ('2020-01-01'),
+    PARTITION p2020_1 VALUES LESS THAN ('2020-07-01'),
+    PARTITION p2020_2 VALUES LESS THAN ('2021-01-01'),
+    PARTITION p2021_1 VALUES LESS THAN ('2021-07-01'),
+    PARTITION p2021_2 VALUES LESS THAN ('2022-01-01'),
+    PARTITION p2022_1 VALUES LESS THAN ('2022-07-01'),
+    PARTITION p2022_2 VALUES LESS THAN ('2023-01-01'),
+    PARTITION p2023_1 VALUES LESS THAN ('2023-07-01'),
+    PARTITION p2023_2 VALUES LESS THAN ('2024-01-01'),
+    PARTITION p2024_1 VALUES LESS THAN ('2024-07-01'),
+    PARTITION p2024_2 VALUES LESS THAN ('2025-01-01'),
+    PARTITION p2025_1 VALUES LESS THAN ('2025-07-01'),
+    PARTITION p2025_2 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p2026_1 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p2026_2 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p2027_1 VALUES LESS THAN ('2027-07-01'),
+    PARTITION p2027_2 VALUES LESS THAN ('2028-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+DROP TRIGGER IF EXISTS before_student_delete;
+DROP TRIGGER IF EXISTS after_student_update;
+DROP TRIGGER IF EXISTS before_fee_insert;
+DROP TRIGGER IF EXISTS before_fee_update;
+DROP PROCEDURE IF EXISTS add_fee_partitions;
+
+DELIMITER //
+
+-- A deleted student's fees lose their student_id, as ON DELETE SET NULL
+-- would do if FEE could have a foreign key. Done before the delete so that
+-- after_fee_update still finds the student's hostel and moves the fees'
+-- counts to hostel 0.
+CREATE TRIGGER before_student_delete
+BEFORE DELETE ON STUDENT
+FOR EACH ROW
+BEGIN
+    UPDATE FEE SET student_id = NULL WHERE student_id = OLD.student_id;
+END //
+
+-- A student moving rooms leaves one bed and takes another; a student
+-- moving hostels takes their own and their fees' counts along
+CREATE TRIGGER after_student_update
+AFTER UPDATE ON STUDENT
+FOR EACH ROW
+BEGIN
+    DECLARE room_capacity INT;
+    DECLARE room_type VARCHAR(50);
+    DECLARE room_hostel INT;
+    DECLARE occupancy INT;
+
+    -- The student's fees still refer to the old ID
+    IF OLD.student_id <> NEW.student_id
+       AND EXISTS (SELECT 1 FROM FEE WHERE student_id = OLD.student_id) THEN
+        SIGNAL SQLSTATE '23000' SET MYSQL_ERRNO = 1451,
+            MESSAGE_TEXT = 'Cannot change the ID of a student who has fees';
+    END IF;
+
+    IF NOT (OLD.room_no <=> NEW.room_no) THEN
+        IF OLD.room_no IS NOT NULL THEN
+            UPDATE ROOM_OCCUPANCY
+            SET current_occupancy = current_occupancy - 1
+            WHERE room_no = OLD.room_no;
+
+            SELECT r.capacity, r.type, r.hostel_id, COALESCE(ro.current_occupancy, 0)
+            INTO room_capacity, room_type, room_hostel, occupancy
+            FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+            WHERE r.room_no = OLD.room_no;
+
+            CALL bump_stat(room_hostel, 'occupants_by_type', room_type, -1);
+            IF occupancy = room_capacity - 1 THEN
+                CALL bump_stat(room_hostel, 'available_rooms', '', 1);
+            END IF;
+        END IF;
+
+        IF NEW.room_no IS NOT NULL THEN
+            UPDATE ROOM_OCCUPANCY
+            SET current_occupancy = current_occupancy + 1
+            WHERE room_no = NEW.room_no;
+
+            SELECT r.capacity, r.type, r.hostel_id, COALESCE(ro.current_occupancy, 0)
+            INTO room_capacity, room_type, room_hostel, occupancy
+            FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+            WHERE r.room_no = NEW.room_no;
+
+            CALL bump_stat(room_hostel, 'occupants_by_type', room_type, 1);
+            IF occupancy = room_capacity THEN
+                CALL bump_stat(room_hostel, 'available_rooms', '', -1);
+            END IF;
+        END IF;
+    END IF;
+
+    IF NOT (OLD.hostel_id <=> NEW.hostel_id) THEN
+        CALL bump_stat(OLD.hostel_id, 'students', '', -1);
+        CALL bump_stat(NEW.hostel_id, 'students', '', 1);
+
+        INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+        SELECT moved.hostel_id, 'fees_by_status', COALESCE(f.status, ''), moved.sign * COUNT(*)
+        FROM FEE f
+        CROSS JOIN (SELECT COALESCE(OLD.hostel_id, 0) AS hostel_id, -1 AS sign
+                    UNION ALL SELECT COALESCE(NEW.hostel_id, 0), 1) moved
+        WHERE f.student_id = NEW.student_id
+        GROUP BY moved.hostel_id, moved.sign, f.status
+        ON DUPLICATE KEY UPDATE value = value + VALUES(value);
+    END IF;
+END //
+
+-- The checks FEE's primary key and foreign key made before partitioning.
+-- The locking reads block concurrent inserts of the same fee_id and
+-- deletes of the referenced student until this transaction ends.
+CREATE TRIGGER before_fee_insert
+BEFORE INSERT ON FEE
+FOR EACH ROW
+BEGIN
+    DECLARE v_found INT;
+
+    SELECT COUNT(*) INTO v_found FROM FEE WHERE fee_id = NEW.fee_id FOR UPDATE;
+    IF v_found > 0 THEN
+        SIGNAL SQLSTATE '23000' SET MYSQL_ERRNO = 1062,
+            MESSAGE_TEXT = 'Duplicate fee_id';
+    END IF;
+
+    IF NEW.student_id IS NOT NULL THEN
+        SELECT COUNT(*) INTO v_found FROM STUDENT WHERE student_id = NEW.student_id LOCK IN SHARE MODE;
+        IF v_found = 0 THEN
+            SIGNAL SQLSTATE '23000' SET MYSQL_ERRNO = 1452,
+                MESSAGE_TEXT = 'Cannot add a fee for a student that does not exist';
+        END IF;
+    END IF;
+END //
+
+CREATE TRIGGER before_fee_update
+BEFORE UPDATE ON FEE
+FOR EACH ROW
+BEGIN
+    DECLARE v_found INT;
+
+    IF NEW.fee_id <> OLD.fee_id THEN
+        SELECT COUNT(*) INTO v_found FROM FEE WHERE fee_id = NEW.fee_id FOR UPDATE;
+        IF v_found > 0 THEN
+            SIGNAL SQLSTATE '23000' SET MYSQL_ERRNO = 1062,
+                MESSAGE_TEXT = 'Duplicate fee_id';
+        END IF;
+    END IF;
+
+    IF NEW.student_id IS NOT NULL AND NOT (NEW.student_id <=> OLD.student_id) THEN
+        SELECT COUNT(*) INTO v_found FROM STUDENT WHERE student_id = NEW.student_id LOCK IN SHARE MODE;
+        IF v_found = 0 THEN
+            SIGNAL SQLSTATE '23000' SET MYSQL_ERRNO = 1452,
+                MESSAGE_TEXT = 'Cannot move a fee to a student that does not exist';
+        END IF;
+    END IF;
+END //
+
+-- Split FEE's p_future partition into terms until p_until, so new fees land
+-- in a partition of their own term instead of p_future. Returns the number
+-- of terms added.
+CREATE PROCEDURE add_fee_partitions(IN p_until DATE)
+BEGIN
+    DECLARE v_start DATE;
+    DECLARE v_end DATE;
+    DECLARE v_parts TEXT DEFAULT '';
+    DECLARE v_added INT DEFAULT 0;
+
+    -- p_future starts at the bound of the last term partition
+    SELECT MAX(STR_TO_DATE(TRIM(BOTH '''' FROM PARTITION_DESCRIPTION), '%Y-%m-%d')) INTO v_start
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'FEE' AND PARTITION_DESCRIPTION <> 'MAXVALUE';
+
+    WHILE v_start <= p_until DO
+        SET v_end = v_start + INTERVAL 6 MONTH;
+        SET v_parts = CONCAT(v_parts, 'PARTITION p', YEAR(v_start), '_', IF(MONTH(v_start) < 7, 1, 2),
+                             ' VALUES LESS THAN (''', v_end, '''), ');
+        SET v_start = v_end;
+        SET v_added = v_added + 1;
+    END WHILE;
+
+    IF v_added > 0 THEN
+        SET @add_fee_partitions = CONCAT('ALTER TABLE FEE REORGANIZE PARTITION p_future INTO (', v_parts,
+                                         'PARTITION p_future VALUES LESS THAN (MAXVALUE))');
+        PREPARE stmt FROM @add_fee_partitions;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+
+    SELECT v_added AS added;
+END //
+
+DELIMITER ;
@@ -0,0 +1,111 @@
+-- allocate_intake() failed on rooms without a type: the NULL type went into
+-- the primary key of its free_bed temporary table.
+-- Databases created from commands.sql after this change already have it;
+-- run this once against databases created before it:
+--   mariadb -h 127.0.0.1 -P 4121 -u root -p HostelManagement < migrations/005_allocate_intake_untyped_rooms.sql
+
+DROP PROCEDURE IF EXISTS allocate_intake;
+
+DELIMITER //
+
+-- Place every student in STUDENT_INTAKE into a free bed of their hostel
+-- with set-based statements. Rooms and students without a hostel form one
+-- more group (hostel 0). Within a hostel, pass 1 gives the k-th applicant
+-- for a room type the k-th free bed of that type; pass 2 fills the
+-- remaining beds, in room order, with students who have no preference (or,
+-- unless p_strict, whose preferred type ran out). Placed students move to
+-- STUDENT; the rest stay queued.
+CREATE PROCEDURE allocate_intake(IN p_strict BOOLEAN)
+BEGIN
+    DECLARE v_allocated INT;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    START TRANSACTION;
+
+    -- Blocks add_student_to_room until the batch commits
+    SELECT COUNT(*) INTO v_allocated FROM ROOM FOR UPDATE;
+
+    DROP TEMPORARY TABLE IF EXISTS free_bed, spare_bed, intake_rank, waiting;
+
+    -- One row per free bed, numbered within its hostel and room type; rooms
+    -- without a type get '' so they still fit the key (and only pass 2 uses them)
+    CREATE TEMPORARY TABLE free_bed (
+        hostel_id INT,
+        room_no INT,
+        type VARCHAR(50) NOT NULL,
+        type_rank INT,
+        taken BOOLEAN NOT NULL DEFAULT FALSE,
+        PRIMARY KEY (hostel_id, type, type_rank)
+    );
+    INSERT INTO free_bed (hostel_id, room_no, type, type_rank)
+    SELECT COALESCE(r.hostel_id, 0), r.room_no, COALESCE(r.type, ''),
+           ROW_NUMBER() OVER (PARTITION BY COALESCE(r.hostel_id, 0), COALESCE(r.type, '') ORDER BY r.room_no, slot.n)
+    FROM ROOM r
+    LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+    JOIN (
+        SELECT tens.d * 10 + ones.d + 1 AS n
+        FROM (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+              UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) ones
+        CROSS JOIN (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+              UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) tens
+    ) slot ON slot.n <= r.capacity - COALESCE(ro.current_occupancy, 0);
+
+    -- Pass 1: preferred room type
+    UPDATE STUDENT_INTAKE SET room_no = NULL;
+    CREATE TEMPORARY TABLE intake_rank (PRIMARY KEY (student_id))
+    SELECT student_id, COALESCE(hostel_id, 0) AS hostel_id, preferred_type,
+           ROW_NUMBER() OVER (PARTITION BY COALESCE(hostel_id, 0), preferred_type ORDER BY student_id) AS type_rank
+    FROM STUDENT_INTAKE
+    WHERE preferred_type IS NOT NULL;
+
+    UPDATE STUDENT_INTAKE i
+    JOIN intake_rank k ON k.student_id = i.student_id
+    JOIN free_bed b ON b.hostel_id = k.hostel_id AND b.type = k.preferred_type AND b.type_rank = k.type_rank
+    SET i.room_no = b.room_no;
+
+    UPDATE free_bed b
+    JOIN (
+        SELECT COALESCE(hostel_id, 0) AS hostel_id, preferred_type, COUNT(*) AS assigned
+        FROM STUDENT_INTAKE
+        WHERE room_no IS NOT NULL
+        GROUP BY COALESCE(hostel_id, 0), preferred_type
+    ) a ON a.hostel_id = b.hostel_id AND a.preferred_type = b.type
+    SET b.taken = TRUE
+    WHERE b.type_rank <= a.assigned;
+
+    -- Pass 2: any remaining bed in the hostel
+    CREATE TEMPORARY TABLE spare_bed (PRIMARY KEY (hostel_id, bed_rank))
+    SELECT hostel_id, room_no, ROW_NUMBER() OVER (PARTITION BY hostel_id ORDER BY room_no, type_rank) AS bed_rank
+    FROM free_bed
+    WHERE NOT taken;
+
+    CREATE TEMPORARY TABLE waiting (PRIMARY KEY (student_id))
+    SELECT student_id, COALESCE(hostel_id, 0) AS hostel_id,
+           ROW_NUMBER() OVER (PARTITION BY COALESCE(hostel_id, 0) ORDER BY student_id) AS bed_rank
+    FROM STUDENT_INTAKE
+    WHERE room_no IS NULL AND (preferred_type IS NULL OR NOT p_strict);
+
+    UPDATE STUDENT_INTAKE i
+    JOIN waiting w ON w.student_id = i.student_id
+    JOIN spare_bed s ON s.hostel_id = w.hostel_id AND s.bed_rank = w.bed_rank
+    SET i.room_no = s.room_no;
+
+    INSERT INTO STUDENT (student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no)
+    SELECT student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no
+    FROM STUDENT_INTAKE
+    WHERE room_no IS NOT NULL;
+    SET v_allocated = ROW_COUNT();
+
+    DELETE FROM STUDENT_INTAKE WHERE room_no IS NOT NULL;
+    DROP TEMPORARY TABLE free_bed, spare_bed, intake_rank, waiting;
+
+    COMMIT;
+
+    SELECT v_allocated AS allocated, COUNT(*) AS unallocated FROM STUDENT_INTAKE;
+END //
+
+DELIMITER ;
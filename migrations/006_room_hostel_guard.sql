@@ -0,0 +1,24 @@
+-- Refuse moving an occupied room to another hostel, which left its students
+-- in a room outside their hostel.
+-- Databases created from commands.sql after this change already have it;
+-- run this once against databases created before it:
+--   mariadb -h 127.0.0.1 -P 4121 -u root -p HostelManagement < migrations/006_room_hostel_guard.sql
+
+DROP TRIGGER IF EXISTS before_room_update;
+
+DELIMITER //
+
+-- A room's students must belong to its hostel, so an occupied room cannot
+-- move to another one. Clearing the hostel is allowed: a room without a
+-- hostel takes students of any, and deleting a hostel does that.
+CREATE TRIGGER before_room_update
+BEFORE UPDATE ON ROOM
+FOR EACH ROW
+BEGIN
+    IF NEW.hostel_id IS NOT NULL AND NOT (OLD.hostel_id <=> NEW.hostel_id)
+       AND EXISTS (SELECT 1 FROM ROOM_OCCUPANCY WHERE room_no = OLD.room_no AND current_occupancy > 0) THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Room has occupants; move them before changing its hostel';
+    END IF;
+END //
+
+DELIMITER ;
@@ -0,0 +1,127 @@
+import os
+
+import db
+from frames import native
+from schema import catalog
+
+DEFAULT_PAGE_SIZE = int(os.getenv("PAGE_SIZE", 50))
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Paginated table views: the unique key used as keyset tiebreaker and the
+# SELECT that produces their rows. `alias` qualifies key/sort columns
+# inside `select`. Views with a `scope` column can be limited to one
+# hostel; `count_metric` is their per-hostel row count in DASHBOARD_STATS.
+TABLE_VIEWS = {
+    "STUDENT": {
+        "key": "student_id",
+        "select": "SELECT * FROM STUDENT",
+        "scope": "hostel_id",
+        "count_metric": "students",
+    },
+    "ROOM": {
+        "key": "room_no",
+        # Occupants come from the trigger-maintained ROOM_OCCUPANCY row, one
+        # primary key lookup per page row
+        "select": """
+            SELECT r.*, COALESCE(ro.current_occupancy, 0) AS occupants
+            FROM ROOM r
+            LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+        """,
+        "alias": "r",
+        "scope": "hostel_id",
+        "count_metric": "rooms",
+    },
+    "EMPLOYEE": {
+        "key": "emp_id",
+        "select": "SELECT * FROM EMPLOYEE",
+    },
+}
+
+
+def is_scoped(table):
+    return "scope" in TABLE_VIEWS[table]
+
+
+def sortable_columns(table, hostel_id=None):
+    # Only columns that lead an index can be sorted on without a filesort;
+    # within one hostel, columns that follow the scope column in an index
+    view = TABLE_VIEWS[table]
+    after = [view["scope"]] if hostel_id is not None and is_scoped(table) else []
+    return [view["key"]] + [column for column in catalog.leading_columns(table, after) if column != view["key"]]
+
+
+def _column(view, name):
+    return f"{view['alias']}.{name}" if view.get("alias") else name
+
+
+def _seek_condition(view, sort, descending, after):
+    # Rows strictly after `after` = (sort value, key value) in the page order.
+    # MySQL sorts NULLs first ascending and last descending.
+    key = _column(view, view["key"])
+    op = "<" if descending else ">"
+    sort_value, key_value = after
+    if sort == view["key"]:
+        return f"{key} {op} %s", [key_value]
+
+    col = _column(view, sort)
+    if sort_value is None:
+        condition = f"(({col} IS NULL AND {key} {op} %s) OR {col} IS NOT NULL)"
+        if descending:
+            condition = f"({col} IS NULL AND {key} {op} %s)"
+        return condition, [key_value]
+
+    condition = f"({col} {op} %s OR ({col} = %s AND {key} {op} %s))"
+    if descending:
+        condition = f"({col} {op} %s OR ({col} = %s AND {key} {op} %s) OR {col} IS NULL)"
+    return condition, [sort_value, sort_value, key_value]
+
+
+def fetch_page(table, sort=None, descending=False, after=None, page_size=DEFAULT_PAGE_SIZE, hostel_id=None):
+    # Returns (rows, cursor): rows is a typed DataFrame (db.fetch_frame) and
+    # cursor is passed as `after` for the next page, or None on the last page.
+    # With `hostel_id`, scoped views only read that hostel's index range.
+    view = TABLE_VIEWS[table]
+    sort = sort or view["key"]
+    if sort not in sortable_columns(table, hostel_id):
+        raise ValueError(f"{table} cannot be sorted by {sort}")
+
+    conditions = []
+    params = []
+    if hostel_id is not None and is_scoped(table):
+        conditions.append(f"{_column(view, view['scope'])} = %s")
+        params.append(hostel_id)
+    if after is not None:
+        condition, seek_params = _seek_condition(view, sort, descending, after)
+        conditions.append(condition)
+        params += seek_params
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    direction = "DESC" if descending else "ASC"
+    order = [f"{_column(view, sort)} {direction}"]
+    if sort != view["key"]:
+        order.append(f"{_column(view, view['key'])} {direction}")
+
+    # One extra row tells us whether another page follows
+    query = f"{view['select'].strip()}{where} ORDER BY {', '.join(order)} LIMIT %s"
+    rows = db.fetch_frame(query, params + [page_size + 1])
+
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows.iloc[:page_size]
+    last = rows.iloc[-1]
+    return rows, (native(last[sort]), native(last[view["key"]]))
+
+
+def approximate_count(table, hostel_id=None):
+    # The backend's estimate (InnoDB's statistics on MySQL): no scan, but may
+    # be off by a few percent. One hostel's count is its trigger-maintained
+    # DASHBOARD_STATS counter.
+    view = TABLE_VIEWS[table]
+    if hostel_id is not None and is_scoped(table):
+        rows = db.run_query(
+            "SELECT value AS count FROM DASHBOARD_STATS WHERE hostel_id = %s AND metric = %s AND dimension = ''",
+            (hostel_id, view["count_metric"]),
+        )
+        return rows[0]["count"] if rows else 0
+    rows = db.run_query(*db.get_backend().approximate_count_query(table))
+    return rows[0]["count"] if rows else None
@@ -0,0 +1,27 @@
+#!/usr/bin/env bash
+# Copies the primary (db) to the replica (db_replica) and starts replication.
+# Run after: docker compose --profile replica up -d db db_replica
+set -euo pipefail
+
+ROOT_PASSWORD=${ROOT_PASSWORD:-root_password}
+REPL_PASSWORD=${REPL_PASSWORD:-repl_password}
+APP_USER=${APP_USER:-user}
+
+primary() { docker compose exec -T db mariadb -uroot -p"$ROOT_PASSWORD" "$@"; }
+replica() { docker compose --profile replica exec -T db_replica mariadb -uroot -p"$ROOT_PASSWORD" "$@"; }
+
+# Replication account on the primary; the app user may read replica status
+primary -e "CREATE USER IF NOT EXISTS 'repl'@'%' IDENTIFIED BY '$REPL_PASSWORD';
+            GRANT REPLICATION SLAVE ON *.* TO 'repl'@'%';"
+replica -e "GRANT SLAVE MONITOR ON *.* TO '$APP_USER'@'%';"
+
+# Consistent snapshot; --gtid --master-data records the position to start from
+replica -e "STOP SLAVE; RESET SLAVE ALL;" || true
+docker compose exec -T db mariadb-dump -uroot -p"$ROOT_PASSWORD" \
+    --databases HostelManagement --routines --triggers --single-transaction --gtid --master-data=1 \
+    | replica
+
+replica -e "CHANGE MASTER TO MASTER_HOST='db', MASTER_PORT=3306, MASTER_USER='repl',
+                MASTER_PASSWORD='$REPL_PASSWORD', MASTER_USE_GTID=slave_pos;
+            START SLAVE;"
+replica -e "SHOW SLAVE STATUS\G" | grep -E "Slave_(IO|SQL)_Running:|Seconds_Behind_Master"
@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+import traceback
+from datetime import date, datetime, timedelta
+
+from dotenv import load_dotenv
+
+import db
+import metrics
+
+load_dotenv()
+
+# Seconds between occupancy reconciliations; 0 turns the job off
+RECONCILE_INTERVAL = float(os.getenv("RECONCILE_INTERVAL", 300))
+# Seconds between checks that FEE has partitions for the coming terms
+FEE_PARTITION_INTERVAL = float(os.getenv("FEE_PARTITION_INTERVAL", 86400))
+# How many days ahead of today those partitions must reach
+FEE_PARTITION_AHEAD_DAYS = int(os.getenv("FEE_PARTITION_AHEAD_DAYS", 365))
+
+
+class Scheduler:
+    # Runs jobs every `interval` seconds from one daemon thread. A job that
+    # raises is recorded and tried again at its next run; jobs never overlap.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.jobs = {}  # name -> {"interval", "func", "next_run", "last_run", ...}
+
+    def add(self, name, interval, func, delay=None):
+        # The first run comes after `delay` seconds (default: one interval)
+        with self._lock:
+            self.jobs[name] = {
+                "interval": interval,
+                "func": func,
+                "next_run": time.monotonic() + (interval if delay is None else delay),
+                "runs": 0,
+                "failures": 0,
+                "last_run": None,
+                "last_seconds": None,
+                "last_result": None,
+                "last_error": None,
+            }
+        self._wake.set()
+
+    def run_now(self, name):
+        # Runs the job in the calling thread and returns its result
+        job = self.jobs[name]
+        started = time.perf_counter()
+        try:
+            result = job["func"]()
+        except Exception as e:
+            with self._lock:
+                job["failures"] += 1
+                job["last_error"] = f"{type(e).__name__}: {e}"
+            metrics.registry.increment("job_failures", job=name)
+            raise
+        else:
+            with self._lock:
+                job["last_result"] = result
+                job["last_error"] = None
+            return result
+        finally:
+            seconds = time.perf_counter() - started
+            metrics.registry.observe_function("job", name, seconds)
+            with self._lock:
+                job["runs"] += 1
+                job["last_run"] = datetime.now().isoformat(timespec="seconds")
+                job["last_seconds"] = round(seconds, 3)
+                job["next_run"] = time.monotonic() + job["interval"]
+
+    def _due(self):
+        now = time.monotonic()
+        with self._lock:
+            due = [name for name, job in self.jobs.items() if job["next_run"] <= now]
+            upcoming = min((job["next_run"] for job in self.jobs.values()), default=now + 60)
+        return due, max(upcoming - now, 0)
+
+    def _loop(self):
+        while True:
+            due, wait = self._due()
+            for name in due:
+                try:
+                    self.run_now(name)
+                except Exception:
+                    traceback.print_exc()
+            if not due:
+                self._wake.wait(wait)
+                self._wake.clear()
+
+    def start(self):
+        # Later calls reuse the running thread
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+                self._thread.start()
+        return self
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "job": name,
+                    "every_s": job["interval"],
+                    "runs": job["runs"],
+                    "failures": job["failures"],
+                    "last_run": job["last_run"],
+                    "last_s": job["last_seconds"],
+                    "last_result": None if job["last_result"] is None else str(job["last_result"]),
+                    "last_error": job["last_error"],
+                    "next_in_s": round(max(job["next_run"] - now, 0), 1),
+                }
+                for name, job in self.jobs.items()
+            ]
+
+
+def reconcile_occupancy():
+    # Repairs ROOM_OCCUPANCY rows that drifted from the students in each room
+    rows = db.call_procedure("reconcile_occupancy")
+    result = rows[0] if rows else {"missing": 0, "corrected": 0}
+    metrics.registry.increment("occupancy_rows_repaired", int(result["missing"]), kind="missing")
+    metrics.registry.increment("occupancy_rows_repaired", int(result["corrected"]), kind="corrected")
+    return {"missing": int(result["missing"]), "corrected": int(result["corrected"])}
+
+
+def add_fee_partitions():
+    # Keeps new fees out of FEE's catch-all p_future partition
+    rows = db.call_procedure("add_fee_partitions", [date.today() + timedelta(days=FEE_PARTITION_AHEAD_DAYS)])
+    return {"added": int(rows[0]["added"]) if rows else 0}
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    # One scheduler per process with the configured jobs, started on first use
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+            router = db.get_router()
+            if router.replicas:
+                _scheduler.add("check_replicas", router.check_interval, router.check_all, delay=0)
+            if RECONCILE_INTERVAL > 0:
+                _scheduler.add("reconcile_occupancy", RECONCILE_INTERVAL, reconcile_occupancy)
+            if FEE_PARTITION_INTERVAL > 0:
+                _scheduler.add("add_fee_partitions", FEE_PARTITION_INTERVAL, add_fee_partitions, delay=0)
+            _scheduler.start()
+        return _scheduler
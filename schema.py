@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+
+import db
+
+# Seconds between checks of the database catalog for DDL changes
+SCHEMA_CHECK_INTERVAL = float(os.getenv("SCHEMA_CHECK_INTERVAL", 60))
+
+
+def _schema_version():
+    row = db.execute(db.get_backend().VERSION_QUERY)[0]
+    return row["tables"], row["changed"]
+
+
+class SchemaCatalog:
+    def __init__(self, check_interval=SCHEMA_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._tables = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self):
+        version = _schema_version()
+        tables = {}
+        for row in db.execute(db.get_backend().CATALOG_QUERY):
+            table = tables.setdefault(row["table_name"], {"columns": {}, "indexes": {}})
+            if row["kind"] == "column":
+                table["columns"][row["column_name"]] = row["detail"]
+            else:
+                index = table["indexes"].setdefault(row["index_name"], {
+                    "columns": [],
+                    "type": row["detail"],
+                    "unique": not int(row["non_unique"]),
+                })
+                index["columns"].append(row["column_name"])
+        with self._lock:
+            self._tables = tables
+            self._version = version
+            self._checked_at = time.monotonic()
+        return tables
+
+    def invalidate(self):
+        with self._lock:
+            self._tables = None
+
+    def _fresh_tables(self):
+        with self._lock:
+            tables = self._tables
+            due = time.monotonic() - self._checked_at >= self.check_interval
+        if tables is None:
+            tables = self.load()
+        elif due:
+            with self._lock:
+                self._checked_at = time.monotonic()
+            if _schema_version() != self._version:
+                tables = self.load()
+        return tables
+
+    def tables(self):
+        return list(self._fresh_tables())
+
+    def table(self, table):
+        tables = self._fresh_tables()
+        if table not in tables:
+            raise ValueError(f"Unknown table: {table}")
+        return tables[table]
+
+    def columns(self, table):
+        # Column name -> data type, in table order
+        return self.table(table)["columns"]
+
+    def indexes(self, table):
+        return self.table(table)["indexes"]
+
+    def leading_columns(self, table, after=()):
+        # Columns a B-tree index can seek and sort on by themselves or, with
+        # `after`, once the columns in `after` are fixed by equality
+        after = list(after)
+        return list(dict.fromkeys(
+            index["columns"][len(after)]
+            for index in self.indexes(table).values()
+            if index["type"] == "BTREE" and index["columns"][:len(after)] == after
+            and len(index["columns"]) > len(after)
+        ))
+
+    def fulltext_columns(self, table):
+        for index in self.indexes(table).values():
+            if index["type"] == "FULLTEXT":
+                return index["columns"]
+        return None
+
+
+catalog = SchemaCatalog()
@@ -0,0 +1,97 @@
+import os
+import re
+
+import db
+from schema import catalog
+
+SEARCH_LIMIT = int(os.getenv("SEARCH_LIMIT", 50))
+
+# Tables that may be searched at all
+SEARCHABLE_TABLES = ["STUDENT", "ROOM", "FEE", "EMPLOYEE", "HOSTEL_SERVICE", "HOSTEL", "ROOM_OCCUPANCY"]
+
+# Pseudo-column offered by the search UI for a ranked FULLTEXT search
+ALL_TEXT = "All text fields"
+
+# InnoDB ignores shorter words in FULLTEXT indexes (innodb_ft_min_token_size);
+# they are left out on every backend so results do not depend on it
+FT_MIN_TOKEN_SIZE = int(os.getenv("FT_MIN_TOKEN_SIZE", 3))
+
+NUMERIC_TYPES = {"tinyint", "smallint", "mediumint", "int", "bigint", "decimal", "float", "double"}
+
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+
+def table_columns(table):
+    if table not in SEARCHABLE_TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    return catalog.columns(table)
+
+
+def fulltext_columns(table):
+    return catalog.fulltext_columns(table)
+
+
+def _scope(table, hostel_id):
+    # Extra WHERE terms limiting a search to one hostel, for tables that
+    # have a hostel_id column; other tables are shared by all hostels
+    if hostel_id is None or "hostel_id" not in catalog.columns(table):
+        return "", []
+    return " AND hostel_id = %s", [hostel_id]
+
+
+def escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _words(value):
+    # The words to search for, without full-text query operators
+    words = _BOOLEAN_OPERATORS.sub(" ", value).split()
+    return [w for w in words if len(w) >= FT_MIN_TOKEN_SIZE]
+
+
+def fulltext_search(table, value, limit=SEARCH_LIMIT, hostel_id=None):
+    # Every word must appear, each matched as a word prefix
+    columns = fulltext_columns(table)
+    words = _words(value)
+    if not words:
+        # Only words too short for the index; fall back to a prefix match
+        return prefix_search(table, columns[0], value, limit, hostel_id)
+    scope, scope_params = _scope(table, hostel_id)
+    return db.run_query(*db.get_backend().fulltext_query(table, columns, words, scope, scope_params, limit))
+
+
+def prefix_search(table, column, value, limit=SEARCH_LIMIT, hostel_id=None):
+    # A LIKE without a leading wildcard is a range scan on an index on
+    # `column`, or on (hostel_id, `column`) within one hostel
+    scope, scope_params = _scope(table, hostel_id)
+    return db.run_query(
+        f"SELECT * FROM {table} WHERE {column} LIKE %s{scope} ORDER BY {column} LIMIT %s",
+        [escape_like(value) + "%"] + scope_params + [limit],
+    )
+
+
+def exact_search(table, column, value, limit=SEARCH_LIMIT, hostel_id=None):
+    try:
+        float(value)
+    except ValueError:
+        # MySQL would coerce the text to 0 and match unrelated rows
+        return []
+    scope, scope_params = _scope(table, hostel_id)
+    return db.run_query(f"SELECT * FROM {table} WHERE {column} = %s{scope} LIMIT %s",
+                        [value] + scope_params + [limit])
+
+
+def search(table, column, value, limit=SEARCH_LIMIT, hostel_id=None):
+    # With `hostel_id`, tables that have that column only match its rows
+    value = value.strip()
+    if column == ALL_TEXT:
+        if not fulltext_columns(table):
+            raise ValueError(f"{table} has no full-text index")
+        return fulltext_search(table, value, limit, hostel_id)
+
+    columns = table_columns(table)
+    if column not in columns:
+        raise ValueError(f"Unknown column {column} in {table}")
+    if columns[column] in NUMERIC_TYPES:
+        return exact_search(table, column, value, limit, hostel_id)
+    return prefix_search(table, column, value, limit, hostel_id)
@@ -0,0 +1,704 @@
+import calendar
+import functools
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from dotenv import load_dotenv
+from mysql.connector import FieldType, errors
+
+load_dotenv()
+
+# The database file, created with the schema and sample data of
+# sqlite_commands.sql on first use. Every pooled connection opens the same
+# file, so it cannot be ":memory:".
+SQLITE_PATH = os.getenv("SQLITE_PATH", "hostel.db")
+# Seconds a statement waits for another connection's write to finish
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", 10))
+
+SCHEMA_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sqlite_commands.sql")
+
+# Rows read ahead of a result to tell its column types, which SQLite does
+# not report for a result column
+PEEK_ROWS = 100
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_ISO_DATETIME = re.compile(r"^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d+)?$")
+
+
+def _to_date(value):
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _add(value, amount, unit):
+    # DATE_ADD(value, INTERVAL amount unit); months past the end of the
+    # shorter month end on its last day, as in MySQL
+    day = _to_date(value)
+    if day is None or amount is None:
+        return None
+    unit = unit.upper()
+    if unit == "DAY":
+        return (day + timedelta(days=amount)).isoformat()
+    months = day.month - 1 + amount * (12 if unit == "YEAR" else 1)
+    year, month = day.year + months // 12, months % 12 + 1
+    return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1])).isoformat()
+
+
+def _text(value):
+    # CONCAT's text for a value: FLOAT columns without a fraction print as
+    # integers, like MySQL does
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _concat(*values):
+    if any(value is None for value in values):
+        return None
+    return "".join(_text(value) for value in values)
+
+
+# The MySQL functions the app's queries use: (name, arguments, function, deterministic)
+FUNCTIONS = [
+    ("CURDATE", 0, lambda: date.today().isoformat(), False),
+    ("DATEDIFF", 2, lambda a, b: None if a is None or b is None else (_to_date(a) - _to_date(b)).days, True),
+    ("DAYOFMONTH", 1, lambda d: None if d is None else _to_date(d).day, True),
+    ("DATE_ADD", 3, lambda d, amount, unit: _add(d, amount, unit), True),
+    ("DATE_SUB", 3, lambda d, amount, unit: _add(d, None if amount is None else -amount, unit), True),
+    ("CONCAT", -1, _concat, True),
+]
+
+# Dates are stored as ISO text. The schema has no DATETIME columns, so a
+# midnight datetime (a date edited in a grid) is stored as its date, which
+# is what MySQL does with it in a DATE column.
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" ") if value.time() else value.date().isoformat())
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()[:10]))
+
+
+# MySQL syntax rewritten for SQLite, in order
+_REWRITES = [
+    # DATE_SUB(d, INTERVAL n DAY) -> DATE_SUB(d, n, 'DAY')
+    (re.compile(r"\bINTERVAL\s+(.+?)\s+(DAY|MONTH|YEAR)\s*\)", re.IGNORECASE), r"\1, '\2')"),
+    # Locking reads: writers take the whole database (BEGIN IMMEDIATE) instead
+    (re.compile(r"\s+(FOR\s+UPDATE|LOCK\s+IN\s+SHARE\s+MODE)\b", re.IGNORECASE), ""),
+    # search.escape_like escapes with a backslash, MySQL's default
+    (re.compile(r"\bLIKE\s+%s", re.IGNORECASE), lambda m: "LIKE %s ESCAPE '\\'"),
+    (re.compile(r"<=>"), " IS "),
+    (re.compile(r"^\s*ANALYZE\s+TABLE\b", re.IGNORECASE), "ANALYZE"),
+    # Only used on an emptied table: forget its last id
+    (re.compile(r"^\s*ALTER\s+TABLE\s+`?(\w+)`?\s+AUTO_INCREMENT\s*=\s*\d+\s*$", re.IGNORECASE),
+     r"DELETE FROM sqlite_sequence WHERE name = '\1'"),
+    (re.compile(r"%s"), "?"),
+]
+
+_CALL = re.compile(r"^\s*CALL\s+`?(\w+)`?\s*(?:\((.*)\))?\s*;?\s*$", re.IGNORECASE | re.DOTALL)
+
+
+@functools.lru_cache(maxsize=1024)
+def translate(query):
+    for pattern, replacement in _REWRITES:
+        query = pattern.sub(replacement, query)
+    return query
+
+
+@contextmanager
+def _errors():
+    # SQLite errors raised as the mysql.connector errors callers catch
+    try:
+        yield
+    except sqlite3.IntegrityError as e:
+        message = str(e)
+        if "constraint failed" not in message:
+            # A trigger's RAISE(ABORT, message), SQLite's SIGNAL
+            raise _signal(message) from e
+        errno = 1452 if "FOREIGN KEY" in message else 1062 if "UNIQUE" in message else 1048 if "NOT NULL" in message else None
+        raise errors.IntegrityError(msg=message, errno=errno, sqlstate="23000") from e
+    except sqlite3.OperationalError as e:
+        message = str(e)
+        if "locked" in message or "busy" in message:
+            raise errors.OperationalError(msg=message, errno=1205, sqlstate="HY000") from e
+        raise errors.ProgrammingError(msg=message, sqlstate="42000") from e
+    except (sqlite3.ProgrammingError, sqlite3.InterfaceError) as e:
+        raise errors.ProgrammingError(msg=str(e)) from e
+    except sqlite3.Error as e:
+        raise errors.DatabaseError(msg=str(e)) from e
+
+
+def _signal(message):
+    # SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = message
+    return errors.DatabaseError(msg=message, errno=1644, sqlstate="45000")
+
+
+def _column_type(values):
+    # (FieldType, convert) for a column from its first values; `convert`
+    # turns the ISO text SQLite returns for computed dates into dates
+    values = [v for v in values if v is not None]
+    if any(isinstance(v, float) for v in values):
+        return FieldType.DOUBLE, None
+    if values and all(isinstance(v, int) for v in values):
+        return FieldType.LONGLONG, None
+    if values and all(isinstance(v, datetime) for v in values):
+        return FieldType.DATETIME, None
+    if values and all(isinstance(v, date) for v in values):
+        return FieldType.DATE, None
+    if values and all(isinstance(v, str) and _ISO_DATE.match(v) for v in values):
+        return FieldType.DATE, _to_date
+    if values and all(isinstance(v, str) and _ISO_DATETIME.match(v) for v in values):
+        return FieldType.DATETIME, datetime.fromisoformat
+    return FieldType.VAR_STRING, None
+
+
+class _Result:
+    # One statement's rows, read like a mysql.connector cursor: tuples or
+    # dicts, with a description carrying mysql FieldType codes
+    def __init__(self, raw, dictionary):
+        self._raw = raw
+        self._dictionary = dictionary
+        with _errors():
+            self._peeked = raw.fetchmany(PEEK_ROWS)
+        self._names = [column[0] for column in raw.description]
+        types = [_column_type([row[i] for row in self._peeked]) for i in range(len(self._names))]
+        self._converters = [(i, convert) for i, (_, convert) in enumerate(types) if convert]
+        self.description = [(name, type_code, None, None, None, None, True)
+                            for name, (type_code, _) in zip(self._names, types)]
+
+    def _rows(self, rows):
+        if self._converters:
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for i, convert in self._converters:
+                    if isinstance(row[i], str):
+                        row[i] = convert(row[i])
+            rows = [tuple(row) for row in rows]
+        if self._dictionary:
+            return [dict(zip(self._names, row)) for row in rows]
+        return rows
+
+    def fetchmany(self, size=1):
+        rows, self._peeked = self._peeked[:size], self._peeked[size:]
+        if len(rows) < size:
+            with _errors():
+                rows += self._raw.fetchmany(size - len(rows))
+        return self._rows(rows)
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchall(self):
+        rows, self._peeked = self._peeked, []
+        with _errors():
+            rows += self._raw.fetchall()
+        return self._rows(rows)
+
+    def close(self):
+        self._raw.close()
+
+
+class SQLiteCursor:
+    # The parts of a mysql.connector cursor the app uses, including CALL
+    # and callproc() for the procedures ported to Python below
+    def __init__(self, connection, dictionary=False):
+        self._connection = connection
+        self._dictionary = dictionary
+        self._result = None
+        self._pending = []
+        self._stored = []
+        self.rowcount = -1
+        self.lastrowid = None
+
+    @property
+    def description(self):
+        return self._result.description if self._result else None
+
+    def _set_results(self, results, rowcount=-1):
+        self._close_results()
+        self._result, self._pending = (results[0], results[1:]) if results else (None, [])
+        self.rowcount = rowcount
+
+    def execute(self, query, params=None):
+        call = _CALL.match(query)
+        if call:
+            self.callproc(call.group(1), self._call_args(call.group(2), params))
+            # Like a CALL through mysql.connector: the cursor reads the first
+            # result set and nextset() moves on to the next
+            self._set_results(self._stored)
+            self._stored = []
+            return
+        raw = self._connection._db.cursor()
+        with _errors():
+            raw.execute(translate(query), tuple(params or ()))
+        if raw.description is None:
+            self._set_results([], raw.rowcount)
+            self.lastrowid = raw.lastrowid
+            raw.close()
+        else:
+            self._set_results([_Result(raw, self._dictionary)])
+
+    def _call_args(self, args, params):
+        # The argument list of a CALL statement, evaluated with its parameters
+        if not args or not args.strip():
+            return []
+        with _errors():
+            return list(self._connection._db.execute(f"SELECT {translate(args)}", tuple(params or ())).fetchone())
+
+    def executemany(self, query, seq_params):
+        raw = self._connection._db.cursor()
+        with _errors():
+            raw.executemany(translate(query), [tuple(params) for params in seq_params])
+        self._set_results([], raw.rowcount)
+        raw.close()
+
+    def callproc(self, procname, args=()):
+        if procname not in PROCEDURES:
+            raise errors.ProgrammingError(msg=f"PROCEDURE {procname} does not exist", errno=1305, sqlstate="42000")
+        db = self._connection._db
+        with _errors():
+            statements = PROCEDURES[procname](db, *args)
+        results = []
+        for query, params in statements:
+            raw = db.cursor()
+            with _errors():
+                raw.execute(query, params)
+            results.append(_Result(raw, self._dictionary))
+        self._stored = results
+        return args
+
+    def stored_results(self):
+        return iter(self._stored)
+
+    def nextset(self):
+        if not self._pending:
+            self._set_results([])
+            return None
+        self._result.close()
+        self._result, self._pending = self._pending[0], self._pending[1:]
+        return True
+
+    def fetchone(self):
+        return self._result.fetchone() if self._result else None
+
+    def fetchmany(self, size=1):
+        return self._result.fetchmany(size) if self._result else []
+
+    def fetchall(self):
+        return self._result.fetchall() if self._result else []
+
+    def _close_results(self):
+        for result in [self._result] + self._pending:
+            if result is not None:
+                result.close()
+
+    def close(self):
+        self._close_results()
+        self._result, self._pending, self._stored = None, [], []
+
+
+_init_lock = threading.Lock()
+
+
+def _open(path, timeout):
+    db = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False,
+                         detect_types=sqlite3.PARSE_DECLTYPES)
+    # WAL lets readers run while one connection writes; NORMAL only syncs
+    # at checkpoints, which WAL keeps safe against corruption
+    db.execute("PRAGMA journal_mode = WAL")
+    db.execute("PRAGMA synchronous = NORMAL")
+    db.execute("PRAGMA foreign_keys = ON")
+    for name, arguments, func, deterministic in FUNCTIONS:
+        db.create_function(name, arguments, func, deterministic=deterministic)
+    with _init_lock:
+        if not db.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]:
+            with open(SCHEMA_SCRIPT) as f:
+                db.executescript(f.read())
+    return db
+
+
+class SQLiteConnection:
+    # The parts of a mysql.connector connection the pool and callers use.
+    # Outside start_transaction() every statement commits by itself, like
+    # the pool's autocommit MySQL connections.
+    def __init__(self, path=SQLITE_PATH, timeout=SQLITE_BUSY_TIMEOUT):
+        self._path = path
+        self._timeout = timeout
+        with _errors():
+            self._db = _open(path, timeout)
+        self.unread_result = False
+
+    def cursor(self, dictionary=False, buffered=None):
+        return SQLiteCursor(self, dictionary)
+
+    @property
+    def in_transaction(self):
+        return self._db.in_transaction
+
+    def start_transaction(self):
+        # Takes the write lock at once, as the locking reads that follow
+        # would on MySQL
+        with _errors():
+            self._db.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        if self._db.in_transaction:
+            with _errors():
+                self._db.execute("COMMIT")
+
+    def rollback(self):
+        if self._db.in_transaction:
+            with _errors():
+                self._db.execute("ROLLBACK")
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        with _errors():
+            self._db.execute("SELECT 1")
+
+    def reconnect(self, attempts=1, delay=0):
+        try:
+            self._db.close()
+        except sqlite3.Error:
+            pass
+        with _errors():
+            self._db = _open(self._path, self._timeout)
+
+    def consume_results(self):
+        pass
+
+    def close(self):
+        self._db.close()
+
+
+# Procedures of commands.sql ported to Python. Each takes the sqlite3
+# connection and the CALL arguments, makes its writes, and returns its
+# result sets as (query, params) pairs.
+
+@contextmanager
+def _transaction(db):
+    # START TRANSACTION ... COMMIT, or a savepoint inside a caller's
+    # transaction. BEGIN IMMEDIATE takes the write lock up front, which is
+    # what the procedures' locking reads were for.
+    if db.in_transaction:
+        db.execute("SAVEPOINT proc")
+        try:
+            yield
+        except BaseException:
+            db.execute("ROLLBACK TO proc")
+            db.execute("RELEASE proc")
+            raise
+        db.execute("RELEASE proc")
+        return
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
+
+
+def add_student_to_room(db, student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no):
+    with _transaction(db):
+        room = db.execute("""
+            SELECT r.capacity, COALESCE(ro.current_occupancy, 0), r.hostel_id
+            FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+            WHERE r.room_no = ?
+        """, (room_no,)).fetchone()
+        capacity, occupancy, room_hostel = room or (None, None, None)
+        if capacity is None:
+            raise _signal("Room does not exist")
+        if room_hostel is not None and room_hostel != hostel_id:
+            raise _signal("Room belongs to another hostel")
+        if occupancy >= capacity:
+            raise _signal("Room is already full")
+        db.execute("""
+            INSERT INTO STUDENT (student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no))
+    return []
+
+
+def allocate_intake(db, strict=False):
+    # The two passes of commands.sql's allocate_intake over the same
+    # temporary tables
+    with _transaction(db):
+        for table in ("free_bed", "spare_bed", "intake_rank", "waiting"):
+            db.execute(f"DROP TABLE IF EXISTS temp.{table}")
+
+        db.execute("""
+            CREATE TEMP TABLE free_bed (
+                hostel_id INT,
+                room_no INT,
+                type VARCHAR(50) NOT NULL COLLATE NOCASE,
+                type_rank INT,
+                taken BOOLEAN NOT NULL DEFAULT FALSE,
+                PRIMARY KEY (hostel_id, type, type_rank)
+            )
+        """)
+        db.execute("""
+            WITH RECURSIVE slot(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM slot WHERE n < 100)
+            INSERT INTO free_bed (hostel_id, room_no, type, type_rank)
+            SELECT COALESCE(r.hostel_id, 0), r.room_no, COALESCE(r.type, ''),
+                   ROW_NUMBER() OVER (PARTITION BY COALESCE(r.hostel_id, 0), COALESCE(r.type, '') ORDER BY r.room_no, slot.n)
+            FROM ROOM r
+            LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+            JOIN slot ON slot.n <= r.capacity - COALESCE(ro.current_occupancy, 0)
+        """)
+
+        # Pass 1: preferred room type
+        db.execute("UPDATE STUDENT_INTAKE SET room_no = NULL")
+        db.execute("""
+            CREATE TEMP TABLE intake_rank (
+                student_id VARCHAR(10) PRIMARY KEY COLLATE NOCASE,
+                hostel_id INT,
+                preferred_type VARCHAR(50) COLLATE NOCASE,
+                type_rank INT
+            )
+        """)
+        db.execute("""
+            INSERT INTO intake_rank
+            SELECT student_id, COALESCE(hostel_id, 0), preferred_type,
+                   ROW_NUMBER() OVER (PARTITION BY COALESCE(hostel_id, 0), preferred_type ORDER BY student_id)
+            FROM STUDENT_INTAKE
+            WHERE preferred_type IS NOT NULL
+        """)
+        db.execute("""
+            UPDATE STUDENT_INTAKE SET room_no = b.room_no
+            FROM intake_rank k
+            JOIN free_bed b ON b.hostel_id = k.hostel_id AND b.type = k.preferred_type AND b.type_rank = k.type_rank
+            WHERE k.student_id = STUDENT_INTAKE.student_id
+        """)
+        db.execute("""
+            UPDATE free_bed SET taken = TRUE
+            FROM (
+                SELECT COALESCE(hostel_id, 0) AS hostel_id, preferred_type, COUNT(*) AS assigned
+                FROM STUDENT_INTAKE
+                WHERE room_no IS NOT NULL
+                GROUP BY COALESCE(hostel_id, 0), preferred_type
+            ) a
+            WHERE a.hostel_id = free_bed.hostel_id AND a.preferred_type = free_bed.type
+              AND free_bed.type_rank <= a.assigned
+        """)
+
+        # Pass 2: any remaining bed in the hostel
+        db.execute("CREATE TEMP TABLE spare_bed (hostel_id INT, room_no INT, bed_rank INT, PRIMARY KEY (hostel_id, bed_rank))")
+        db.execute("""
+            INSERT INTO spare_bed
+            SELECT hostel_id, room_no, ROW_NUMBER() OVER (PARTITION BY hostel_id ORDER BY room_no, type_rank)
+            FROM free_bed
+            WHERE NOT taken
+        """)
+        db.execute("CREATE TEMP TABLE waiting (student_id VARCHAR(10) PRIMARY KEY COLLATE NOCASE, hostel_id INT, bed_rank INT)")
+        db.execute("""
+            INSERT INTO waiting
+            SELECT student_id, COALESCE(hostel_id, 0),
+                   ROW_NUMBER() OVER (PARTITION BY COALESCE(hostel_id, 0) ORDER BY student_id)
+            FROM STUDENT_INTAKE
+            WHERE room_no IS NULL AND (preferred_type IS NULL OR NOT ?)
+        """, (bool(strict),))
+        db.execute("""
+            UPDATE STUDENT_INTAKE SET room_no = s.room_no
+            FROM waiting w
+            JOIN spare_bed s ON s.hostel_id = w.hostel_id AND s.bed_rank = w.bed_rank
+            WHERE w.student_id = STUDENT_INTAKE.student_id
+        """)
+
+        allocated = db.execute("""
+            INSERT INTO STUDENT (student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no)
+            SELECT student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no
+            FROM STUDENT_INTAKE
+            WHERE room_no IS NOT NULL
+        """).rowcount
+        db.execute("DELETE FROM STUDENT_INTAKE WHERE room_no IS NOT NULL")
+        for table in ("free_bed", "spare_bed", "intake_rank", "waiting"):
+            db.execute(f"DROP TABLE temp.{table}")
+
+    return [("SELECT ? AS allocated, COUNT(*) AS unallocated FROM STUDENT_INTAKE", (allocated,))]
+
+
+def rebuild_dashboard_stats(db):
+    with _transaction(db):
+        db.execute("DELETE FROM DASHBOARD_STATS")
+        db.execute("""
+            INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+            SELECT COALESCE(hostel_id, 0), 'students', '', COUNT(*) FROM STUDENT GROUP BY COALESCE(hostel_id, 0)
+            UNION ALL
+            SELECT COALESCE(hostel_id, 0), 'rooms', '', COUNT(*) FROM ROOM GROUP BY COALESCE(hostel_id, 0)
+            UNION ALL
+            SELECT COALESCE(r.hostel_id, 0), 'available_rooms', '', COUNT(*)
+            FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+            WHERE COALESCE(ro.current_occupancy, 0) < r.capacity
+            GROUP BY COALESCE(r.hostel_id, 0)
+            UNION ALL
+            SELECT COALESCE(hostel_id, 0), 'rooms_by_type', COALESCE(type, ''), COUNT(*)
+            FROM ROOM GROUP BY COALESCE(hostel_id, 0), type
+            UNION ALL
+            SELECT COALESCE(hostel_id, 0), 'beds_by_type', COALESCE(type, ''), COALESCE(SUM(capacity), 0)
+            FROM ROOM GROUP BY COALESCE(hostel_id, 0), type
+            UNION ALL
+            SELECT COALESCE(r.hostel_id, 0), 'occupants_by_type', COALESCE(r.type, ''), COALESCE(SUM(ro.current_occupancy), 0)
+            FROM ROOM r JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no GROUP BY COALESCE(r.hostel_id, 0), r.type
+            UNION ALL
+            SELECT COALESCE(s.hostel_id, 0), 'fees_by_status', COALESCE(f.status, ''), COUNT(*)
+            FROM FEE f LEFT JOIN STUDENT s ON s.student_id = f.student_id
+            GROUP BY COALESCE(s.hostel_id, 0), f.status
+        """)
+    return []
+
+
+# GET_LOCK('reconcile_occupancy'): one process serves the app, so a thread
+# lock keeps concurrent calls from overlapping
+_reconcile_lock = threading.Lock()
+
+
+def reconcile_occupancy(db):
+    if not _reconcile_lock.acquire(blocking=False):
+        return [("SELECT 0 AS missing, 0 AS corrected", ())]
+    try:
+        with _transaction(db):
+            missing = db.execute("""
+                INSERT INTO ROOM_OCCUPANCY (room_no, current_occupancy)
+                SELECT r.room_no, 0
+                FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+                WHERE ro.room_no IS NULL
+            """).rowcount
+            corrected = db.execute("""
+                UPDATE ROOM_OCCUPANCY SET current_occupancy = COALESCE(s.occupants, 0)
+                FROM (
+                    SELECT ro.room_no, counted.occupants
+                    FROM ROOM_OCCUPANCY ro
+                    LEFT JOIN (
+                        SELECT room_no, COUNT(*) AS occupants
+                        FROM STUDENT
+                        WHERE room_no IS NOT NULL
+                        GROUP BY room_no
+                    ) counted ON counted.room_no = ro.room_no
+                ) s
+                WHERE s.room_no = ROOM_OCCUPANCY.room_no
+                  AND ROOM_OCCUPANCY.current_occupancy IS NOT COALESCE(s.occupants, 0)
+            """).rowcount
+        if missing + corrected > 0:
+            rebuild_dashboard_stats(db)
+    finally:
+        _reconcile_lock.release()
+    return [("SELECT ? AS missing, ? AS corrected", (missing, corrected))]
+
+
+def add_fee_partitions(db, until=None):
+    # FEE is not partitioned here; idx_fee_due serves due-date ranges
+    return [("SELECT 0 AS added", ())]
+
+
+def get_fee_details(db, status=None, due_from=None, due_to=None, limit=None, offset=None, hostel_id=None):
+    # The same three statements as commands.sql; LIMIT -1 is no limit
+    params = (due_from or "1000-01-01", due_to or "9999-12-31",
+              -1 if limit is None else limit, offset or 0)
+    if hostel_id is not None:
+        # CROSS JOIN keeps STUDENT the outer table: the hostel's students
+        # (idx_student_hostel_room), then their fees (idx_fee_student)
+        return [("""
+            SELECT f.*, s.name AS student_name
+            FROM STUDENT s
+            CROSS JOIN FEE f ON f.student_id = s.student_id
+            WHERE s.hostel_id = ?
+              AND (? IS NULL OR f.status = ?)
+              AND f.due_date BETWEEN ? AND ?
+            ORDER BY f.due_date, f.fee_id
+            LIMIT ? OFFSET ?
+        """, (hostel_id, status, status) + params)]
+    if status is None:
+        return [("""
+            SELECT f.*, s.name AS student_name
+            FROM FEE f
+            JOIN STUDENT s ON s.student_id = f.student_id
+            WHERE f.due_date BETWEEN ? AND ?
+            ORDER BY f.due_date, f.fee_id
+            LIMIT ? OFFSET ?
+        """, params)]
+    return [("""
+        SELECT f.*, s.name AS student_name
+        FROM FEE f
+        JOIN STUDENT s ON s.student_id = f.student_id
+        WHERE f.status = ?
+          AND f.due_date BETWEEN ? AND ?
+        ORDER BY f.due_date, f.fee_id
+        LIMIT ? OFFSET ?
+    """, (status,) + params)]
+
+
+PROCEDURES = {
+    "add_student_to_room": add_student_to_room,
+    "allocate_intake": allocate_intake,
+    "rebuild_dashboard_stats": rebuild_dashboard_stats,
+    "reconcile_occupancy": reconcile_occupancy,
+    "add_fee_partitions": add_fee_partitions,
+    "get_fee_details": get_fee_details,
+}
+
+
+class SQLiteBackend:
+    # An embedded database file in WAL mode: no server to run, for small
+    # sites, tests and benchmarks. See backends.MySQLBackend for the interface.
+    name = "sqlite"
+    # Every connection already reads the one file
+    supports_replicas = False
+
+    # The catalog in the shape of MySQL's: types without their length
+    # (INTEGER as int), an INTEGER PRIMARY KEY (the rowid) as the PRIMARY
+    # index, and each <table>_fts table as a FULLTEXT index on <table>
+    CATALOG_QUERY = """
+        SELECT 'column' AS kind, m.name AS table_name, c.name AS column_name,
+               REPLACE(LOWER(CASE WHEN INSTR(c.type, '(') THEN SUBSTR(c.type, 1, INSTR(c.type, '(') - 1)
+                                  ELSE c.type END), 'integer', 'int') AS detail,
+               c.cid + 1 AS position, NULL AS index_name, NULL AS non_unique
+        FROM sqlite_master m JOIN pragma_table_info(m.name) c
+        WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite\\_%' ESCAPE '\\' AND m.name NOT LIKE '%\\_fts%' ESCAPE '\\'
+        UNION ALL
+        SELECT 'index', m.name, ic.name, 'BTREE', ic.seqno + 1,
+               CASE WHEN il.origin = 'pk' THEN 'PRIMARY' ELSE il.name END, NOT il."unique"
+        FROM sqlite_master m JOIN pragma_index_list(m.name) il JOIN pragma_index_info(il.name) ic
+        WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite\\_%' ESCAPE '\\' AND m.name NOT LIKE '%\\_fts%' ESCAPE '\\'
+        UNION ALL
+        SELECT 'index', m.name, c.name, 'BTREE', 1, 'PRIMARY', 0
+        FROM sqlite_master m JOIN pragma_table_info(m.name) c
+        WHERE m.type = 'table' AND m.name NOT LIKE '%\\_fts%' ESCAPE '\\' AND c.pk = 1 AND UPPER(c.type) = 'INTEGER'
+          AND NOT EXISTS (SELECT 1 FROM pragma_index_list(m.name) WHERE origin = 'pk')
+        UNION ALL
+        SELECT 'index', SUBSTR(m.name, 1, LENGTH(m.name) - 4), c.name, 'FULLTEXT', c.cid + 1, m.name, 1
+        FROM sqlite_master m JOIN pragma_table_info(m.name) c
+        WHERE m.type = 'table' AND m.name LIKE '%\\_fts' ESCAPE '\\' AND m.sql LIKE 'CREATE VIRTUAL TABLE%'
+        ORDER BY table_name, kind, index_name, position
+    """
+
+    # schema_version goes up with every change to the schema
+    VERSION_QUERY = """
+        SELECT COUNT(*) AS tables, (SELECT schema_version FROM pragma_schema_version) AS changed
+        FROM sqlite_master
+        WHERE type = 'table'
+    """
+
+    def connect(self, config):
+        # The MySQL connection settings do not apply
+        return SQLiteConnection()
+
+    def ready_query(self):
+        # Connecting loads the schema, so this is only false for a file left
+        # half-written by an earlier run
+        return "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name = %s", ("after_fee_delete",)
+
+    def approximate_count_query(self, table):
+        # The largest rowid: one index seek, too high by the rows deleted
+        return f"SELECT COALESCE(MAX(rowid), 0) AS count FROM {table}", ()
+
+    def fulltext_query(self, table, columns, words, scope="", scope_params=(), limit=None):
+        # The same search on the table's FTS5 index: every word as a prefix,
+        # ranked by bm25 (lower is better, hence the minus)
+        index = f"{table}_fts"
+        terms = " ".join(f'"{w}"*' for w in words)
+        return (f"SELECT t.*, -bm25({index}) AS score FROM {index} JOIN {table} t ON t.rowid = {index}.rowid "
+                f"WHERE {index} MATCH %s{scope} ORDER BY score DESC LIMIT %s",
+                [terms] + list(scope_params) + [limit])
@@ -0,0 +1,393 @@
+-- commands.sql for the embedded SQLite backend (DB_BACKEND=sqlite). The
+-- tables, indexes, triggers and sample data are the same; what SQLite lacks
+-- is done differently:
+--   * no stored procedures: bump_stat is inlined into the triggers as
+--     upserts, and the procedures the app calls are ported to Python in
+--     sqlite_backend.PROCEDURES
+--   * no FULLTEXT indexes: each FULLTEXT index is an FTS5 table named
+--     <table>_fts, kept current by triggers
+--   * no partitioning: FEE keeps its single-column primary key and real
+--     foreign key; idx_fee_due serves due-date ranges
+--   * text columns compare without case, like utf8mb4_unicode_ci, which also
+--     lets prefix LIKEs use their indexes
+--   * foreign key actions fire triggers here, so deleting a hostel also
+--     moves its rooms' and students' counters to hostel 0
+
+CREATE TABLE IF NOT EXISTS HOSTEL (
+    hostel_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(255) NOT NULL COLLATE NOCASE
+);
+
+CREATE TABLE IF NOT EXISTS ROOM (
+    room_no INT PRIMARY KEY,
+    capacity INT,
+    type VARCHAR(50) COLLATE NOCASE,
+    hostel_id INT REFERENCES HOSTEL(hostel_id) ON DELETE SET NULL
+);
+-- One hostel's rooms in room order
+CREATE INDEX IF NOT EXISTS idx_room_hostel ON ROOM (hostel_id, room_no);
+
+CREATE TABLE IF NOT EXISTS STUDENT (
+    student_id VARCHAR(10) PRIMARY KEY COLLATE NOCASE,
+    name VARCHAR(255) COLLATE NOCASE,
+    course VARCHAR(100) COLLATE NOCASE,
+    mess_plan VARCHAR(50) COLLATE NOCASE,
+    laundry_plan VARCHAR(50) COLLATE NOCASE,
+    hostel_id INT REFERENCES HOSTEL(hostel_id) ON DELETE SET NULL,
+    room_no INT REFERENCES ROOM(room_no) ON DELETE SET NULL
+);
+-- Search: prefix matches on name, ranked word matches on name and course
+CREATE INDEX IF NOT EXISTS idx_student_name ON STUDENT (name);
+CREATE VIRTUAL TABLE IF NOT EXISTS STUDENT_fts USING fts5 (name, course, content = 'STUDENT');
+-- The same lookups within one hostel: its students by room or by name
+CREATE INDEX IF NOT EXISTS idx_student_hostel_room ON STUDENT (hostel_id, room_no);
+CREATE INDEX IF NOT EXISTS idx_student_hostel_name ON STUDENT (hostel_id, name);
+-- MySQL indexes every foreign key by itself; SQLite needs this one for the
+-- room's students (occupant counts, ON DELETE SET NULL)
+CREATE INDEX IF NOT EXISTS idx_student_room ON STUDENT (room_no);
+
+-- Incoming students waiting for allocate_intake() to place them in rooms
+CREATE TABLE IF NOT EXISTS STUDENT_INTAKE (
+    student_id VARCHAR(10) PRIMARY KEY COLLATE NOCASE,
+    name VARCHAR(255) COLLATE NOCASE,
+    course VARCHAR(100) COLLATE NOCASE,
+    mess_plan VARCHAR(50) COLLATE NOCASE,
+    laundry_plan VARCHAR(50) COLLATE NOCASE,
+    hostel_id INT,
+    preferred_type VARCHAR(50) COLLATE NOCASE,
+    room_no INT
+);
+
+CREATE TABLE IF NOT EXISTS FEE (
+    fee_id VARCHAR(10) PRIMARY KEY COLLATE NOCASE,
+    student_id VARCHAR(10) COLLATE NOCASE REFERENCES STUDENT(student_id) ON DELETE SET NULL,
+    amount FLOAT,
+    status VARCHAR(50) COLLATE NOCASE,
+    due_date DATE NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fee_student ON FEE (student_id);
+-- get_fee_details: status filter plus due-date range, or due-date order alone.
+-- fee_id is what InnoDB appends to every secondary index, and keeps the
+-- procedure's ORDER BY due_date, fee_id a plain index walk.
+CREATE INDEX IF NOT EXISTS idx_fee_status_due ON FEE (status, due_date, fee_id);
+CREATE INDEX IF NOT EXISTS idx_fee_due ON FEE (due_date, fee_id);
+
+CREATE TABLE IF NOT EXISTS EMPLOYEE (
+    emp_id VARCHAR(10) PRIMARY KEY COLLATE NOCASE,
+    name VARCHAR(255) COLLATE NOCASE,
+    activity VARCHAR(100) COLLATE NOCASE,
+    service VARCHAR(100) COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS idx_employee_name ON EMPLOYEE (name);
+CREATE VIRTUAL TABLE IF NOT EXISTS EMPLOYEE_fts USING fts5 (name, activity, service, content = 'EMPLOYEE');
+
+CREATE TABLE IF NOT EXISTS HOSTEL_SERVICE (
+    service_id VARCHAR(10) PRIMARY KEY COLLATE NOCASE,
+    service_type VARCHAR(100) COLLATE NOCASE,
+    details TEXT COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS idx_service_type ON HOSTEL_SERVICE (service_type);
+CREATE VIRTUAL TABLE IF NOT EXISTS HOSTEL_SERVICE_fts USING fts5 (service_type, details, content = 'HOSTEL_SERVICE');
+
+-- One row per room, created by after_room_insert and removed with the room;
+-- the triggers keep current_occupancy equal to the room's students and
+-- reconcile_occupancy() repairs any drift
+CREATE TABLE IF NOT EXISTS ROOM_OCCUPANCY (
+    room_no INT PRIMARY KEY REFERENCES ROOM(room_no) ON DELETE CASCADE,
+    current_occupancy INT DEFAULT 0
+);
+
+-- Dashboard KPIs kept current by triggers, per hostel; see commands.sql
+CREATE TABLE IF NOT EXISTS DASHBOARD_STATS (
+    hostel_id INT NOT NULL DEFAULT 0,
+    metric VARCHAR(50) NOT NULL,
+    dimension VARCHAR(50) NOT NULL DEFAULT '',
+    value INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (hostel_id, metric, dimension)
+);
+
+-- Full-text indexes: every write to the table is repeated in its FTS5 table
+CREATE TRIGGER IF NOT EXISTS student_fts_insert AFTER INSERT ON STUDENT
+BEGIN
+    INSERT INTO STUDENT_fts (rowid, name, course) VALUES (NEW.rowid, NEW.name, NEW.course);
+END;
+CREATE TRIGGER IF NOT EXISTS student_fts_delete AFTER DELETE ON STUDENT
+BEGIN
+    INSERT INTO STUDENT_fts (STUDENT_fts, rowid, name, course) VALUES ('delete', OLD.rowid, OLD.name, OLD.course);
+END;
+CREATE TRIGGER IF NOT EXISTS student_fts_update AFTER UPDATE OF name, course ON STUDENT
+BEGIN
+    INSERT INTO STUDENT_fts (STUDENT_fts, rowid, name, course) VALUES ('delete', OLD.rowid, OLD.name, OLD.course);
+    INSERT INTO STUDENT_fts (rowid, name, course) VALUES (NEW.rowid, NEW.name, NEW.course);
+END;
+
+CREATE TRIGGER IF NOT EXISTS employee_fts_insert AFTER INSERT ON EMPLOYEE
+BEGIN
+    INSERT INTO EMPLOYEE_fts (rowid, name, activity, service) VALUES (NEW.rowid, NEW.name, NEW.activity, NEW.service);
+END;
+CREATE TRIGGER IF NOT EXISTS employee_fts_delete AFTER DELETE ON EMPLOYEE
+BEGIN
+    INSERT INTO EMPLOYEE_fts (EMPLOYEE_fts, rowid, name, activity, service)
+    VALUES ('delete', OLD.rowid, OLD.name, OLD.activity, OLD.service);
+END;
+CREATE TRIGGER IF NOT EXISTS employee_fts_update AFTER UPDATE OF name, activity, service ON EMPLOYEE
+BEGIN
+    INSERT INTO EMPLOYEE_fts (EMPLOYEE_fts, rowid, name, activity, service)
+    VALUES ('delete', OLD.rowid, OLD.name, OLD.activity, OLD.service);
+    INSERT INTO EMPLOYEE_fts (rowid, name, activity, service) VALUES (NEW.rowid, NEW.name, NEW.activity, NEW.service);
+END;
+
+CREATE TRIGGER IF NOT EXISTS hostel_service_fts_insert AFTER INSERT ON HOSTEL_SERVICE
+BEGIN
+    INSERT INTO HOSTEL_SERVICE_fts (rowid, service_type, details) VALUES (NEW.rowid, NEW.service_type, NEW.details);
+END;
+CREATE TRIGGER IF NOT EXISTS hostel_service_fts_delete AFTER DELETE ON HOSTEL_SERVICE
+BEGIN
+    INSERT INTO HOSTEL_SERVICE_fts (HOSTEL_SERVICE_fts, rowid, service_type, details)
+    VALUES ('delete', OLD.rowid, OLD.service_type, OLD.details);
+END;
+CREATE TRIGGER IF NOT EXISTS hostel_service_fts_update AFTER UPDATE OF service_type, details ON HOSTEL_SERVICE
+BEGIN
+    INSERT INTO HOSTEL_SERVICE_fts (HOSTEL_SERVICE_fts, rowid, service_type, details)
+    VALUES ('delete', OLD.rowid, OLD.service_type, OLD.details);
+    INSERT INTO HOSTEL_SERVICE_fts (rowid, service_type, details) VALUES (NEW.rowid, NEW.service_type, NEW.details);
+END;
+
+-- The triggers of commands.sql. Each adds its counter changes to
+-- DASHBOARD_STATS with one upsert of (hostel_id, metric, dimension, delta)
+-- rows, which is what bump_stat does one row at a time.
+
+CREATE TRIGGER IF NOT EXISTS after_student_insert AFTER INSERT ON STUDENT
+BEGIN
+    UPDATE ROOM_OCCUPANCY
+    SET current_occupancy = current_occupancy + 1
+    WHERE room_no = NEW.room_no;
+
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    SELECT * FROM (
+        SELECT COALESCE(NEW.hostel_id, 0), 'students', '', 1
+        UNION ALL
+        SELECT COALESCE(r.hostel_id, 0), 'occupants_by_type', COALESCE(r.type, ''), 1
+        FROM ROOM r WHERE r.room_no = NEW.room_no
+        UNION ALL
+        -- This student took the room's last free bed
+        SELECT COALESCE(r.hostel_id, 0), 'available_rooms', '', -1
+        FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+        WHERE r.room_no = NEW.room_no AND COALESCE(ro.current_occupancy, 0) = r.capacity
+    ) WHERE true
+    ON CONFLICT (hostel_id, metric, dimension) DO UPDATE SET value = value + excluded.value;
+END;
+
+-- A deleted student's fees lose their student_id. Done before the delete,
+-- so that after_fee_update still finds the student's hostel and moves the
+-- fees' counts to hostel 0.
+CREATE TRIGGER IF NOT EXISTS before_student_delete BEFORE DELETE ON STUDENT
+BEGIN
+    UPDATE FEE SET student_id = NULL WHERE student_id = OLD.student_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS after_student_delete AFTER DELETE ON STUDENT
+BEGIN
+    UPDATE ROOM_OCCUPANCY
+    SET current_occupancy = current_occupancy - 1
+    WHERE room_no = OLD.room_no;
+
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    SELECT * FROM (
+        SELECT COALESCE(OLD.hostel_id, 0), 'students', '', -1
+        UNION ALL
+        SELECT COALESCE(r.hostel_id, 0), 'occupants_by_type', COALESCE(r.type, ''), -1
+        FROM ROOM r WHERE r.room_no = OLD.room_no
+        UNION ALL
+        -- The room was full until this student left
+        SELECT COALESCE(r.hostel_id, 0), 'available_rooms', '', 1
+        FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+        WHERE r.room_no = OLD.room_no AND COALESCE(ro.current_occupancy, 0) = r.capacity - 1
+    ) WHERE true
+    ON CONFLICT (hostel_id, metric, dimension) DO UPDATE SET value = value + excluded.value;
+END;
+
+-- A student moving rooms leaves one bed and takes another; a student
+-- moving hostels takes their own and their fees' counts along
+CREATE TRIGGER IF NOT EXISTS after_student_update AFTER UPDATE ON STUDENT
+WHEN OLD.room_no IS NOT NEW.room_no OR OLD.hostel_id IS NOT NEW.hostel_id
+BEGIN
+    UPDATE ROOM_OCCUPANCY
+    SET current_occupancy = current_occupancy - 1
+    WHERE room_no = OLD.room_no AND OLD.room_no IS NOT NEW.room_no;
+
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    SELECT * FROM (
+        SELECT COALESCE(r.hostel_id, 0), 'occupants_by_type', COALESCE(r.type, ''), -1
+        FROM ROOM r WHERE r.room_no = OLD.room_no AND OLD.room_no IS NOT NEW.room_no
+        UNION ALL
+        SELECT COALESCE(r.hostel_id, 0), 'available_rooms', '', 1
+        FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+        WHERE r.room_no = OLD.room_no AND OLD.room_no IS NOT NEW.room_no
+          AND COALESCE(ro.current_occupancy, 0) = r.capacity - 1
+    ) WHERE true
+    ON CONFLICT (hostel_id, metric, dimension) DO UPDATE SET value = value + excluded.value;
+
+    UPDATE ROOM_OCCUPANCY
+    SET current_occupancy = current_occupancy + 1
+    WHERE room_no = NEW.room_no AND OLD.room_no IS NOT NEW.room_no;
+
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    SELECT * FROM (
+        SELECT COALESCE(r.hostel_id, 0), 'occupants_by_type', COALESCE(r.type, ''), 1
+        FROM ROOM r WHERE r.room_no = NEW.room_no AND OLD.room_no IS NOT NEW.room_no
+        UNION ALL
+        SELECT COALESCE(r.hostel_id, 0), 'available_rooms', '', -1
+        FROM ROOM r LEFT JOIN ROOM_OCCUPANCY ro ON ro.room_no = r.room_no
+        WHERE r.room_no = NEW.room_no AND OLD.room_no IS NOT NEW.room_no
+          AND COALESCE(ro.current_occupancy, 0) = r.capacity
+        UNION ALL
+        SELECT COALESCE(OLD.hostel_id, 0), 'students', '', -1
+        WHERE OLD.hostel_id IS NOT NEW.hostel_id
+        UNION ALL
+        SELECT COALESCE(NEW.hostel_id, 0), 'students', '', 1
+        WHERE OLD.hostel_id IS NOT NEW.hostel_id
+        UNION ALL
+        SELECT moved.hostel_id, 'fees_by_status', COALESCE(f.status, ''), moved.sign
+        FROM FEE f
+        CROSS JOIN (SELECT COALESCE(OLD.hostel_id, 0) AS hostel_id, -1 AS sign
+                    UNION ALL SELECT COALESCE(NEW.hostel_id, 0), 1) moved
+        WHERE f.student_id = NEW.student_id AND OLD.hostel_id IS NOT NEW.hostel_id
+    ) WHERE true
+    ON CONFLICT (hostel_id, metric, dimension) DO UPDATE SET value = value + excluded.value;
+END;
+
+-- Every new room starts with an empty ROOM_OCCUPANCY row
+CREATE TRIGGER IF NOT EXISTS after_room_insert AFTER INSERT ON ROOM
+BEGIN
+    INSERT INTO ROOM_OCCUPANCY (room_no, current_occupancy) VALUES (NEW.room_no, 0);
+
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    SELECT * FROM (
+        SELECT COALESCE(NEW.hostel_id, 0), 'rooms', '', 1
+        UNION ALL SELECT COALESCE(NEW.hostel_id, 0), 'rooms_by_type', COALESCE(NEW.type, ''), 1
+        UNION ALL SELECT COALESCE(NEW.hostel_id, 0), 'beds_by_type', COALESCE(NEW.type, ''), COALESCE(NEW.capacity, 0)
+        UNION ALL SELECT COALESCE(NEW.hostel_id, 0), 'available_rooms', '', 1 WHERE NEW.capacity > 0
+    ) WHERE true
+    ON CONFLICT (hostel_id, metric, dimension) DO UPDATE SET value = value + excluded.value;
+END;
+
+-- An occupied room cannot move to another hostel
+CREATE TRIGGER IF NOT EXISTS before_room_update BEFORE UPDATE OF hostel_id ON ROOM
+WHEN NEW.hostel_id IS NOT NULL AND OLD.hostel_id IS NOT NEW.hostel_id
+    AND EXISTS (SELECT 1 FROM ROOM_OCCUPANCY WHERE room_no = OLD.room_no AND current_occupancy > 0)
+BEGIN
+    SELECT RAISE(ABORT, 'Room has occupants; move them before changing its hostel');
+END;
+
+-- Takes the room's old figures out of its old hostel and adds the new ones
+-- to its new hostel; for an unchanged hostel the pairs net out
+CREATE TRIGGER IF NOT EXISTS after_room_update AFTER UPDATE ON ROOM
+BEGIN
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    SELECT * FROM (
+        SELECT COALESCE(OLD.hostel_id, 0), 'rooms', '', -1
+        UNION ALL SELECT COALESCE(NEW.hostel_id, 0), 'rooms', '', 1
+        UNION ALL SELECT COALESCE(OLD.hostel_id, 0), 'rooms_by_type', COALESCE(OLD.type, ''), -1
+        UNION ALL SELECT COALESCE(NEW.hostel_id, 0), 'rooms_by_type', COALESCE(NEW.type, ''), 1
+        UNION ALL SELECT COALESCE(OLD.hostel_id, 0), 'beds_by_type', COALESCE(OLD.type, ''), -COALESCE(OLD.capacity, 0)
+        UNION ALL SELECT COALESCE(NEW.hostel_id, 0), 'beds_by_type', COALESCE(NEW.type, ''), COALESCE(NEW.capacity, 0)
+        UNION ALL SELECT COALESCE(OLD.hostel_id, 0), 'occupants_by_type', COALESCE(OLD.type, ''), -occupancy FROM (SELECT COALESCE(MAX(current_occupancy), 0) AS occupancy FROM ROOM_OCCUPANCY WHERE room_no = NEW.room_no)
+        UNION ALL SELECT COALESCE(NEW.hostel_id, 0), 'occupants_by_type', COALESCE(NEW.type, ''), occupancy FROM (SELECT COALESCE(MAX(current_occupancy), 0) AS occupancy FROM ROOM_OCCUPANCY WHERE room_no = NEW.room_no)
+        UNION ALL SELECT COALESCE(OLD.hostel_id, 0), 'available_rooms', '', -(occupancy < OLD.capacity) FROM (SELECT COALESCE(MAX(current_occupancy), 0) AS occupancy FROM ROOM_OCCUPANCY WHERE room_no = NEW.room_no)
+        UNION ALL SELECT COALESCE(NEW.hostel_id, 0), 'available_rooms', '', occupancy < NEW.capacity FROM (SELECT COALESCE(MAX(current_occupancy), 0) AS occupancy FROM ROOM_OCCUPANCY WHERE room_no = NEW.room_no)
+    ) WHERE true
+    ON CONFLICT (hostel_id, metric, dimension) DO UPDATE SET value = value + excluded.value;
+END;
+
+-- Runs before the delete because ON DELETE CASCADE removes the room's
+-- ROOM_OCCUPANCY row together with the room
+CREATE TRIGGER IF NOT EXISTS before_room_delete BEFORE DELETE ON ROOM
+BEGIN
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    SELECT * FROM (
+        SELECT COALESCE(OLD.hostel_id, 0), 'rooms', '', -1
+        UNION ALL SELECT COALESCE(OLD.hostel_id, 0), 'rooms_by_type', COALESCE(OLD.type, ''), -1
+        UNION ALL SELECT COALESCE(OLD.hostel_id, 0), 'beds_by_type', COALESCE(OLD.type, ''), -COALESCE(OLD.capacity, 0)
+        UNION ALL SELECT COALESCE(OLD.hostel_id, 0), 'occupants_by_type', COALESCE(OLD.type, ''), -occupancy FROM (SELECT COALESCE(MAX(current_occupancy), 0) AS occupancy FROM ROOM_OCCUPANCY WHERE room_no = OLD.room_no)
+        UNION ALL SELECT COALESCE(OLD.hostel_id, 0), 'available_rooms', '', -1 FROM (SELECT COALESCE(MAX(current_occupancy), 0) AS occupancy FROM ROOM_OCCUPANCY WHERE room_no = OLD.room_no) WHERE occupancy < OLD.capacity
+    ) WHERE true
+    ON CONFLICT (hostel_id, metric, dimension) DO UPDATE SET value = value + excluded.value;
+END;
+
+-- Fees count towards their student's hostel
+CREATE TRIGGER IF NOT EXISTS after_fee_insert AFTER INSERT ON FEE
+BEGIN
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    SELECT COALESCE((SELECT hostel_id FROM STUDENT WHERE student_id = NEW.student_id), 0),
+           'fees_by_status', COALESCE(NEW.status, ''), 1
+    WHERE true
+    ON CONFLICT (hostel_id, metric, dimension) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS after_fee_update AFTER UPDATE ON FEE
+WHEN NOT (OLD.status IS NEW.status AND OLD.student_id IS NEW.student_id)
+BEGIN
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    SELECT * FROM (
+        SELECT COALESCE((SELECT hostel_id FROM STUDENT WHERE student_id = OLD.student_id), 0),
+               'fees_by_status', COALESCE(OLD.status, ''), -1
+        UNION ALL
+        SELECT COALESCE((SELECT hostel_id FROM STUDENT WHERE student_id = NEW.student_id), 0),
+               'fees_by_status', COALESCE(NEW.status, ''), 1
+    ) WHERE true
+    ON CONFLICT (hostel_id, metric, dimension) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS after_fee_delete AFTER DELETE ON FEE
+BEGIN
+    INSERT INTO DASHBOARD_STATS (hostel_id, metric, dimension, value)
+    SELECT COALESCE((SELECT hostel_id FROM STUDENT WHERE student_id = OLD.student_id), 0),
+           'fees_by_status', COALESCE(OLD.status, ''), -1
+    WHERE true
+    ON CONFLICT (hostel_id, metric, dimension) DO UPDATE SET value = value + excluded.value;
+END;
+
+-- Insert sample data
+INSERT INTO HOSTEL (name) VALUES
+('Alpha Hostel'),
+('Beta Hostel'),
+('Gamma Hostel');
+
+INSERT INTO ROOM (room_no, capacity, type, hostel_id) VALUES
+(101, 2, 'Double', 1),
+(102, 1, 'Single', 1),
+(103, 4, 'Dormitory', 2),
+(201, 3, 'Triple', 3),
+(202, 2, 'Double', 2);
+
+INSERT INTO STUDENT (student_id, name, course, mess_plan, laundry_plan, hostel_id, room_no) VALUES
+('S001', 'Alice Brown', 'Engineering', 'Standard', 'Basic', 1, 101),
+('S002', 'Bob Smith', 'Arts', 'Premium', 'Standard', 1, 102),
+('S003', 'Charlie Davis', 'Science', 'Standard', 'Basic', 2, 103),
+('S004', 'Daisy Johnson', 'Engineering', 'Premium', 'Premium', 3, 201),
+('S005', 'Evan Lee', 'Medicine', 'Standard', 'Standard', 2, 202);
+
+INSERT INTO FEE (fee_id, student_id, amount, status, due_date) VALUES
+('F001', 'S001', 500.0, 'Paid', '2023-05-10'),
+('F002', 'S002', 750.0, 'Pending', '2023-06-15'),
+('F003', 'S003', 600.0, 'Paid', '2023-07-20'),
+('F004', 'S004', 800.0, 'Overdue', '2023-08-25'),
+('F005', 'S005', 700.0, 'Pending', '2023-09-30');
+
+INSERT INTO EMPLOYEE (emp_id, name, activity, service) VALUES
+('E001', 'John Doe', 'Cleaning', 'Housekeeping'),
+('E002', 'Anna White', 'Cooking', 'Cafeteria'),
+('E003', 'Rick Green', 'Security', 'Guarding'),
+('E004', 'Mary Black', 'Maintenance', 'Plumbing'),
+('E005', 'Tom Grey', 'Admin', 'Reception');
+
+INSERT INTO HOSTEL_SERVICE (service_id, service_type, details) VALUES
+('SVC001', 'Wi-Fi', 'High-speed internet access available throughout the hostel'),
+('SVC002', 'Laundry', 'Self-service laundry facility'),
+('SVC003', 'Housekeeping', 'Daily room cleaning services'),
+('SVC004', 'Security', '24/7 CCTV and security guard service'),
+('SVC005', 'Cafeteria', 'Cafeteria provides three meals a day');
+
+-- Statistics for the query planner and for pagination.approximate_count
+ANALYZE;
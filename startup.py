@@ -0,0 +1,191 @@
+import time
+
+# Everything below, imports included, counts towards the cold start
+STARTED = time.perf_counter()
+
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import mysql.connector
+from dotenv import load_dotenv
+
+import db
+import metrics
+import scheduler
+import schema
+
+load_dotenv()
+
+# How long to wait for the database, and how often to try
+READY_TIMEOUT = float(os.getenv("STARTUP_READY_TIMEOUT", 120))
+READY_INTERVAL = float(os.getenv("STARTUP_READY_INTERVAL", 1))
+# Connections opened before the first session so it does not pay for them
+WARM_CONNECTIONS = int(os.getenv("STARTUP_WARM_CONNECTIONS", 2))
+# Seconds from process start until the app can serve; slower starts are flagged
+COLD_START_BUDGET = float(os.getenv("COLD_START_BUDGET", 10))
+# One JSON line per start, so the cold start can be followed over time
+STARTUP_LOG = os.getenv("STARTUP_LOG", "startup_times.jsonl")
+
+# Modules the pages import, loaded here instead of by the first session
+WARM_MODULES = ["plotly.express", "main"]
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+def check_ready():
+    # Raises unless the database accepts connections and holds the schema.
+    # Uses its own connection so failed attempts do not touch the pool.
+    conn = db._connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(*db.get_backend().ready_query())
+        loaded = cursor.fetchone()[0]
+        cursor.close()
+    finally:
+        conn.close()
+    if not loaded:
+        raise RuntimeError("schema not loaded yet")
+
+
+def wait_until_ready(timeout=READY_TIMEOUT, interval=READY_INTERVAL, log=print):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            check_ready()
+            return
+        except (mysql.connector.Error, RuntimeError) as e:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"database not ready after {timeout:.0f}s: {e}")
+            log(f"waiting for the database: {e}")
+            time.sleep(interval)
+
+
+def warm_pool(connections=WARM_CONNECTIONS):
+    # Checks out `connections` at once so that many are opened, then returns
+    # them to the pool as idle connections
+    pool = db.get_pool()
+    held = []
+    try:
+        for _ in range(min(connections, pool.size)):
+            held.append(pool.acquire())
+    finally:
+        for conn in held:
+            pool.release(conn)
+
+
+def warm_caches():
+    # Schema metadata for the pickers and search, and the dashboard's KPIs,
+    # which is the page every session opens on
+    app = importlib.import_module("main")
+    schema.catalog.tables()
+    db.run_query(app.DASHBOARD_STATS_QUERY)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def warm(budget=COLD_START_BUDGET, log=print):
+    # Runs each phase in turn and returns the cold start report; the time
+    # before the first phase (this module's own imports) is "boot"
+    phases = {"boot": time.perf_counter() - STARTED}
+    steps = [
+        ("database", wait_until_ready),
+        ("imports", lambda: [importlib.import_module(name) for name in WARM_MODULES]),
+        ("pool", warm_pool),
+        ("caches", warm_caches),
+    ]
+    for phase, step in steps:
+        started = time.perf_counter()
+        step()
+        phases[phase] = time.perf_counter() - started
+
+    total = time.perf_counter() - STARTED
+    report = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "total_s": round(total, 3),
+        "budget_s": budget,
+        "over_budget": total > budget,
+        "phases": {phase: round(seconds, 3) for phase, seconds in phases.items()},
+    }
+    metrics.cold_start = report
+
+    breakdown = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in phases.items())
+    log(f"cold start {total:.2f}s of a {budget:.0f}s budget ({breakdown})")
+    if report["over_budget"]:
+        log(f"warning: cold start over budget by {total - budget:.2f}s")
+    return report
+
+
+def record(report, path=STARTUP_LOG):
+    if not path:
+        return
+    try:
+        with open(path, "a") as f:
+            f.write(json.dumps(report) + "\n")
+    except OSError as e:
+        print(f"could not write {path}: {e}", file=sys.stderr)
+
+
+def history(path=STARTUP_LOG, limit=50):
+    # The last `limit` recorded cold starts, oldest first
+    try:
+        with open(path) as f:
+            lines = f.readlines()[-limit:]
+    except OSError:
+        return []
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Wait for the database, warm up, then serve main.py from this process.",
+        epilog="Arguments after -- are passed to `streamlit run`.",
+    )
+    parser.add_argument("--check", action="store_true",
+                        help="only check once whether the database is ready (exit 1 if not)")
+    parser.add_argument("--no-serve", action="store_true",
+                        help="measure and record the cold start, then exit (1 if over budget)")
+    parser.add_argument("--budget", type=float, default=COLD_START_BUDGET)
+    args, streamlit_args = parser.parse_known_args(argv)
+    if streamlit_args[:1] == ["--"]:
+        streamlit_args = streamlit_args[1:]
+
+    if args.check:
+        try:
+            check_ready()
+        except (mysql.connector.Error, RuntimeError) as e:
+            print(f"not ready: {e}", file=sys.stderr)
+            return 1
+        print("ready")
+        return 0
+
+    try:
+        report = warm(args.budget)
+    except TimeoutError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    record(report)
+    if args.no_serve:
+        return 1 if report["over_budget"] else 0
+
+    # Background jobs run from here on, whether or not a session has opened
+    scheduler.get_scheduler()
+    # Serving from this process means the sessions find the warmed modules,
+    # pool and caches already loaded
+    from streamlit.web import cli
+    return cli.main(["run", MAIN_SCRIPT, *streamlit_args])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,41 +1,22 @@
 import streamlit as st
-import mysql.connector
 import pandas as pd
 from dotenv import load_dotenv
-import os
-load_dotenv()
 
-# Database connection
-def create_connection():
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST", "127.0.0.1"),
-        port=int(os.getenv("DB_PORT", 4121)),
+import search
 
-        user=os.getenv("DB_USER", "root"),
-        password=os.getenv("DB_PASSWORD", "root_password"),
-        database=os.getenv("DB_NAME", "HostelManagement"),
-        charset='utf8mb4',
-        collation='utf8mb4_unicode_ci'  # Replace with your database name
-    )
+load_dotenv()
 
 # Function to get table columns for the search
 def get_columns(table_name):
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute(f"DESCRIBE {table_name};")
-    columns = cursor.fetchall()
-    conn.close()
-    return [column[0] for column in columns]
+    return list(search.table_columns(table_name))
 
 # Function to search in a table by a selected column
 def search_data(table_name, column, search_value):
-    conn = create_connection()
-    cursor = conn.cursor(dictionary=True)
-    query = f"SELECT * FROM {table_name} WHERE {column} LIKE %s"
-    cursor.execute(query, (f"%{search_value}%",))
-    results = cursor.fetchall()
-    conn.close()
-    return pd.DataFrame(results)
+    try:
+        return pd.DataFrame(search.search(table_name, column, search_value))
+    except Exception as e:
+        st.error(f"Search error: {str(e)}")
+        return pd.DataFrame()
 
 # Function to display search UI
 def display_search_ui():
@@ -46,6 +27,8 @@ def display_search_ui():
 
     # Get columns of selected table
     columns = get_columns(table_option)
+    if search.fulltext_columns(table_option):
+        columns = [search.ALL_TEXT] + columns
 
     # Select column to search
     column_option = st.selectbox("Select Column", columns)
@@ -0,0 +1,30 @@
+import os
+import tempfile
+
+# The suite runs on the embedded backend; these must be set before any app
+# module reads them at import
+_tmp = tempfile.mkdtemp(prefix="hostel-tests-")
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "hostel.db")
+
+import pytest
+
+import db
+import sqlite_backend
+from cache import query_cache
+from schema import catalog
+
+
+@pytest.fixture
+def database():
+    # A fresh database with the sample data of sqlite_commands.sql; the
+    # first connection after the files are removed creates it again
+    db.get_pool().close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(sqlite_backend.SQLITE_PATH + suffix):
+            os.remove(sqlite_backend.SQLITE_PATH + suffix)
+    query_cache.clear()
+    catalog.invalidate()
+    yield db
+    db.get_pool().close()
+
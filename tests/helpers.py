@@ -0,0 +1,39 @@
+import db
+
+
+def rebuilt_stats():
+    # DASHBOARD_STATS as rebuild_dashboard_stats() computes it from scratch,
+    # without touching the table
+    with db.connection() as conn:
+        conn.start_transaction()
+        try:
+            conn.cursor().callproc("rebuild_dashboard_stats")
+            return stats_rows(conn)
+        finally:
+            conn.rollback()
+
+
+def stats_rows(conn=None):
+    # Non-zero counters, as {(hostel_id, metric, dimension): value}
+    query = "SELECT hostel_id, metric, dimension, value FROM DASHBOARD_STATS WHERE value <> 0"
+    if conn is None:
+        rows = db.execute(query)
+    else:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(query)
+        rows = cursor.fetchall()
+    return {(r["hostel_id"], r["metric"], r["dimension"]): r["value"] for r in rows}
+
+
+def counted_occupancy():
+    # Each room's students, counted directly
+    rows = db.execute("""
+        SELECT r.room_no, COUNT(s.student_id) AS occupants
+        FROM ROOM r LEFT JOIN STUDENT s ON s.room_no = r.room_no
+        GROUP BY r.room_no
+    """)
+    return {r["room_no"]: r["occupants"] for r in rows}
+
+
+def stored_occupancy():
+    return {r["room_no"]: r["current_occupancy"] for r in db.execute("SELECT * FROM ROOM_OCCUPANCY")}
@@ -0,0 +1,22 @@
+from datetime import date
+
+import analytics
+
+
+def _aging(summary):
+    return {row["bucket"]: row["fees"] for _, row in analytics.aging(summary).iterrows()}
+
+
+def test_aging_follows_the_day(database):
+    before = analytics.fee_summary("2023-01-01", "2023-12-31", today=date(2023, 9, 1))
+    assert _aging(before) == {"Not yet due": 1, "0-30 days": 1, "31-60 days": 0, "Over 60 days": 1}
+    # A later day is a different cache entry, not yesterday's buckets
+    after = analytics.fee_summary("2023-01-01", "2023-12-31", today=date(2023, 10, 1))
+    assert _aging(after) == {"Not yet due": 0, "0-30 days": 1, "31-60 days": 1, "Over 60 days": 1}
+
+
+def test_hostel_summary(database):
+    summary = analytics.fee_summary("2023-01-01", "2023-12-31", hostel_id=2, today=date(2023, 9, 1))
+    assert _aging(summary) == {"Not yet due": 1, "0-30 days": 0, "31-60 days": 0, "Over 60 days": 0}
+    months = analytics.monthly(summary)
+    assert list(months["collected"]) == [600.0, 0.0]
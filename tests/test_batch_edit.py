@@ -0,0 +1,59 @@
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+import batch_edit
+import metrics
+
+
+def _fees(db):
+    return pd.DataFrame(db.execute("SELECT fee_id, status, due_date FROM FEE ORDER BY fee_id"))
+
+
+def test_diff_ignores_date_types(database):
+    original = _fees(database)
+    edited = original.copy()
+    # The grid hands dates back as datetimes or Timestamps
+    edited["due_date"] = [datetime.combine(d, datetime.min.time()) for d in original["due_date"]]
+    edited.loc[1, "due_date"] = pd.Timestamp("2024-01-31")
+    before, after = batch_edit.diff("FEE", original, edited)
+    assert list(after.index) == ["F002"]
+
+
+def test_apply(database):
+    original = _fees(database)
+    edited = original.copy()
+    edited["status"] = "Paid"
+    edited.loc[0, "due_date"] = date(2024, 2, 1)
+    # F001 and F003 were already paid; F001 only gets a new due date
+    assert batch_edit.apply("FEE", original, edited) == {"updated": 4, "conflicts": []}
+    rows = database.execute("SELECT fee_id, status, due_date FROM FEE ORDER BY fee_id")
+    assert {r["status"] for r in rows} == {"Paid"}
+    assert rows[0]["due_date"] == date(2024, 2, 1)
+    assert rows[2]["due_date"] == date(2023, 7, 20)
+    # All four rows in one statement
+    statement = ("UPDATE FEE SET status = CASE fee_id WHEN ? THEN ? ... END, "
+                 "due_date = CASE fee_id WHEN ? THEN ? ... END WHERE fee_id IN (?, ...)")
+    assert metrics.registry.statements[statement]["rows"] >= 4
+
+
+def test_apply_conflict_writes_nothing(database):
+    original = _fees(database)
+    edited = original.copy()
+    edited["status"] = "Paid"
+    # Someone else changes F004 after the grid was loaded
+    database.execute("UPDATE FEE SET status = 'Pending' WHERE fee_id = 'F004'")
+    assert batch_edit.apply("FEE", original, edited) == {"updated": 0, "conflicts": ["F004"]}
+    statuses = {r["fee_id"]: r["status"] for r in database.execute("SELECT fee_id, status FROM FEE")}
+    assert statuses["F002"] == "Pending"
+
+
+def test_apply_rejects_out_of_bounds(database):
+    original = pd.DataFrame(database.execute("SELECT room_no, capacity, type FROM ROOM ORDER BY room_no"))
+    edited = original.copy()
+    edited.loc[0, "capacity"] = 3
+    edited.loc[1, "capacity"] = 5
+    with pytest.raises(ValueError, match="capacity must be between 1 and 4"):
+        batch_edit.apply("ROOM", original, edited)
+    assert database.execute("SELECT capacity FROM ROOM WHERE room_no = 101") == [{"capacity": 2}]
@@ -0,0 +1,45 @@
+import io
+
+import pandas as pd
+
+import bulk_import
+
+STUDENTS = """student_id,name,course,mess_plan,laundry_plan,hostel_id,room_no
+S100,Ann Roy,Law,Standard,Basic,1,101
+S101,Ben Das,Arts,Standard,Basic,1,103
+S102,Cara Nair,Arts,Premium,Basic,2,103
+S103,Dev Shah,Arts,Premium,Basic,1,101
+S104,Eli Iyer,Arts,Premium,Gold,2,202
+"""
+
+
+def _errors(report):
+    return {(row["row"], row["error"]) for _, row in report.iterrows()}
+
+
+def test_students_validation(database):
+    valid, errors = bulk_import.validate("students", pd.read_csv(io.StringIO(STUDENTS), dtype=str))
+    assert list(valid["student_id"]) == ["S100", "S102"]
+    assert _errors(errors) == {
+        # Room 103 is in hostel 2
+        (3, "room belongs to another hostel"),
+        # Room 101 had one free bed, taken by S100
+        (5, "room is full"),
+        (6, "must be one of Basic, Standard, Premium"),
+    }
+
+
+def test_students_import(database):
+    report = bulk_import.import_file("students", io.StringIO(STUDENTS), "students.csv")
+    assert (report["written"], report["rejected"]) == (2, 3)
+    rows = database.execute("SELECT s.student_id FROM STUDENT s JOIN ROOM r ON r.room_no = s.room_no "
+                            "WHERE s.hostel_id <> r.hostel_id")
+    assert rows == []
+
+
+def test_rooms_without_hostel_take_anyone(database):
+    database.execute("INSERT INTO ROOM (room_no, capacity, type) VALUES (301, 2, 'Double')")
+    frame = pd.DataFrame([["S100", "Ann Roy", "Law", "Standard", "Basic", "3", "301"]],
+                         columns=bulk_import.IMPORT_SPECS["students"]["columns"])
+    valid, errors = bulk_import.validate("students", frame)
+    assert len(valid) == 1 and errors.empty
@@ -0,0 +1,66 @@
+from cache import PROCEDURE_READS, PROCEDURE_WRITES, QueryCache, procedure_name, tables_in, with_dependents
+
+
+def test_tables_in():
+    assert tables_in("""
+        SELECT s.*, r.type FROM STUDENT s
+        JOIN ROOM r ON r.room_no = s.room_no
+        LEFT JOIN `room_occupancy` ro ON ro.room_no = r.room_no
+    """) == {"STUDENT", "ROOM", "ROOM_OCCUPANCY"}
+    assert tables_in("INSERT INTO FEE (fee_id) SELECT fee_id FROM FEE_STAGING") == {"FEE", "FEE_STAGING"}
+    assert tables_in("UPDATE ROOM SET capacity = 2") == {"ROOM"}
+    assert tables_in("ALTER TABLE HOSTEL AUTO_INCREMENT = 1") == {"HOSTEL"}
+
+
+def test_calls_map_to_procedure_tables():
+    assert tables_in("CALL get_fee_details(%s, %s)") == set()
+    assert procedure_name("  CALL `get_fee_details`(%s)") == "get_fee_details"
+    assert procedure_name("SELECT 1") is None
+    assert PROCEDURE_READS["get_fee_details"] == {"FEE", "STUDENT"}
+    assert "STUDENT" in PROCEDURE_WRITES["add_student_to_room"]
+
+
+def test_with_dependents():
+    assert with_dependents({"FEE"}) == {"FEE", "DASHBOARD_STATS"}
+    # Deleting a room sets its students' room_no to NULL
+    assert {"STUDENT", "ROOM_OCCUPANCY"} <= with_dependents({"ROOM"})
+    assert {"ROOM", "STUDENT", "ROOM_OCCUPANCY", "DASHBOARD_STATS"} <= with_dependents({"HOSTEL"})
+
+
+def test_invalidate_trigger_dependent():
+    cache = QueryCache()
+    cache.put("stats", [{"value": 1}], {"DASHBOARD_STATS"})
+    cache.put("rooms", [{"room_no": 101}], {"ROOM"})
+    cache.invalidate({"FEE"})
+    assert cache.get("stats") == (False, None)
+    assert cache.get("rooms") == (True, [{"room_no": 101}])
+
+
+def test_put_skipped_after_concurrent_write():
+    cache = QueryCache()
+    version = cache.version({"STUDENT"})
+    cache.invalidate({"STUDENT"})
+    cache.put("students", [], {"STUDENT"}, version)
+    assert cache.get("students") == (False, None)
+
+
+def test_hits_are_copies():
+    cache = QueryCache()
+    cache.put("rows", [{"name": "Alice"}], {"STUDENT"})
+    cache.get("rows")[1][0]["name"] = "changed"
+    assert cache.get("rows") == (True, [{"name": "Alice"}])
+
+
+def test_run_query_invalidated_by_room_delete(database):
+    query = "SELECT room_no FROM STUDENT WHERE student_id = 'S001'"
+    assert database.run_query(query) == [{"room_no": 101}]
+    # Through ON DELETE SET NULL, not a write to STUDENT itself
+    database.run_query("DELETE FROM ROOM WHERE room_no = 101")
+    assert database.run_query(query) == [{"room_no": None}]
+
+
+def test_procedure_write_invalidates_reads(database):
+    query = "SELECT COUNT(*) AS students FROM STUDENT"
+    assert database.run_query(query) == [{"students": 5}]
+    database.call_procedure("add_student_to_room", ["S100", "Ann Roy", "Law", "Standard", "Basic", 2, 103])
+    assert database.run_query(query) == [{"students": 6}]
@@ -0,0 +1,80 @@
+import mysql.connector
+import pytest
+
+from helpers import counted_occupancy, rebuilt_stats, stats_rows, stored_occupancy
+
+
+def _check(db):
+    # The trigger-maintained counters equal a recount from scratch
+    assert stored_occupancy() == counted_occupancy()
+    assert stats_rows() == rebuilt_stats()
+
+
+def test_sample_data(database):
+    _check(database)
+    stats = stats_rows()
+    assert stats[(1, "students", "")] == 2
+    assert stats[(2, "available_rooms", "")] == 2
+
+
+def test_student_changes(database):
+    database.execute("INSERT INTO STUDENT (student_id, name, hostel_id, room_no) VALUES ('S100', 'Ann Roy', 2, 103)")
+    _check(database)
+    database.execute("UPDATE STUDENT SET room_no = 202 WHERE student_id = 'S100'")
+    _check(database)
+    # Room 202 is now full
+    assert (2, "available_rooms", "") in stats_rows()
+    assert stats_rows()[(2, "available_rooms", "")] == 1
+    database.execute("UPDATE STUDENT SET hostel_id = 1, room_no = 101 WHERE student_id = 'S005'")
+    _check(database)
+    database.execute("DELETE FROM STUDENT WHERE student_id IN ('S001', 'S100')")
+    _check(database)
+
+
+def test_room_changes(database):
+    database.execute("INSERT INTO ROOM (room_no, capacity, type, hostel_id) VALUES (301, 3, 'Triple', 1)")
+    assert stored_occupancy()[301] == 0
+    _check(database)
+    database.execute("UPDATE ROOM SET capacity = 1, type = 'Single' WHERE room_no = 101")
+    _check(database)
+    database.execute("UPDATE ROOM SET hostel_id = 3 WHERE room_no = 301")
+    _check(database)
+    # Its students stay, without a room
+    database.execute("DELETE FROM ROOM WHERE room_no = 103")
+    assert database.execute("SELECT room_no FROM STUDENT WHERE student_id = 'S003'") == [{"room_no": None}]
+    _check(database)
+
+
+def test_hostel_delete(database):
+    database.execute("DELETE FROM HOSTEL WHERE hostel_id = 3")
+    _check(database)
+
+
+def test_fee_changes(database):
+    database.execute("INSERT INTO FEE (fee_id, student_id, amount, status, due_date) "
+                     "VALUES ('F100', 'S003', 650, 'Overdue', '2024-01-15')")
+    _check(database)
+    database.execute("UPDATE FEE SET status = 'Paid' WHERE status <> 'Paid'")
+    _check(database)
+    database.execute("UPDATE FEE SET student_id = 'S001' WHERE fee_id = 'F100'")
+    _check(database)
+    database.execute("DELETE FROM FEE WHERE fee_id IN ('F001', 'F100')")
+    _check(database)
+    # A deleted student's fees stay, counted under no hostel
+    database.execute("DELETE FROM STUDENT WHERE student_id = 'S002'")
+    _check(database)
+
+
+def test_occupied_room_keeps_its_hostel(database):
+    with pytest.raises(mysql.connector.DatabaseError, match="Room has occupants") as e:
+        database.execute("UPDATE ROOM SET hostel_id = 2 WHERE room_no = 101")
+    assert e.value.sqlstate == "45000"
+    # Other changes, and emptied rooms, are fine
+    database.execute("UPDATE ROOM SET capacity = 3 WHERE room_no = 101")
+    database.execute("DELETE FROM STUDENT WHERE student_id = 'S001'")
+    database.execute("UPDATE ROOM SET hostel_id = 2 WHERE room_no = 101")
+    _check(database)
+    # Deleting a hostel clears its occupied rooms' hostel
+    database.execute("DELETE FROM HOSTEL WHERE hostel_id = 1")
+    assert database.execute("SELECT hostel_id FROM ROOM WHERE room_no = 102") == [{"hostel_id": None}]
+    _check(database)
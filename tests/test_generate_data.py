@@ -0,0 +1,32 @@
+from collections import Counter
+
+import generate_data
+
+
+def _check_beds(room_rows, student_rows, students):
+    assert len(student_rows) == students
+    capacity = {room_no: cap for room_no, cap, _, _ in room_rows}
+    hostel = {room_no: h for room_no, _, _, h in room_rows}
+    for room_no, taken in Counter(row[6] for row in student_rows).items():
+        assert taken <= capacity[room_no]
+    assert all(hostel[row[6]] == row[5] for row in student_rows)
+
+
+def test_default_run_fits():
+    args = generate_data._parser().parse_args([])
+    room_rows, student_rows, fee_rows = generate_data.generate(args.hostels, args.rooms, args.students, args.fees)
+    assert len(room_rows) >= args.rooms
+    assert len(fee_rows) == args.fees
+    _check_beds(room_rows, student_rows, args.students)
+
+
+def test_rooms_added_when_beds_run_out():
+    room_rows, student_rows, _ = generate_data.generate(2, 10, 500, 0)
+    assert len(room_rows) > 10
+    # Added rooms keep some free beds
+    assert sum(cap for _, cap, _, _ in room_rows) > 500
+    _check_beds(room_rows, student_rows, 500)
+
+
+def test_same_seed_same_rows():
+    assert generate_data.generate(3, 50, 100, 200, seed=7) == generate_data.generate(3, 50, 100, 200, seed=7)
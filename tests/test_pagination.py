@@ -0,0 +1,18 @@
+import pagination
+
+
+def test_room_page_occupants(database):
+    rows, _ = pagination.fetch_page("ROOM")
+    assert dict(zip(rows["room_no"], rows["occupants"])) == {101: 1, 102: 1, 103: 1, 201: 1, 202: 1}
+
+    database.run_query("INSERT INTO STUDENT (student_id, name, hostel_id, room_no) VALUES ('S100', 'Ann Roy', 2, 103)")
+    database.run_query("DELETE FROM STUDENT WHERE student_id = 'S005'")
+    rows, _ = pagination.fetch_page("ROOM", hostel_id=2)
+    assert dict(zip(rows["room_no"], rows["occupants"])) == {103: 2, 202: 0}
+
+
+def test_room_pages_seek(database):
+    first, after = pagination.fetch_page("ROOM", page_size=2)
+    second, _ = pagination.fetch_page("ROOM", after=after, page_size=2)
+    assert list(first["room_no"]) == [101, 102]
+    assert list(second["room_no"]) == [103, 201]
@@ -0,0 +1,119 @@
+from datetime import date
+
+import mysql.connector
+import pytest
+
+from helpers import counted_occupancy, rebuilt_stats, stats_rows, stored_occupancy
+
+
+def _add(db, student_id, hostel_id, room_no):
+    return db.call_procedure("add_student_to_room",
+                             [student_id, "New Student", "Arts", "Standard", "Basic", hostel_id, room_no])
+
+
+def _intake(db, *rows):
+    for student_id, hostel_id, preferred_type in rows:
+        db.execute(
+            "INSERT INTO STUDENT_INTAKE (student_id, name, course, mess_plan, laundry_plan, hostel_id, preferred_type) "
+            "VALUES (%s, 'Intake Student', 'Law', 'Standard', 'Basic', %s, %s)",
+            (student_id, hostel_id, preferred_type),
+        )
+
+
+def test_add_student_to_room(database):
+    _add(database, "S100", 1, 101)
+    student = database.execute("SELECT hostel_id, room_no FROM STUDENT WHERE student_id = 'S100'")
+    assert student == [{"hostel_id": 1, "room_no": 101}]
+    assert stored_occupancy()[101] == 2
+
+
+@pytest.mark.parametrize("hostel_id, room_no, message", [
+    (1, 102, "Room is already full"),
+    (1, 103, "Room belongs to another hostel"),
+    (1, 999, "Room does not exist"),
+])
+def test_add_student_to_room_refuses(database, hostel_id, room_no, message):
+    with pytest.raises(mysql.connector.DatabaseError, match=message) as e:
+        _add(database, "S100", hostel_id, room_no)
+    assert e.value.sqlstate == "45000"
+    assert database.execute("SELECT * FROM STUDENT WHERE student_id = 'S100'") == []
+
+
+def test_add_student_to_room_duplicate_id(database):
+    with pytest.raises(mysql.connector.IntegrityError) as e:
+        _add(database, "S001", 1, 101)
+    assert e.value.errno == 1062
+
+
+def test_allocate_intake(database):
+    # Free beds: 101 Double (hostel 1); 103 Dormitory x3 and 202 Double (hostel 2)
+    _intake(database, ("I01", 2, "Double"), ("I02", 2, "Double"), ("I03", 1, "Single"), ("I04", 1, None))
+    result = database.call_procedure("allocate_intake", [False])
+    assert result == [{"allocated": 3, "unallocated": 1}]
+
+    rooms = {r["student_id"]: r["room_no"] for r in database.execute(
+        "SELECT student_id, room_no FROM STUDENT WHERE student_id LIKE 'I%'")}
+    # The preferred type first, then any bed in the student's hostel
+    assert rooms == {"I01": 202, "I02": 103, "I03": 101}
+    assert database.execute("SELECT student_id FROM STUDENT_INTAKE") == [{"student_id": "I04"}]
+    assert stored_occupancy() == counted_occupancy()
+    assert stats_rows() == rebuilt_stats()
+
+
+def test_allocate_intake_strict(database):
+    _intake(database, ("I01", 2, "Double"), ("I02", 2, "Double"), ("I03", 1, "Single"), ("I04", 1, None))
+    result = database.call_procedure("allocate_intake", [True])
+    assert result == [{"allocated": 2, "unallocated": 2}]
+    rooms = {r["student_id"]: r["room_no"] for r in database.execute(
+        "SELECT student_id, room_no FROM STUDENT WHERE student_id LIKE 'I%'")}
+    assert rooms == {"I01": 202, "I04": 101}
+
+
+def test_allocate_intake_never_overfills(database):
+    _intake(database, *[(f"I{i:02d}", 2, None) for i in range(10)])
+    result = database.call_procedure("allocate_intake", [False])
+    # Hostel 2 has four free beds
+    assert result == [{"allocated": 4, "unallocated": 6}]
+    capacity = {r["room_no"]: r["capacity"] for r in database.execute("SELECT room_no, capacity FROM ROOM")}
+    assert all(occupants <= capacity[room] for room, occupants in counted_occupancy().items())
+
+
+def test_allocate_intake_untyped_rooms(database):
+    database.execute("INSERT INTO ROOM (room_no, capacity, type, hostel_id) VALUES (301, 2, NULL, 1), (302, 1, NULL, 1)")
+    _intake(database, ("I01", 1, None), ("I02", 1, "Double"), ("I03", 1, None), ("I04", 1, None))
+    assert database.call_procedure("allocate_intake", [False]) == [{"allocated": 4, "unallocated": 0}]
+    rooms = {r["student_id"]: r["room_no"] for r in database.execute(
+        "SELECT student_id, room_no FROM STUDENT WHERE student_id LIKE 'I%'")}
+    assert rooms == {"I01": 301, "I02": 101, "I03": 301, "I04": 302}
+
+
+def test_reconcile_occupancy(database):
+    database.execute("UPDATE ROOM_OCCUPANCY SET current_occupancy = 5 WHERE room_no = 101")
+    database.execute("DELETE FROM ROOM_OCCUPANCY WHERE room_no = 202")
+    assert database.call_procedure("reconcile_occupancy") == [{"missing": 1, "corrected": 2}]
+    assert stored_occupancy() == counted_occupancy()
+    assert stats_rows() == rebuilt_stats()
+    assert database.call_procedure("reconcile_occupancy") == [{"missing": 0, "corrected": 0}]
+
+
+def _fee_ids(rows):
+    return [r["fee_id"] for r in rows]
+
+
+def test_get_fee_details(database):
+    rows = database.call_procedure("get_fee_details", [None, None, None, None, None, None])
+    assert _fee_ids(rows) == ["F001", "F002", "F003", "F004", "F005"]
+    assert rows[0]["student_name"] == "Alice Brown"
+    assert rows[0]["due_date"] == date(2023, 5, 10)
+
+
+@pytest.mark.parametrize("params, expected", [
+    (["Pending", None, None, None, None, None], ["F002", "F005"]),
+    ([None, "2023-06-01", "2023-08-31", None, None, None], ["F002", "F003", "F004"]),
+    (["Paid", "2023-06-01", None, None, None, None], ["F003"]),
+    ([None, None, None, 2, 1, None], ["F002", "F003"]),
+    ([None, None, None, None, None, 2], ["F003", "F005"]),
+    (["Pending", None, None, None, None, 2], ["F005"]),
+])
+def test_get_fee_details_filters(database, params, expected):
+    assert _fee_ids(database.call_procedure("get_fee_details", params)) == expected
@@ -0,0 +1,77 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import db
+
+
+class FakeReplicaPool:
+    # Answers SHOW SLAVE STATUS with `lag`, after `delay` seconds
+    def __init__(self, lag, delay=0.0):
+        self.lag = lag
+        self.delay = delay
+        self.checks = 0
+
+    @contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self, dictionary=False):
+        return self
+
+    def execute(self, query):
+        self.checks += 1
+        time.sleep(self.delay)
+
+    def fetchall(self):
+        return [{"Seconds_Behind_Master": self.lag}]
+
+    def close(self):
+        pass
+
+
+def _wait_checked(*replicas):
+    deadline = time.monotonic() + 5
+    while any(r.checked_at == float("-inf") for r in replicas) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_replicas_wait_for_their_first_check():
+    replica = db.Replica("r1", FakeReplicaPool(lag=0))
+    router = db.ReadRouter([replica], max_lag=5, check_interval=60)
+    # Unchecked replicas serve nothing; choose() starts the check
+    assert router.choose({"ROOM"}) is None
+    _wait_checked(replica)
+    assert router.choose({"ROOM"}) is replica
+
+
+def test_lagging_replica_leaves_rotation_without_scheduler():
+    fresh = db.Replica("fresh", FakeReplicaPool(lag=0))
+    behind = db.Replica("behind", FakeReplicaPool(lag=7200))
+    router = db.ReadRouter([fresh, behind], max_lag=5, check_interval=60)
+    router.choose({"ROOM"})
+    _wait_checked(fresh, behind)
+    assert {router.choose({"ROOM"}) for _ in range(4)} == {fresh}
+    assert not behind.healthy
+
+
+def test_choose_never_waits_for_a_check():
+    slow = db.Replica("slow", FakeReplicaPool(lag=0, delay=1.0))
+    router = db.ReadRouter([slow], max_lag=5, check_interval=0)
+    started = time.perf_counter()
+    for _ in range(20):
+        router.choose({"ROOM"})
+    assert time.perf_counter() - started < 0.5
+    # One check at a time per replica
+    assert slow.pool.checks == 1
+
+
+def test_check_all_skips_running_checks():
+    replica = db.Replica("r1", FakeReplicaPool(lag=2))
+    router = db.ReadRouter([replica], max_lag=5, check_interval=60)
+    assert router.check_all() == {"healthy": 1, "replicas": 1}
+    with replica.checking:
+        done = threading.Event()
+        threading.Thread(target=lambda: (router.check_all(), done.set())).start()
+        assert done.wait(1)
+    assert replica.pool.checks == 1
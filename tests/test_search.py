@@ -0,0 +1,58 @@
+import pytest
+
+import search
+
+
+def _ids(rows, key="student_id"):
+    return sorted(r[key] for r in rows)
+
+
+def test_fulltext_prefix_words(database):
+    assert _ids(search.search("STUDENT", search.ALL_TEXT, "engin")) == ["S001", "S004"]
+    # Every word must match
+    assert _ids(search.search("STUDENT", search.ALL_TEXT, "daisy engineering")) == ["S004"]
+    assert search.search("STUDENT", search.ALL_TEXT, "alice medicine") == []
+
+
+def test_fulltext_ranks_and_scores(database):
+    rows = search.search("HOSTEL_SERVICE", search.ALL_TEXT, "security")
+    assert [r["service_id"] for r in rows] == ["SVC004"]
+    assert rows[0]["score"] > 0
+
+
+def test_fulltext_ignores_operators(database):
+    assert _ids(search.search("EMPLOYEE", search.ALL_TEXT, '"cook*" -(anna)'), "emp_id") == ["E002"]
+
+
+def test_fulltext_short_words_fall_back_to_prefix(database):
+    # Words shorter than FT_MIN_TOKEN_SIZE cannot use the index
+    assert _ids(search.search("STUDENT", search.ALL_TEXT, "Bo")) == ["S002"]
+
+
+def test_fulltext_scoped_to_hostel(database):
+    assert _ids(search.search("STUDENT", search.ALL_TEXT, "engineering", hostel_id=3)) == ["S004"]
+
+
+def test_fulltext_follows_writes(database):
+    database.execute("UPDATE STUDENT SET course = 'Philosophy' WHERE student_id = 'S001'")
+    database.execute("DELETE FROM STUDENT WHERE student_id = 'S004'")
+    database.execute("INSERT INTO STUDENT (student_id, name, course) VALUES ('S100', 'Zoe Engel', 'Law')")
+    assert _ids(search.search("STUDENT", search.ALL_TEXT, "engin")) == []
+    assert _ids(search.search("STUDENT", search.ALL_TEXT, "engel")) == ["S100"]
+    assert _ids(search.search("STUDENT", search.ALL_TEXT, "philosophy")) == ["S001"]
+
+
+def test_prefix_search_escapes_wildcards(database):
+    database.execute("INSERT INTO STUDENT (student_id, name) VALUES ('S100', 'A_b%c')")
+    assert _ids(search.search("STUDENT", "name", "a_")) == ["S100"]
+    assert _ids(search.search("STUDENT", "name", "al")) == ["S001"]
+
+
+def test_exact_search_on_numbers(database):
+    assert _ids(search.search("STUDENT", "room_no", "101")) == ["S001"]
+    assert search.search("STUDENT", "room_no", "abc") == []
+
+
+def test_no_fulltext_index(database):
+    with pytest.raises(ValueError):
+        search.search("ROOM", search.ALL_TEXT, "double")
@@ -0,0 +1,158 @@
+import streamlit as st
+
+import batch_edit
+import db
+from frames import CATEGORIES
+from lookup import LOOKUP_LIMIT, lookup
+from pagination import DEFAULT_PAGE_SIZE, PAGE_SIZES, approximate_count, fetch_page, is_scoped, sortable_columns
+
+
+def lazy_tabs(labels, key):
+    # Unlike st.tabs, which runs the body of every tab on each rerun, only
+    # the selected section is rendered, so only its queries run:
+    #     if widgets.lazy_tabs(["View", "Add"], key="rooms_tab") == "View": ...
+    return st.radio("Section", labels, horizontal=True, key=key, label_visibility="collapsed")
+
+
+def hostel_picker(label, key, default=None, allow_all=False):
+    # Select box over the hostels returning a hostel_id, starting at
+    # `default`; with `allow_all` it also offers "All hostels" (None)
+    try:
+        hostels = db.run_query("SELECT hostel_id, name FROM HOSTEL ORDER BY name")
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return None
+    names = {h["hostel_id"]: h["name"] for h in hostels}
+    options = ([None] if allow_all else []) + list(names)
+    return st.selectbox(label, options, index=options.index(default) if default in options else 0, key=key,
+                        format_func=lambda hostel_id: "All hostels" if hostel_id is None else names[hostel_id])
+
+
+def hostel_scope():
+    # The hostel every page is limited to, or None for all hostels
+    return hostel_picker("Hostel", key="hostel_scope", allow_all=True)
+
+
+def typeahead(entity, label, key, hostel_id=None):
+    # Picker for one STUDENT/EMPLOYEE/ROOM/FEE row (see lookup.LOOKUPS).
+    # Only the first LOOKUP_LIMIT matches for the typed ID or name prefix
+    # are fetched, never the whole table. Streamlit sends the term when the
+    # user presses Enter or leaves the box, not on every keystroke.
+    term = st.text_input(label, key=f"{key}_term", placeholder="Start typing an ID or name")
+    if not term.strip():
+        return None
+    try:
+        matches = lookup(entity, term, hostel_id=hostel_id)
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return None
+    if not matches:
+        st.write(f"No matches for {term}.")
+        return None
+
+    options = {m["label"]: m["id"] for m in matches}
+    choice = st.selectbox("Matches", list(options), key=f"{key}_choice")
+    if len(matches) == LOOKUP_LIMIT:
+        st.caption(f"Showing the first {LOOKUP_LIMIT} matches; type more to narrow them down.")
+    return options[choice]
+
+
+def _column_config(table, rows):
+    spec = batch_edit.EDIT_SPECS[table]
+    config = {}
+    for column in rows.columns:
+        if column not in spec["columns"]:
+            config[column] = st.column_config.Column(disabled=True)
+        elif column in CATEGORIES:
+            config[column] = st.column_config.SelectboxColumn(options=CATEGORIES[column], required=True)
+        elif column in spec.get("bounds", {}):
+            low, high = spec["bounds"][column]
+            config[column] = st.column_config.NumberColumn(min_value=low, max_value=high, step=1, required=True)
+        elif column == "due_date":
+            config[column] = st.column_config.DateColumn(required=True)
+    return config
+
+
+def edit_grid(table, rows, key):
+    # Editable grid over `rows` (see batch_edit.EDIT_SPECS). Saving writes
+    # only the changed rows, in one transaction, and fails as a whole if any
+    # of them was changed by someone else after `rows` was read.
+    version = st.session_state.get(f"{key}_version", 0)
+    edited = st.data_editor(rows, column_config=_column_config(table, rows), hide_index=True,
+                            num_rows="fixed", key=f"{key}_{version}")
+    before, _ = batch_edit.diff(table, rows, edited)
+    if not st.button(f"Save {len(before)} Changed Rows", key=f"{key}_save", disabled=before.empty):
+        return
+    try:
+        result = batch_edit.apply(table, rows, edited)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return
+    if result["conflicts"]:
+        st.warning("Nothing was saved: these rows were changed by someone else since they were loaded: "
+                   + ", ".join(map(str, result["conflicts"])) + ". Reload the page and edit them again.")
+        return
+    # A fresh editor key drops the applied edits from the widget state
+    st.session_state[f"{key}_version"] = version + 1
+    st.success(f"Saved {result['updated']} rows.")
+    st.rerun()
+
+
+def _go_next(state_key, cursor):
+    st.session_state[state_key]["cursors"].append(cursor)
+
+
+def _go_previous(state_key):
+    st.session_state[state_key]["cursors"].pop()
+
+
+def paginated_table(table, editable=False, hostel_id=None):
+    # Shows one page of `table` at a time; the session keeps the keyset
+    # cursor of every page visited so "Previous" needs no OFFSET scan.
+    # With `editable` the page is shown as an edit_grid; with `hostel_id`
+    # only that hostel's rows are shown if the table belongs to hostels.
+    state_key = f"pagination_{table}"
+    if not is_scoped(table):
+        hostel_id = None
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    sort = col1.selectbox("Sort by", sortable_columns(table, hostel_id), key=f"{state_key}_sort")
+    page_size = col2.selectbox(
+        "Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE) if DEFAULT_PAGE_SIZE in PAGE_SIZES else 0,
+        key=f"{state_key}_size",
+    )
+    descending = col3.checkbox("Descending", key=f"{state_key}_desc")
+
+    # Changing the hostel, ordering or page size starts again from the first page
+    settings = (hostel_id, sort, page_size, descending)
+    state = st.session_state.get(state_key)
+    if state is None or state["settings"] != settings:
+        state = st.session_state[state_key] = {"settings": settings, "cursors": []}
+
+    after = state["cursors"][-1] if state["cursors"] else None
+    try:
+        (rows, next_cursor), total = db.run_concurrently(
+            (fetch_page, table, sort, descending, after, page_size, hostel_id),
+            (approximate_count, table, hostel_id),
+        )
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return
+
+    if not rows.empty and editable:
+        edit_grid(table, rows, key=f"{state_key}_editor")
+    elif not rows.empty:
+        st.dataframe(rows)
+    else:
+        st.write("No rows to show.")
+
+    page = len(state["cursors"]) + 1
+    col1, col2, col3 = st.columns([1, 1, 2])
+    col1.button("Previous", key=f"{state_key}_prev", disabled=page == 1,
+                on_click=_go_previous, args=(state_key,))
+    col2.button("Next", key=f"{state_key}_next", disabled=next_cursor is None,
+                on_click=_go_next, args=(state_key, next_cursor))
+    col3.caption(f"Page {page}" + (f" of about {max(1, -(-total // page_size))} (~{total} rows)" if total else ""))